@@ -0,0 +1,27 @@
+"""user search trigram vocabulary
+
+Revision ID: 3d8b0e6f4a19
+Revises: e1f6c3a9b274
+Create Date: 2026-10-18 09:12:37.208145
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d8b0e6f4a19'
+down_revision: Union[str, None] = 'e1f6c3a9b274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE VIRTUAL TABLE users_trgm_vocab USING fts5vocab(users_trgm, 'col')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS users_trgm_vocab")
@@ -0,0 +1,66 @@
+"""product full-text search (fts5)
+
+Revision ID: 5f1d2a9c7e34
+Revises: c4e282976b91
+Create Date: 2026-10-17 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f1d2a9c7e34'
+down_revision: Union[str, None] = 'c4e282976b91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "CREATE VIRTUAL TABLE products_fts USING fts5("
+        "name, description, content='products', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    op.execute(
+        "CREATE VIRTUAL TABLE products_name_trgm USING fts5("
+        "name, content='products', content_rowid='id', tokenize='trigram')"
+    )
+
+    op.execute("""
+    CREATE TRIGGER products_search_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+        INSERT INTO products_name_trgm(rowid, name) VALUES (new.id, new.name);
+    END
+    """)
+    op.execute("""
+    CREATE TRIGGER products_search_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO products_name_trgm(products_name_trgm, rowid, name) VALUES ('delete', old.id, old.name);
+    END
+    """)
+    op.execute("""
+    CREATE TRIGGER products_search_au AFTER UPDATE OF name, description ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO products_name_trgm(products_name_trgm, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO products_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+        INSERT INTO products_name_trgm(rowid, name) VALUES (new.id, new.name);
+    END
+    """)
+
+    # index the rows that already exist
+    op.execute("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+    op.execute("INSERT INTO products_name_trgm(products_name_trgm) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS products_search_au")
+    op.execute("DROP TRIGGER IF EXISTS products_search_ad")
+    op.execute("DROP TRIGGER IF EXISTS products_search_ai")
+    op.execute("DROP TABLE IF EXISTS products_name_trgm")
+    op.execute("DROP TABLE IF EXISTS products_fts")
@@ -0,0 +1,90 @@
+"""never reuse product and order ids
+
+Revision ID: 6f0b2d8c4e57
+Revises: 3d8b0e6f4a19
+Create Date: 2026-10-18 09:21:44.730215
+
+"""
+from typing import Any, Callable, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f0b2d8c4e57'
+down_revision: Union[str, None] = '3d8b0e6f4a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Without AUTOINCREMENT SQLite hands a deleted max rowid out again, and a new row would then carry the
+# ETag ("kind-id-vN") of the one it replaced. SQLite can't add it in place, so both tables are rebuilt.
+def _orders(name: str, **kw: Any) -> None:
+    op.create_table(
+        name,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('total_price', sa.Float(), nullable=False),
+        sa.Column(
+            'created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False
+        ),
+        sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+        sa.CheckConstraint('total_price >= 0', name='check_total_price_non_negative'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        **kw,
+    )
+
+
+def _products(name: str, **kw: Any) -> None:
+    op.create_table(
+        name,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('stock', sa.Integer(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=True),
+        sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+        sa.CheckConstraint('price >= 0', name='check_price_non_negative'),
+        sa.CheckConstraint('stock >= 0', name='check_stock_non_negative'),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        **kw,
+    )
+
+
+def _rebuild(table: str, create: Callable[..., None], *, autoincrement: bool) -> None:
+    """SQLite's copy-drop-rename rebuild; relies on foreign keys being off, as they are on Alembic's engine."""
+    conn = op.get_bind()
+    # indexes and triggers (search sync, counters) are dropped with the old table: put the same ones back
+    dependents = conn.execute(
+        sa.text(
+            "SELECT sql FROM sqlite_master "
+            "WHERE tbl_name = :table AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+        ),
+        {"table": table},
+    ).scalars().all()
+    columns = ", ".join(column["name"] for column in sa.inspect(conn).get_columns(table))
+
+    create(f"_{table}_new", sqlite_autoincrement=autoincrement)
+    # ids are kept, so order_items and the FTS rowids still line up; sqlite_sequence starts at the max id
+    op.execute(f"INSERT INTO _{table}_new ({columns}) SELECT {columns} FROM {table}")
+    op.drop_table(table)
+    op.rename_table(f"_{table}_new", table)
+
+    for sql in dependents:
+        op.execute(sql)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rebuild('orders', _orders, autoincrement=True)
+    _rebuild('products', _products, autoincrement=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rebuild('products', _products, autoincrement=False)
+    _rebuild('orders', _orders, autoincrement=False)
@@ -0,0 +1,40 @@
+"""order line items
+
+Revision ID: 7c2f4e8b1a60
+Revises: 9b3e6f0a2d15
+Create Date: 2026-10-17 14:21:05.331872
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2f4e8b1a60'
+down_revision: Union[str, None] = '9b3e6f0a2d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'order_items',
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('unit_price', sa.Float(), nullable=False),
+        sa.CheckConstraint('quantity > 0', name='check_quantity_positive'),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='RESTRICT'),
+        sa.PrimaryKeyConstraint('order_id', 'product_id'),
+    )
+    op.create_index('ix_order_items_product_id', 'order_items', ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_order_items_product_id', table_name='order_items')
+    op.drop_table('order_items')
@@ -0,0 +1,53 @@
+"""user substring search (fts5 trigram)
+
+Revision ID: 9b3e6f0a2d15
+Revises: 5f1d2a9c7e34
+Create Date: 2026-10-17 11:03:48.917254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3e6f0a2d15'
+down_revision: Union[str, None] = '5f1d2a9c7e34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "CREATE VIRTUAL TABLE users_trgm USING fts5("
+        "username, email, content='users', content_rowid='id', tokenize='trigram', detail='column')"
+    )
+
+    op.execute("""
+    CREATE TRIGGER users_search_ai AFTER INSERT ON users BEGIN
+        INSERT INTO users_trgm(rowid, username, email) VALUES (new.id, new.username, new.email);
+    END
+    """)
+    op.execute("""
+    CREATE TRIGGER users_search_ad AFTER DELETE ON users BEGIN
+        INSERT INTO users_trgm(users_trgm, rowid, username, email) VALUES ('delete', old.id, old.username, old.email);
+    END
+    """)
+    op.execute("""
+    CREATE TRIGGER users_search_au AFTER UPDATE OF username, email ON users BEGIN
+        INSERT INTO users_trgm(users_trgm, rowid, username, email) VALUES ('delete', old.id, old.username, old.email);
+        INSERT INTO users_trgm(rowid, username, email) VALUES (new.id, new.username, new.email);
+    END
+    """)
+
+    # index the accounts that already exist
+    op.execute("INSERT INTO users_trgm(users_trgm) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_search_au")
+    op.execute("DROP TRIGGER IF EXISTS users_search_ad")
+    op.execute("DROP TRIGGER IF EXISTS users_search_ai")
+    op.execute("DROP TABLE IF EXISTS users_trgm")
@@ -0,0 +1,82 @@
+"""maintained row counters
+
+Revision ID: a8d3b5e2c947
+Revises: 7c2f4e8b1a60
+Create Date: 2026-10-17 16:02:41.508117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3b5e2c947'
+down_revision: Union[str, None] = '7c2f4e8b1a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _bump(scope: str, key: str, delta: int) -> str:
+    return (
+        f"INSERT INTO counters(scope, key, value) VALUES ('{scope}', {key}, {delta}) "
+        f"ON CONFLICT(scope, key) DO UPDATE SET value = value + ({delta});"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'counters',
+        sa.Column('scope', sa.String(length=20), nullable=False),
+        sa.Column('key', sa.Integer(), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'key'),
+    )
+
+    op.execute(f"""
+    CREATE TRIGGER orders_count_ai AFTER INSERT ON orders BEGIN
+        {_bump("orders", "0", 1)}
+        {_bump("user_orders", "new.user_id", 1)}
+    END
+    """)
+    op.execute(f"""
+    CREATE TRIGGER orders_count_ad AFTER DELETE ON orders BEGIN
+        {_bump("orders", "0", -1)}
+        {_bump("user_orders", "old.user_id", -1)}
+    END
+    """)
+    op.execute(f"""
+    CREATE TRIGGER orders_count_au AFTER UPDATE OF user_id ON orders BEGIN
+        {_bump("user_orders", "old.user_id", -1)}
+        {_bump("user_orders", "new.user_id", 1)}
+    END
+    """)
+    op.execute(f"CREATE TRIGGER users_count_ai AFTER INSERT ON users BEGIN {_bump('users', '0', 1)} END")
+    op.execute(f"CREATE TRIGGER users_count_ad AFTER DELETE ON users BEGIN {_bump('users', '0', -1)} END")
+    op.execute(f"CREATE TRIGGER products_count_ai AFTER INSERT ON products BEGIN {_bump('products', '0', 1)} END")
+    op.execute(f"CREATE TRIGGER products_count_ad AFTER DELETE ON products BEGIN {_bump('products', '0', -1)} END")
+
+    # count what is already there
+    op.execute("INSERT INTO counters(scope, key, value) SELECT 'orders', 0, count(*) FROM orders")
+    op.execute(
+        "INSERT INTO counters(scope, key, value) SELECT 'user_orders', user_id, count(*) FROM orders GROUP BY user_id"
+    )
+    op.execute("INSERT INTO counters(scope, key, value) SELECT 'users', 0, count(*) FROM users")
+    op.execute("INSERT INTO counters(scope, key, value) SELECT 'products', 0, count(*) FROM products")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in (
+        'products_count_ad',
+        'products_count_ai',
+        'users_count_ad',
+        'users_count_ai',
+        'orders_count_au',
+        'orders_count_ad',
+        'orders_count_ai',
+    ):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.drop_table('counters')
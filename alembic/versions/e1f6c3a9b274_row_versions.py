@@ -0,0 +1,30 @@
+"""row versions for products and orders
+
+Revision ID: e1f6c3a9b274
+Revises: a8d3b5e2c947
+Create Date: 2026-10-17 18:47:12.604391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f6c3a9b274'
+down_revision: Union[str, None] = 'a8d3b5e2c947'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('orders', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('products', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('products', 'version')
+    op.drop_column('orders', 'version')
@@ -0,0 +1,79 @@
+"""Orders/sec for concurrent POST /orders work: one transaction per order vs. group commit.
+
+Runs against a throwaway file database, so every commit pays for a real journal write.
+Set SQLITE_SYNCHRONOUS=FULL to see the fsync-bound case.
+
+Usage: python scripts/bench_group_commit.py [orders] [concurrency]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(Path(__file__).parent / os.pardir).resolve()
+SRC_DIR = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+DB_PATH = Path(tempfile.mkdtemp()) / "bench.db"
+
+for key, value in {
+    "DEBUG": "False",
+    "SECRET_KEY": "bench",
+    "SQLITE_URI": f"sqlite+aiosqlite:///{DB_PATH}",
+    "ALEMBIC_URI": f"sqlite:///{DB_PATH}",
+}.items():
+    os.environ.setdefault(key, value)
+
+from sqlalchemy import text
+
+from infrastructure.databases.db import engine
+from infrastructure.databases.unit_of_work import UnitOfWork
+from infrastructure.sqlalchemy.models import Base
+from services.use_cases.orders import CreateOrder, GroupCommitCreateOrder
+
+BATCHES = ((2.0, 64), (5.0, 256))  # (window ms, max batch)
+
+
+async def _seed() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        _ = await conn.execute(
+            text("INSERT INTO users (username, email, password) VALUES ('bench', 'bench@example.com', 'x')")
+        )
+
+
+async def _run(create: CreateOrder | GroupCommitCreateOrder, orders: int, concurrency: int) -> float:
+    """Return orders per second with ``concurrency`` callers creating ``orders`` in total."""
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with gate:
+            _ = await create(1, float(i % 100))
+
+    start = time.perf_counter()
+    _ = await asyncio.gather(*(one(i) for i in range(orders)))
+    return orders / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    await _seed()
+
+    cases: list[tuple[str, CreateOrder | GroupCommitCreateOrder]] = [("per-order", CreateOrder(UnitOfWork))]
+    cases += [(f"group {w:g}ms/{n}", GroupCommitCreateOrder(UnitOfWork, w, n)) for w, n in BATCHES]
+
+    print(f"{orders:,} orders, {concurrency} concurrent callers, {DB_PATH}\n")
+    print(f"{'path':<18}{'orders/s':>10}")
+    for label, create in cases:
+        print(f"{label:<18}{await _run(create, orders, concurrency):>10.0f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
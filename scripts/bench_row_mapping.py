@@ -0,0 +1,127 @@
+"""100-row list pages: ORM instances copied into domain dataclasses vs. column rows unpacked into them.
+
+Usage: python scripts/bench_row_mapping.py [pages]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+PROJECT_ROOT = Path(Path(__file__).parent / os.pardir).resolve()
+SRC_DIR = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+for key, value in {
+    "DEBUG": "False",
+    "SECRET_KEY": "bench",
+    "SQLITE_URI": "sqlite+aiosqlite:///:memory:",
+    "ALEMBIC_URI": "sqlite:///:memory:",
+}.items():
+    os.environ.setdefault(key, value)
+
+from sqlalchemy import bindparam, create_engine, func, select
+from sqlalchemy.orm import Session
+
+from infrastructure.sqlalchemy.models import Base
+from infrastructure.sqlalchemy.models import Order as OrderORM
+from infrastructure.sqlalchemy.models import Product as ProductORM
+from infrastructure.sqlalchemy.repositories import (  # pyright:ignore[reportPrivateUsage]
+    _order_from_row,
+    _order_to_domain,
+    _product_from_row,
+    _product_to_domain,
+)
+from infrastructure.sqlalchemy.statements import order_list, paging_params, product_list
+
+ROWS = 5_000
+PAGE = 100
+
+
+def _seed(engine) -> None:  # noqa: ANN001
+    Base.metadata.create_all(engine)
+    raw = engine.raw_connection()
+    try:
+        raw.execute("INSERT INTO users (username, email, password) VALUES ('bench', 'bench@example.com', 'x')")
+        raw.executemany(
+            "INSERT INTO products (name, description, price, stock, owner_id) VALUES (?, 'lorem ipsum', ?, 1, 1)",
+            ((f"product {i:05d}", i % 100) for i in range(ROWS)),
+        )
+        raw.executemany("INSERT INTO orders (user_id, total_price) VALUES (1, ?)", ((i % 100,) for i in range(ROWS)))
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def _measure(pages: int, work: Callable[[int], list[object]]) -> tuple[float, float, int]:
+    """Return (ms per page, KiB peak per page, allocated blocks per page)."""
+    assert len(work(0)) == PAGE  # warm-up: fills the compiled cache
+
+    start = time.perf_counter()
+    for i in range(pages):
+        _ = work(i)
+    elapsed_ms = (time.perf_counter() - start) / pages * 1000
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    kept = work(1)
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+    tracemalloc.stop()
+    del kept
+
+    return elapsed_ms, peak / 1024, blocks
+
+
+def main() -> None:
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    engine = create_engine("sqlite://")
+    _seed(engine)
+
+    def offset(i: int) -> int:
+        return i * PAGE % (ROWS - PAGE)
+
+    orm_products = (
+        select(ProductORM)
+        .order_by(func.lower(ProductORM.name), ProductORM.id)
+        .offset(bindparam("offset"))
+        .limit(bindparam("limit"))
+    )
+    orm_orders = select(OrderORM).order_by(OrderORM.id).offset(bindparam("offset")).limit(bindparam("limit"))
+    product_rows = product_list(frozenset(paging_params(0, PAGE)))
+    order_rows = order_list(frozenset(paging_params(0, PAGE)))
+
+    with Session(engine) as s:
+
+        def orm_path(stmt, mapper):  # noqa: ANN001, ANN202
+            def run(i: int) -> list[object]:
+                objs = [mapper(o) for o in s.execute(stmt, paging_params(offset(i), PAGE)).scalars()]
+                s.expunge_all()  # a request-scoped session starts with an empty identity map
+                return objs
+
+            return run
+
+        def row_path(stmt, mapper):  # noqa: ANN001, ANN202
+            return lambda i: [mapper(r) for r in s.execute(stmt, paging_params(offset(i), PAGE))]
+
+        cases = (
+            ("products", orm_path(orm_products, _product_to_domain), row_path(product_rows, _product_from_row)),
+            ("orders", orm_path(orm_orders, _order_to_domain), row_path(order_rows, _order_from_row)),
+        )
+
+        print(f"{PAGE}-row pages, {pages} pages per case\n")
+        print(f"{'entity':<10}{'path':<8}{'ms/page':>10}{'KiB peak':>10}{'blocks':>10}")
+        for name, orm, rows in cases:
+            for label, work in (("orm", orm), ("rows", rows)):
+                ms, kib, blocks = _measure(pages, work)
+                print(f"{name:<10}{label:<8}{ms:>10.2f}{kib:>10.1f}{blocks:>10}")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
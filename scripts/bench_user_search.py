@@ -0,0 +1,86 @@
+"""Compare ``GET /users?username_contains=`` filters: plain ILIKE scan vs. the ``users_trgm`` index.
+
+Usage: python scripts/bench_user_search.py [rows] [repeats]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(Path(__file__).parent / os.pardir).resolve()
+SRC_DIR = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+for key, value in {
+    "DEBUG": "False",
+    "SECRET_KEY": "bench",
+    "SQLITE_URI": "sqlite+aiosqlite:///:memory:",
+    "ALEMBIC_URI": "sqlite:///:memory:",
+}.items():
+    os.environ.setdefault(key, value)
+
+from sqlalchemy import create_engine, func, select
+
+from infrastructure.sqlalchemy.models import Base
+from infrastructure.sqlalchemy.models import User as UserORM
+from infrastructure.sqlalchemy.statements import user_count, user_params
+
+NEEDLES = (  # (filter, needle): selective, rare, absent and match-everything cases
+    ("username", "user_01234"),
+    ("username", "9999"),
+    ("username", "qzx"),
+    ("email", "01234@"),
+    ("email", "@example"),
+)
+
+
+def _seed(engine, rows: int) -> None:  # noqa: ANN001
+    Base.metadata.create_all(engine)
+    raw = engine.raw_connection()
+    try:
+        raw.executemany(
+            "INSERT INTO users (username, email, password) VALUES (?, ?, 'x')",
+            ((f"user_{i:07d}", f"user_{i:07d}@example.com") for i in range(rows)),
+        )
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def _time(engine, stmt, repeats: int, params: dict | None = None) -> tuple[float, int]:  # noqa: ANN001
+    with engine.connect() as conn:
+        hits = conn.execute(stmt, params).scalar_one()  # warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            _ = conn.execute(stmt, params).scalar_one()
+        return (time.perf_counter() - start) / repeats * 1000, hits
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20  # noqa: PLR2004
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        _seed(engine, rows)
+        print(f"{rows:,} users, {repeats} runs per query (ms/query)\n")
+        print(f"{'filter':<10}{'needle':<12}{'hits':>8}{'ILIKE':>10}{'trigram':>10}{'speed-up':>10}")
+
+        for field, needle in NEEDLES:
+            count = select(func.count()).select_from(UserORM)
+            column = UserORM.username if field == "username" else UserORM.email
+            params = user_params(needle, None) if field == "username" else user_params(None, needle)
+
+            ilike_ms, hits = _time(engine, count.where(column.ilike(f"%{needle}%")), repeats)
+            trgm_ms, trgm_hits = _time(engine, user_count(frozenset(params)), repeats, params)
+            assert hits == trgm_hits, f"result mismatch for {needle!r}: {hits} vs {trgm_hits}"
+
+            print(f"{field:<10}{needle:<12}{hits:>8}{ilike_ms:>10.2f}{trgm_ms:>10.2f}{ilike_ms / trgm_ms:>9.1f}x")
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import hashlib
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import falcon
+import orjson
+
+
+def entity_etag(kind: str, entity_id: int, version: int, fields: Sequence[str] | None = None) -> str:
+    """Strong ETag of one row: any repository UPDATE bumps ``version``. A sparse fieldset is another representation.
+
+    Only sound because ids are never reused (``sqlite_autoincrement``): a later row can't inherit the tag.
+    """
+    tag = f"{kind}-{entity_id}-v{version}"
+    return tag if fields is None else f"{tag}-{'.'.join(fields)}"
+
+
+def page_etag(items: Iterable[Any], total: int | None, fields: Sequence[str] | None = None) -> str:
+    """Strong ETag of a list page, from the ``(id, version)`` of every item, the reported total and the fieldset."""
+    state = orjson.dumps([total, fields, *((item.id, item.version) for item in items)])
+    return hashlib.blake2b(state, digest_size=16).hexdigest()
+
+
+def etag_matches(req: falcon.Request, etag: str) -> bool:
+    """Whether ``If-None-Match`` names ``etag`` (unquoted), or is ``*``."""
+    return any(tag in {etag, "*"} for tag in req.if_none_match or ())
+
+
+def not_modified(req: falcon.Request, resp: falcon.Response, etag: str) -> bool:
+    """Set ``ETag``; answer ``304`` (and return ``True``) when ``If-None-Match`` already holds it."""
+    resp.etag = etag
+
+    if etag_matches(req, etag):
+        resp.status = falcon.HTTP_304
+        return True
+
+    return False
@@ -0,0 +1,42 @@
+from typing import final
+
+from falcon import Request, Response
+
+from common.compression import CODECS, COMPRESSIBLE_TYPES, negotiate
+
+
+@final
+class CompressionMiddleware:
+    """Compress buffered response bodies of at least ``min_size`` bytes in the coding ``Accept-Encoding`` prefers.
+
+    Goes first in the middleware list, so its ``process_response`` sees the final body. Streams (exports,
+    static files) are left alone; static files come precompressed instead.
+    """
+
+    def __init__(self, min_size: int, level: int) -> None:
+        self._min_size = min_size
+        self._level = level
+
+    async def process_response(self, req: Request, resp: Response, resource: object, req_succeeded: bool):  # noqa: FBT001
+        _ = resource, req_succeeded
+
+        if req.method == "HEAD" or resp.stream is not None or resp.get_header("Content-Encoding") is not None:
+            return
+
+        body = await resp.render_body()  # also settles the content type of a media body
+        if not body or not (resp.content_type or "").startswith(COMPRESSIBLE_TYPES):
+            return
+
+        resp.append_header("Vary", "Accept-Encoding")
+        coding = negotiate(req.get_header("Accept-Encoding"))
+        if coding is None or len(body) < self._min_size:
+            return
+
+        compress = CODECS[coding][0]
+        resp.text = None
+        resp.data = compress(body, self._level)
+        resp.set_header("Content-Encoding", coding)
+
+        etag = resp.get_header("ETag")
+        if etag is not None and not etag.startswith("W/"):
+            resp.set_header("ETag", f"W/{etag}")  # same validator, but no longer the same bytes
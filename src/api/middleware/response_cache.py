@@ -0,0 +1,91 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import final
+from urllib.parse import parse_qsl, urlencode
+
+import falcon
+from falcon import Request, Response
+
+from api.etag import etag_matches
+from api.ndjson import wants_ndjson
+from infrastructure.cache.responses import TaggedCache, response_cache
+
+# Headers that belong to the representation and are replayed on a hit; X-Request-ID & co. are per request
+_STORED_HEADERS = (
+    "Content-Type",
+    "ETag",
+    "Link",
+    "X-Missing-Ids",
+    "X-Next-Cursor",
+    "X-Total-Count",
+    "X-Total-Count-Mode",
+)
+
+
+@final
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    body: bytes
+    headers: tuple[tuple[str, str], ...]
+    etag: str | None
+
+
+def _normalized_query(req: Request) -> str:
+    """The query string with its parameters sorted, so ``?a=1&b=2`` and ``?b=2&a=1`` share an entry."""
+    return urlencode(sorted(parse_qsl(req.query_string, keep_blank_values=True)))
+
+
+@final
+class ResponseCacheMiddleware:
+    """Serve successful ``GET``s of the given routes from ``cache``, keyed on route and normalized query.
+
+    ``routes`` maps a URI template to the tag its responses are filed under; writes of that entity
+    kind drop the tag. Runs after authentication, and reports ``X-Cache: HIT``/``MISS``. Streamed NDJSON
+    lists are neither cached nor served from the cache.
+    """
+
+    def __init__(self, routes: Mapping[str, str], cache: TaggedCache[object] = response_cache) -> None:
+        self._routes = routes
+        self._cache = cache
+
+    async def process_resource(self, req: Request, resp: Response, resource: object, params: dict[str, str]):
+        _ = resource, params
+
+        tag = self._routes.get(req.uri_template) if req.method == "GET" else None
+        if tag is None or wants_ndjson(req):
+            return
+
+        key = (req.uri_template, _normalized_query(req))
+        hit = self._cache.get(tag, key)
+        if not isinstance(hit, CachedResponse):
+            # the generation is taken now, so a write committing mid-request keeps this response out
+            req.context.response_cache = (tag, self._cache.generation(tag), key)
+            resp.set_header("X-Cache", "MISS")
+            return
+
+        resp.set_header("X-Cache", "HIT")
+        for name, value in hit.headers:
+            resp.set_header(name, value)
+
+        if hit.etag is not None and etag_matches(req, hit.etag):
+            resp.status = falcon.HTTP_304
+        else:
+            resp.data = hit.body
+
+        resp.complete = True
+
+    async def process_response(self, req: Request, resp: Response, resource: object, req_succeeded: bool):  # noqa: FBT001
+        _ = resource
+
+        pending: tuple[str, int, tuple[str, str]] | None = getattr(req.context, "response_cache", None)
+        if pending is None or not req_succeeded or falcon.http_status_to_code(resp.status) != 200:  # noqa: PLR2004
+            return
+
+        body = await resp.render_body()
+        if body is None:
+            return
+
+        tag, generation, key = pending
+        headers = tuple((name, value) for name in _STORED_HEADERS if (value := resp.get_header(name)) is not None)
+        etag = falcon.ETag.loads(resp.etag) if resp.etag else None
+        self._cache.set(tag, generation, key, CachedResponse(body, headers, etag))
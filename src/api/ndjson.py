@@ -0,0 +1,23 @@
+from collections.abc import AsyncIterator
+
+import falcon
+
+NDJSON = "application/x-ndjson"
+
+
+def wants_ndjson(req: falcon.Request) -> bool:
+    """Whether the client asked for a streamed NDJSON list over a JSON array; ``*/*`` gets the array."""
+    return req.client_prefers((falcon.MEDIA_JSON, NDJSON)) == NDJSON
+
+
+async def ndjson_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a request body into its non-blank lines as the chunks arrive."""
+    pending = b""
+    async for chunk in stream:
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+
+    if pending.strip():
+        yield pending
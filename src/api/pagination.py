@@ -0,0 +1,28 @@
+from urllib.parse import urlencode
+
+import falcon
+
+
+def set_total(resp: falcon.Response, total: int | None, count_mode: str) -> None:
+    """``X-Total-Count`` (left out for ``count=none``) plus ``X-Total-Count-Mode`` saying how it was produced."""
+    if total is not None:
+        resp.set_header("X-Total-Count", str(total))
+    resp.set_header("X-Total-Count-Mode", count_mode)
+
+
+def set_missing_ids(resp: falcon.Response, missing: list[int]) -> None:
+    """List the ids of an ``?ids=`` lookup that matched nothing in ``X-Missing-Ids``."""
+    if missing:
+        resp.set_header("X-Missing-Ids", ",".join(map(str, missing)))
+
+
+def set_next_cursor(req: falcon.Request, resp: falcon.Response, next_cursor: str | None) -> None:
+    """Advertise the following page via ``X-Next-Cursor`` and an RFC 8288 ``Link: rel="next"`` header."""
+    if next_cursor is None:
+        return
+
+    params = {k: v for k, v in req.params.items() if k not in {"page", "cursor"}}
+    params["cursor"] = next_cursor
+
+    resp.set_header("X-Next-Cursor", next_cursor)
+    resp.append_link(f"{req.path}?{urlencode(params, doseq=True)}", "next")
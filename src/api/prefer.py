@@ -0,0 +1,11 @@
+import falcon
+
+
+def wants_representation(req: falcon.Request, resp: falcon.Response) -> bool:
+    """Honour RFC 7240 ``Prefer: return=representation``, acknowledging it via ``Preference-Applied``."""
+    header = req.get_header("Prefer") or ""
+    if not any(pref.split(";")[0].strip().lower() == "return=representation" for pref in header.split(",")):
+        return False
+
+    resp.set_header("Preference-Applied", "return=representation")
+    return True
@@ -0,0 +1,27 @@
+"""Query-string value types shared by the ``*Filter`` schemas."""
+
+from typing import Annotated, Any
+
+from pydantic import BeforeValidator, Field
+
+
+def split_csv(value: Any) -> Any:  # noqa: ANN401
+    """``?ids=1,2`` and ``?ids=1&ids=2`` alike."""
+    if isinstance(value, str):
+        value = [value]
+
+    if isinstance(value, list):
+        return [part.strip() for item in value for part in str(item).split(",") if part.strip()]  # pyright:ignore[reportUnknownVariableType]
+
+    return value
+
+
+# Most ids one request may look up at once
+MAX_IDS = 100
+
+# A comma-separated list of ids; kept a tuple, in request order
+IdList = Annotated[
+    tuple[Annotated[int, Field(gt=0)], ...],
+    Field(min_length=1, max_length=MAX_IDS),
+    BeforeValidator(split_csv),
+]
@@ -0,0 +1,157 @@
+import asyncio
+from typing import Any, final
+
+import falcon
+import falcon.asgi
+import orjson
+from falcon.routing import CompiledRouter
+from spectree import Response
+
+from api.middleware.error_handler import generic_error_handler
+from api.schemas.batch_schemas import BatchError, BatchIn, BatchOperation, BatchResult
+from app.spectree import api
+from infrastructure.databases.unit_of_work import UnitOfWork
+
+# Sub-response headers worth returning besides the X-* ones; the rest describe the transport
+_RETURNED_HEADERS = frozenset({"etag", "link", "location", "preference-applied"})
+
+
+class _RollBack(Exception):  # noqa: N818
+    """Leaves the shared ``UnitOfWork`` so that it rolls back."""
+
+
+def _failed_dependency(failed: int) -> BatchResult:
+    return BatchResult(
+        status=424,
+        body={"error": "Failed Dependency", "description": f"Rolled back: write request #{failed} failed"},
+    )
+
+
+@final
+class BatchResource:
+    """``POST /batch``: several API calls in one HTTP request, dispatched in-process.
+
+    Sub-requests go straight to the routed responders (their Spectree validation included) with the
+    identity the batch authenticated as, skipping the middleware chain. ``GET``s run first and see the
+    database as it was before the batch; the other methods then run in submission order inside one
+    shared ``UnitOfWork`` and commit together, or not at all.
+
+    ``router`` and the options are the app's own, so sub-requests resolve and parse as top-level ones do.
+    """
+
+    def __init__(
+        self, router: CompiledRouter, req_options: falcon.RequestOptions, resp_options: falcon.ResponseOptions
+    ) -> None:
+        self._router = router
+        self._req_options = req_options
+        self._resp_options = resp_options
+
+    # POST /batch
+    @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
+        json=BatchIn,
+        resp=Response(
+            HTTP_200=list[BatchResult],
+            HTTP_400=BatchError,
+        ),
+        tags=["Batch"],
+        security={"bearerAuth": []},
+    )
+    async def on_post(self, req: falcon.asgi.Request, resp: falcon.asgi.Response):
+        """Run several API calls at once.
+
+        Returns one `{status, headers, body}` per sub-request, in submission order. `GET`s run first
+        (concurrently unless `concurrent_reads` is false) and don't see the batch's writes. The writes run
+        in order in one transaction: the first one that fails rolls all of them back, and every other
+        write then answers 424.
+        """
+        data: BatchIn = req.context.json
+        ops = data.requests
+        results: list[BatchResult | None] = [None] * len(ops)
+
+        reads = [i for i, op in enumerate(ops) if op.method == "GET"]
+        if data.concurrent_reads:
+            answers = await asyncio.gather(*(self._dispatch(req, ops[i]) for i in reads))
+        else:
+            answers = [await self._dispatch(req, ops[i]) for i in reads]
+
+        for i, answer in zip(reads, answers, strict=True):
+            results[i] = answer
+
+        writes = [i for i, op in enumerate(ops) if op.method != "GET"]
+        if writes:
+            try:
+                async with UnitOfWork.shared():
+                    for i in writes:
+                        results[i] = answer = await self._dispatch(req, ops[i])
+                        if answer.status >= 400:  # noqa: PLR2004
+                            raise _RollBack(i)
+
+            except _RollBack as rolled_back:
+                failed: int = rolled_back.args[0]
+                for i in writes:
+                    if i != failed:
+                        results[i] = _failed_dependency(failed)
+
+        resp.data = orjson.dumps([r.model_dump() for r in results if r is not None])
+        resp.content_type = falcon.MEDIA_JSON
+
+    async def _dispatch(self, parent: falcon.asgi.Request, op: BatchOperation) -> BatchResult:
+        """Run one sub-request through the router and the responder it resolves to."""
+        path, _, query = op.path.partition("?")
+        body = b"" if op.body is None else orjson.dumps(op.body)
+
+        headers = {name.lower(): value for name, value in op.headers.items()}
+        headers["content-length"] = str(len(body))
+        if body:
+            headers["content-type"] = falcon.MEDIA_JSON
+
+        async def receive() -> dict[str, Any]:  # noqa: RUF029
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        scope = {
+            **parent.scope,
+            "method": op.method,
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "headers": [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()],
+        }
+        req = falcon.asgi.Request(scope, receive, options=self._req_options)
+        resp = falcon.asgi.Response(options=self._resp_options)
+        req.context.user_id = parent.context.user_id
+        req.context.request_id = getattr(parent.context, "request_id", None)
+
+        params: dict[str, Any] = {}
+        try:
+            route = self._router.find(path, req)
+            if route is None:
+                raise falcon.HTTPNotFound
+
+            resource, methods, params, uri_template = route
+            if resource is self:
+                raise falcon.HTTPBadRequest(description="Batches do not nest")
+
+            req.uri_template = uri_template
+            await methods[op.method](req, resp, **params)
+
+        except Exception as exc:  # noqa: BLE001  # one sub-request failing is its own answer, not the batch's
+            await generic_error_handler(req, resp, exc, params)
+
+        if resp.stream is not None:
+            await generic_error_handler(
+                req, resp, falcon.HTTPBadRequest(description="Streamed responses cannot be batched"), params
+            )
+
+        rendered = await resp.render_body()
+        content_type = resp.content_type or ""
+        return BatchResult(
+            status=falcon.http_status_to_code(resp.status),
+            headers={
+                name: value
+                for name, value in resp.headers.items()
+                if name in _RETURNED_HEADERS or name.startswith("x-")
+            },
+            body=(orjson.loads(rendered) if content_type.startswith(falcon.MEDIA_JSON) else rendered.decode())
+            if rendered
+            else None,
+        )
@@ -1,20 +1,36 @@
+from collections import Counter
 from typing import final
 
 import falcon
 import spectree
 
+from api.etag import entity_etag, not_modified, page_etag
+from api.ndjson import wants_ndjson
+from api.pagination import set_missing_ids, set_next_cursor, set_total
+from api.prefer import wants_representation
 from api.schemas.order_schemas import (
+    OrderCheckout,
+    OrderCheckoutOut,
     OrderCreate,
     OrderError,
+    OrderExportFilter,
+    OrderFields,
     OrderFilter,
     OrderOut,
     OrderUpdate,
 )
+from api.serialization import set_json, set_json_list, set_ndjson_stream
 from app.spectree import api
+from common.export import EXPORT_FORMATS
 from services.use_cases.orders import (
+    CheckoutOrder,
     CreateOrder,
     DeleteOrder,
+    ExportOrders,
     GetOrder,
+    GetOrdersByIds,
+    GetOrderVersion,
+    GroupCommitCreateOrder,
     ListOrders,
     UpdateOrderFields,
 )
@@ -23,9 +39,19 @@ from services.use_cases.orders import (
 #  /orders — collection
 @final
 class OrdersCollection:
-    def __init__(self, create_uc: CreateOrder, list_uc: ListOrders):
+    def __init__(
+        self,
+        create_uc: CreateOrder | GroupCommitCreateOrder,
+        list_uc: ListOrders,
+        export_uc: ExportOrders,
+        checkout_uc: CheckoutOrder,
+        get_many_uc: GetOrdersByIds,
+    ):
         self._create = create_uc
         self._list = list_uc
+        self._export = export_uc
+        self._checkout = checkout_uc
+        self._get_many = get_many_uc
 
     # POST /orders
     @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
@@ -50,11 +76,41 @@ class OrdersCollection:
         resp.status = falcon.HTTP_201
         resp.media = OrderOut.model_validate(order).model_dump()
 
+    # POST /orders/checkout
+    @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
+        json=OrderCheckout,
+        resp=spectree.Response(
+            HTTP_201=OrderCheckoutOut,
+            HTTP_400=OrderError,
+            HTTP_404=OrderError,
+            HTTP_409=OrderError,
+        ),
+        tags=["Orders"],
+        security={"bearerAuth": []},
+    )
+    async def on_post_checkout(self, req: falcon.Request, resp: falcon.Response):
+        """Place an order from product lines.
+
+        The total is computed from the current catalog prices and the stock of every product is
+        reserved in the same transaction; 409 if any product has too little stock left.
+        """
+        data = req.context.json
+
+        quantities: Counter[int] = Counter()
+        for item in data.items:
+            quantities[item.product_id] += item.quantity
+
+        order, items = await self._checkout(data.user_id, quantities)
+
+        resp.status = falcon.HTTP_201
+        resp.media = OrderCheckoutOut.model_validate({**vars(order), "items": items}).model_dump()
+
     # GET /orders
     @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
         query=OrderFilter,
         resp=spectree.Response(
             HTTP_200=list[OrderOut],
+            HTTP_304=None,
         ),
         tags=["Orders"],
         security={"bearerAuth": []},
@@ -63,17 +119,59 @@ class OrdersCollection:
         """List orders.
 
         Returns a paginated list of all orders, or only those for a specific user if `user_id` is provided.
+        Pass the `cursor` from `X-Next-Cursor` to page by key instead of offset, and `fields` to only get those.
+        `ids` fetches a known set of orders in one request instead.
+        With `Accept: application/x-ndjson`, every matching order is streamed, one per line, without paging.
+        Send the page's `ETag` back as `If-None-Match` to get 304 while nothing on it has changed.
         """
         f = req.context.query
 
-        orders, total = await self._list(
+        if f.ids is not None:
+            orders, missing = await self._get_many(f.ids, f.fields)
+            set_missing_ids(resp, missing)
+            if not not_modified(req, resp, page_etag(orders, None, f.fields)):
+                set_json_list(resp, OrderOut, orders, f.fields)
+            return
+
+        if wants_ndjson(req):
+            set_ndjson_stream(resp, OrderOut, self._export(f.user_id, f.fields), f.fields)
+            return
+
+        orders, total, next_cursor, count_mode = await self._list(
             f.user_id,
             page=f.page,
             per_page=f.per_page,
+            cursor=f.cursor,
+            count=f.count,
+            fields=f.fields,
         )
 
-        resp.media = [OrderOut.model_validate(o).model_dump() for o in orders]
-        resp.set_header("X-Total-Count", str(total))
+        set_total(resp, total, count_mode)
+        set_next_cursor(req, resp, next_cursor)
+        if not not_modified(req, resp, page_etag(orders, total, f.fields)):
+            set_json_list(resp, OrderOut, orders, f.fields)
+
+    # GET /orders/export
+    @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
+        query=OrderExportFilter,
+        resp=spectree.Response(
+            HTTP_200=None,
+        ),
+        tags=["Orders"],
+        security={"bearerAuth": []},
+    )
+    async def on_get_export(self, req: falcon.Request, resp: falcon.Response):
+        """Export orders.
+
+        Streams every order (or every order of `user_id`) in id order as NDJSON or CSV.
+        Rows are read from the database in batches while the body is written, so there is no paging.
+        """
+        f = req.context.query
+        content_type, extension, encode = EXPORT_FORMATS[f.format]
+
+        resp.content_type = content_type
+        resp.downloadable_as = f"orders.{extension}"
+        resp.stream = encode(self._export(f.user_id))
 
 
 #  /orders/{order_id:int} — detail
@@ -82,17 +180,21 @@ class OrderDetail:
     def __init__(
         self,
         get_uc: GetOrder,
+        version_uc: GetOrderVersion,
         delete_uc: DeleteOrder,
         update_uc: UpdateOrderFields,
     ):
         self._get = get_uc
+        self._version = version_uc
         self._delete = delete_uc
         self._update = update_uc
 
     # GET /orders/{order_id}
     @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
+        query=OrderFields,
         resp=spectree.Response(
             HTTP_200=OrderOut,
+            HTTP_304=None,
             HTTP_400=OrderError,
             HTTP_404=OrderError,
         ),
@@ -103,17 +205,24 @@ class OrderDetail:
     async def on_get(self, req: falcon.Request, resp: falcon.Response, order_id: int):
         """Retrieve an order by ID.
 
-        Returns the order details for the specified order, or 404 if not found.
+        Returns the order details for the specified order (or just `fields`), or 404 if not found.
+        Send its `ETag` back as `If-None-Match` to get 304 while the order is unchanged.
         """
-        _ = req
+        fields = req.context.query.fields
 
-        order = await self._get(order_id)
+        if req.if_none_match:
+            version = await self._version(order_id)
+            if version is not None and not_modified(req, resp, entity_etag("order", order_id, version, fields)):
+                return
+
+        order = await self._get(order_id, fields)
         if order is None:
             resp.status = falcon.HTTP_404
             resp.media = OrderError(error="Order not found").model_dump()
             return
 
-        resp.media = OrderOut.model_validate(order).model_dump()
+        resp.etag = entity_etag("order", order_id, order.version, fields)
+        set_json(resp, OrderOut, order, fields)
 
     # DELETE /orders/{order_id}
     @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
@@ -142,6 +251,7 @@ class OrderDetail:
     @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
         json=OrderUpdate,
         resp=spectree.Response(
+            HTTP_200=OrderOut,
             HTTP_204=None,
             HTTP_400=OrderError,
             HTTP_404=OrderError,
@@ -154,8 +264,13 @@ class OrderDetail:
         """Update an order's total price.
 
         Applies a new `total_price` to the specified order.
+        Send `Prefer: return=representation` to get the updated order back instead of 204.
         """
         data = req.context.json
 
-        await self._update(order_id, data.total_price)
-        resp.status = falcon.HTTP_204
+        order = await self._update(order_id, data.total_price)
+        resp.etag = entity_etag("order", order_id, order.version)
+        if wants_representation(req, resp):
+            resp.media = OrderOut.model_validate(order).model_dump()
+        else:
+            resp.status = falcon.HTTP_204
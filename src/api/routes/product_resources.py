@@ -1,40 +1,100 @@
-from typing import final
+from collections.abc import Callable
+from typing import Any, final
 
 import falcon
+from pydantic import ValidationError
 from spectree import Response
 
+from api.etag import entity_etag, not_modified, page_etag
+from api.ndjson import NDJSON, ndjson_lines, wants_ndjson
+from api.pagination import set_missing_ids, set_next_cursor, set_total
+from api.prefer import wants_representation
 from api.schemas.product_schemas import (
+    ProductBulkItem,
+    ProductBulkOut,
     ProductCreate,
     ProductError,
+    ProductFields,
     ProductFilter,
     ProductOut,
     ProductUpdate,
 )
+from api.serialization import set_json, set_json_list, set_ndjson_stream
+from app.settings import settings
 from app.spectree import api
+from domain.products.entities import Product
 from services.use_cases.products import (
+    BulkCreateProducts,
+    BulkResult,
     CreateProduct,
     DeleteProduct,
+    ExportProducts,
     GetProduct,
+    GetProductsByIds,
+    GetProductVersion,
     ListProducts,
     UpdateProductFields,
 )
 
 
+def _validate_item(validate: Callable[[Any], ProductCreate], raw: Any) -> ProductCreate | str:  # noqa: ANN401
+    """Validate one bulk item, turning a failure into a one-line reason instead of failing the request."""
+    try:
+        return validate(raw)
+
+    except ValidationError as exc:
+        return "; ".join(
+            f"{'.'.join(map(str, err['loc']))}: {err['msg']}" if err["loc"] else err["msg"] for err in exc.errors()
+        )
+
+
+async def _read_bulk(req: falcon.Request) -> list[ProductCreate | str]:
+    """Parse and validate a JSON array or NDJSON body in one pass, capped at ``BULK_MAX_ITEMS``."""  # noqa: DOC501
+    too_large = falcon.HTTPContentTooLarge(description=f"At most {settings.BULK_MAX_ITEMS} items per request")
+
+    if req.content_type and req.content_type.startswith(NDJSON):
+        items: list[ProductCreate | str] = []
+        async for line in ndjson_lines(req.stream):
+            if len(items) == settings.BULK_MAX_ITEMS:
+                raise too_large
+
+            items.append(_validate_item(ProductCreate.model_validate_json, line))
+
+        return items
+
+    body = await req.get_media()
+    if not isinstance(body, list):
+        raise falcon.HTTPBadRequest(description="Expected a JSON array of products")
+
+    if len(body) > settings.BULK_MAX_ITEMS:  # pyright:ignore[reportUnknownArgumentType]
+        raise too_large
+
+    return [_validate_item(ProductCreate.model_validate, doc) for doc in body]  # pyright:ignore[reportUnknownVariableType]
+
+
 @final
 class ProductResource:
-    def __init__(
+    def __init__(  # noqa: PLR0913, PLR0917
         self,
         create_uc: CreateProduct,
         list_uc: ListProducts,
         get_uc: GetProduct,
+        version_uc: GetProductVersion,
         delete_uc: DeleteProduct,
         update_uc: UpdateProductFields,
+        bulk_create_uc: BulkCreateProducts,
+        get_many_uc: GetProductsByIds,
+        export_uc: ExportProducts,
     ):
         self._create = create_uc
         self._list = list_uc
         self._get = get_uc
+        self._version = version_uc
         self._delete = delete_uc
         self._update = update_uc
+        self._bulk_create = bulk_create_uc
+        self._get_many = get_many_uc
+        self._export = export_uc
 
     # POST /products
     @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
@@ -67,11 +127,52 @@ class ProductResource:
         resp.status = falcon.HTTP_201
         resp.media = ProductOut.model_validate(product).model_dump()
 
+    # POST /products/bulk
+    @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
+        resp=Response(
+            HTTP_200=ProductBulkOut,
+            HTTP_400=ProductError,
+            HTTP_413=ProductError,
+        ),
+        tags=["Products"],
+        security={"bearerAuth": []},
+    )
+    async def on_post_bulk(self, req: falcon.Request, resp: falcon.Response):
+        """Create products in bulk.
+
+        Takes a JSON array of products, or one product per line as `application/x-ndjson` for very large
+        payloads. Valid items are inserted together in one transaction; every item is reported back as
+        `created`, `conflict` (name already taken) or `invalid`, in submission order.
+        """
+        items = await _read_bulk(req)
+
+        products = [
+            Product(id=None, name=item.name, description=item.description, price=item.price, stock=item.stock)
+            for item in items
+            if isinstance(item, ProductCreate)
+        ]
+        outcomes = iter(await self._bulk_create(products))
+        results = [
+            next(outcomes) if isinstance(item, ProductCreate) else BulkResult("invalid", error=item) for item in items
+        ]
+        report = [
+            ProductBulkItem(index=i, status=r.status, id=r.product.id if r.product else None, error=r.error)
+            for i, r in enumerate(results)
+        ]
+
+        resp.media = ProductBulkOut(
+            created=sum(r.status == "created" for r in report),
+            conflicts=sum(r.status == "conflict" for r in report),
+            invalid=sum(r.status == "invalid" for r in report),
+            results=report,
+        ).model_dump()
+
     # GET /products
     @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
         query=ProductFilter,
         resp=Response(
             HTTP_200=list[ProductOut],
+            HTTP_304=None,
         ),
         tags=["Products"],
         security={"bearerAuth": []},
@@ -79,25 +180,50 @@ class ProductResource:
     async def on_get_collection(self, req: falcon.Request, resp: falcon.Response):
         """List products.
 
-        Returns a paginated list of products, optionally filtered by name and price range.
+        Returns a paginated list of products, optionally filtered by name and price range,
+        or ranked by full-text relevance when `q` is given.
+        Pass the `cursor` from `X-Next-Cursor` to page by key instead of offset, and `fields` to only get those.
+        `ids` fetches a known set of products in one request instead.
+        With `Accept: application/x-ndjson`, every matching product is streamed, one per line, without paging.
+        Send the page's `ETag` back as `If-None-Match` to get 304 while nothing on it has changed.
         """
         f = req.context.query
 
-        products, total = await self._list(
+        if f.ids is not None:
+            products, missing = await self._get_many(f.ids, f.fields)
+            set_missing_ids(resp, missing)
+            if not not_modified(req, resp, page_etag(products, None, f.fields)):
+                set_json_list(resp, ProductOut, products, f.fields)
+            return
+
+        if wants_ndjson(req):
+            batches = self._export(f.name_contains, f.min_price, f.max_price, f.q, f.fields)
+            set_ndjson_stream(resp, ProductOut, batches, f.fields)
+            return
+
+        products, total, next_cursor, count_mode = await self._list(
             page=f.page,
             per_page=f.per_page,
             name_contains=f.name_contains,
             min_price=f.min_price,
             max_price=f.max_price,
+            cursor=f.cursor,
+            q=f.q,
+            count=f.count,
+            fields=f.fields,
         )
 
-        resp.media = [ProductOut.model_validate(p).model_dump() for p in products]
-        resp.set_header("X-Total-Count", str(total))
+        set_total(resp, total, count_mode)
+        set_next_cursor(req, resp, next_cursor)
+        if not not_modified(req, resp, page_etag(products, total, f.fields)):
+            set_json_list(resp, ProductOut, products, f.fields)
 
     # GET /products/{product_id}
     @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
+        query=ProductFields,
         resp=Response(
             HTTP_200=ProductOut,
+            HTTP_304=None,
             HTTP_400=ProductError,
             HTTP_404=ProductError,
         ),
@@ -108,22 +234,30 @@ class ProductResource:
     async def on_get_detail(self, req: falcon.Request, resp: falcon.Response, product_id: int):
         """Retrieve a product by ID.
 
-        Returns full details of the specified product, or 404 if not found.
+        Returns full details of the specified product (or just `fields`), or 404 if not found.
+        Send its `ETag` back as `If-None-Match` to get 304 while the product is unchanged.
         """
-        _ = req
+        fields = req.context.query.fields
 
-        product = await self._get(product_id)
+        if req.if_none_match:
+            version = await self._version(product_id)
+            if version is not None and not_modified(req, resp, entity_etag("product", product_id, version, fields)):
+                return
+
+        product = await self._get(product_id, fields)
         if product is None:
             resp.status = falcon.HTTP_404
             resp.media = ProductError(error="Product not found").model_dump()
             return
 
-        resp.media = ProductOut.model_validate(product).model_dump()
+        resp.etag = entity_etag("product", product_id, product.version, fields)
+        set_json(resp, ProductOut, product, fields)
 
     # PATCH /products/{product_id}
     @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
         json=ProductUpdate,
         resp=Response(
+            HTTP_200=ProductOut,
             HTTP_204=None,
             HTTP_400=ProductError,
             HTTP_404=ProductError,
@@ -136,11 +270,16 @@ class ProductResource:
         """Update product price and/or stock.
 
         Modifies one or both of the price and stock fields on a product.
+        Send `Prefer: return=representation` to get the updated product back instead of 204.
         """
         data = req.context.json
 
-        await self._update(product_id, data.price, data.stock)
-        resp.status = falcon.HTTP_204
+        product = await self._update(product_id, data.price, data.stock)
+        resp.etag = entity_etag("product", product_id, product.version)
+        if wants_representation(req, resp):
+            resp.media = ProductOut.model_validate(product).model_dump()
+        else:
+            resp.status = falcon.HTTP_204
 
     # DELETE /products/{product_id}
     @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
@@ -148,6 +287,7 @@ class ProductResource:
             HTTP_204=None,
             HTTP_400=ProductError,
             HTTP_404=ProductError,
+            HTTP_409=ProductError,
         ),
         tags=["Products"],
         security={"bearerAuth": []},
@@ -156,7 +296,7 @@ class ProductResource:
     async def on_delete_detail(self, req: falcon.Request, resp: falcon.Response, product_id: int):
         """Delete a product by ID.
 
-        Removes the product from the catalog.
+        Removes the product from the catalog; a product that orders still reference can't be removed (409).
         """
         _ = req
 
@@ -3,26 +3,42 @@ from typing import final
 import falcon
 from spectree import Response
 
-from api.schemas.user_schemas import UserCreate, UserError, UserFilter, UserOut, UserUpdate
+from api.ndjson import wants_ndjson
+from api.pagination import set_missing_ids, set_next_cursor, set_total
+from api.prefer import wants_representation
+from api.schemas.user_schemas import UserCreate, UserError, UserFields, UserFilter, UserOut, UserUpdate
+from api.serialization import set_json, set_json_list, set_ndjson_stream
 from app.spectree import api
-from services.use_cases.users import DeleteUser, GetUser, ListUsers, RegisterUser, UpdateUserFields
+from services.use_cases.users import (
+    DeleteUser,
+    ExportUsers,
+    GetUser,
+    GetUsersByIds,
+    ListUsers,
+    RegisterUser,
+    UpdateUserFields,
+)
 
 
 @final
 class UserResource:
-    def __init__(
+    def __init__(  # noqa: PLR0913, PLR0917
         self,
         register_uc: RegisterUser,
         list_uc: ListUsers,
         get_uc: GetUser,
         update_uc: UpdateUserFields,
         delete_uc: DeleteUser,
+        get_many_uc: GetUsersByIds,
+        export_uc: ExportUsers,
     ):
         self._register = register_uc
         self._list = list_uc
         self._get = get_uc
         self._update = update_uc
         self._delete = delete_uc
+        self._get_many = get_many_uc
+        self._export = export_uc
 
     # POST /users
     @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
@@ -63,21 +79,39 @@ class UserResource:
         """List all users.
 
         Returns a paginated list, optionally filtered by username or email substring.
+        Pass the `cursor` from `X-Next-Cursor` to page by key instead of offset, and `fields` to only get those.
+        `ids` fetches a known set of users in one request instead.
+        With `Accept: application/x-ndjson`, every matching user is streamed, one per line, without paging.
         """
         f = req.context.query
 
-        users, total = await self._list(
+        if f.ids is not None:
+            users, missing = await self._get_many(f.ids, f.fields)
+            set_json_list(resp, UserOut, users, f.fields)
+            set_missing_ids(resp, missing)
+            return
+
+        if wants_ndjson(req):
+            set_ndjson_stream(resp, UserOut, self._export(f.username_contains, f.email_contains, f.fields), f.fields)
+            return
+
+        users, total, next_cursor, count_mode = await self._list(
             page=f.page,
             per_page=f.per_page,
             username_contains=f.username_contains,
             email_contains=f.email_contains,
+            cursor=f.cursor,
+            count=f.count,
+            fields=f.fields,
         )
 
-        resp.media = [UserOut.model_validate(u).model_dump() for u in users]
-        resp.set_header("X-Total-Count", str(total))
+        set_json_list(resp, UserOut, users, f.fields)
+        set_total(resp, total, count_mode)
+        set_next_cursor(req, resp, next_cursor)
 
     # GET /users/{user_id}
     @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
+        query=UserFields,
         resp=Response(
             HTTP_200=UserOut,
             HTTP_400=UserError,
@@ -90,22 +124,23 @@ class UserResource:
     async def on_get_detail(self, req: falcon.Request, resp: falcon.Response, user_id: int):
         """Retrieve a specific user by ID.
 
-        Returns the user's full profile or 404 if not found.
+        Returns the user's full profile (or just `fields`) or 404 if not found.
         """
-        _ = req
+        fields = req.context.query.fields
 
-        user = await self._get(user_id)
+        user = await self._get(user_id, fields)
         if user is None:
             resp.status = falcon.HTTP_404
             resp.media = UserError(error="User not found").model_dump()
             return
 
-        resp.media = UserOut.model_validate(user).model_dump()
+        set_json(resp, UserOut, user, fields)
 
     # PATCH /users/{user_id}
     @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
         json=UserUpdate,
         resp=Response(
+            HTTP_200=UserOut,
             HTTP_204=None,
             HTTP_400=UserError,
             HTTP_404=UserError,
@@ -120,12 +155,16 @@ class UserResource:
         """Update a user's username and/or email.
 
         Applies one or both of the `username` and `email` fields to the specified user account.
-        Returns 204 No Content on success, or 400/404 if validation fails or the user doesn't exist.
+        Returns 204 No Content on success (200 with the updated user for `Prefer: return=representation`),
+        or 400/404 if validation fails or the user doesn't exist.
         """
         data = req.context.json
 
-        await self._update(user_id, data.username, data.email)
-        resp.status = falcon.HTTP_204
+        user = await self._update(user_id, data.username, data.email)
+        if wants_representation(req, resp):
+            resp.media = UserOut.model_validate(user).model_dump()
+        else:
+            resp.status = falcon.HTTP_204
 
     # DELETE /users/{user_id}
     @api.validate(  # pyright:ignore[reportUntypedFunctionDecorator, reportUnknownMemberType]
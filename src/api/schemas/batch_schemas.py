@@ -0,0 +1,53 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field, JsonValue
+
+
+class BatchOperation(BaseModel):
+    method: Literal["GET", "POST", "PATCH", "PUT", "DELETE"] = Field(
+        ...,
+        description="HTTP method of the sub-request; anything but `GET` is a write",
+        examples=["GET"],
+    )
+    path: str = Field(
+        ...,
+        pattern=r"^/",
+        max_length=2_000,
+        description="Path and query string, as they would be requested directly",
+        examples=["/products?ids=12,7,40&fields=id,price"],
+    )
+    body: JsonValue = Field(None, description="JSON body of the sub-request", examples=[{"price": 24.99}])
+    headers: dict[str, str] = Field(
+        default_factory=dict,
+        description="Extra headers (`Prefer`, `If-None-Match` …); authentication comes from the batch itself",
+        examples=[{"Prefer": "return=representation"}],
+    )
+
+
+class BatchIn(BaseModel):
+    requests: list[BatchOperation] = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="Sub-requests; the responses come back in the same order",
+    )
+    concurrent_reads: bool = Field(
+        default=True,
+        description="Run the `GET`s concurrently rather than one after the other",
+        examples=[False],
+    )
+
+
+class BatchResult(BaseModel):
+    status: int = Field(..., description="HTTP status of the sub-request", examples=[200])
+    headers: dict[str, str] = Field(
+        default_factory=dict,
+        description="`ETag`, `Location` and the `X-*` headers the sub-request answered with",
+        examples=[{"ETag": '"product-7-v3"'}],
+    )
+    body: JsonValue = Field(None, description="JSON body of the sub-response", examples=[{"id": 7, "price": 24.99}])
+
+
+class BatchError(BaseModel):
+    error: str = Field(..., description="Why the batch was refused", examples=["Bad Request"])
+    request_id: str | None = None
@@ -1,6 +1,16 @@
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, Field, FieldSerializationInfo, field_serializer
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    FieldSerializationInfo,
+    field_serializer,
+)
+
+from api.query import IdList
+from api.serialization import fieldset
 
 
 class OrderCreate(BaseModel):
@@ -18,6 +28,34 @@ class OrderCreate(BaseModel):
     )
 
 
+class OrderItemIn(BaseModel):
+    product_id: int = Field(..., gt=0, description="ID of the product to order", examples=[7])
+    quantity: int = Field(..., gt=0, le=10_000, description="Units to order", examples=[2])
+
+
+class OrderCheckout(BaseModel):
+    user_id: int = Field(
+        ...,
+        gt=0,
+        description="ID of the user placing the order",
+        examples=[1, 15, 25],
+    )
+    items: list[OrderItemIn] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Products and quantities; repeated products are added up",
+    )
+
+
+class OrderItemOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)  # pyright:ignore[reportUnannotatedClassAttribute]
+
+    product_id: int = Field(..., description="ID of the ordered product", examples=[7])
+    quantity: int = Field(..., description="Units ordered", examples=[2])
+    unit_price: float = Field(..., description="Catalog price per unit when the order was placed", examples=[9.99])
+
+
 class OrderOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)  # pyright:ignore[reportUnannotatedClassAttribute]
 
@@ -49,10 +87,43 @@ class OrderOut(BaseModel):
         return dt.isoformat()
 
 
-class OrderFilter(BaseModel):
+class OrderCheckoutOut(OrderOut):
+    items: list[OrderItemOut] = Field(..., description="The order's product lines")
+
+
+class OrderFields(BaseModel):
+    fields: fieldset(OrderOut) | None = Field(  # pyright:ignore[reportInvalidTypeForm]
+        None,
+        description="Comma-separated subset of the `OrderOut` fields to return; only those columns are read",
+        examples=["id,total_price"],
+    )
+
+
+class OrderFilter(OrderFields):
+    ids: IdList | None = Field(
+        None,
+        description="Look up exactly these ids (at most 100), in this order, in one query; other filters and "
+        "paging are ignored, and ids that don't exist are listed in `X-Missing-Ids`",
+        examples=["3,15,123"],
+    )
     user_id: int | None = Field(None, gt=0, description="Only return orders for this user ID", examples=[1, 15, 25])
     page: int = Field(1, ge=1, description="Page number (1-based)", examples=[3])
     per_page: int = Field(20, ge=1, le=100, description="Number of items per page", examples=[50])
+    cursor: str | None = Field(
+        None,
+        description="Opaque cursor from a previous page's `X-Next-Cursor`/`Link` header; takes precedence over `page`",
+        examples=["WzQyXQ"],
+    )
+    count: Literal["exact", "estimate", "none"] = Field(
+        "exact",
+        description="`X-Total-Count` source: an exact count, a cached count up to `COUNT_CACHE_TTL` old, or none at all",
+        examples=["estimate"],
+    )
+
+
+class OrderExportFilter(BaseModel):
+    user_id: int | None = Field(None, gt=0, description="Only export orders for this user ID", examples=[1, 15, 25])
+    format: Literal["ndjson", "csv"] = Field("ndjson", description="Output format", examples=["csv"])
 
 
 class OrderUpdate(BaseModel):
@@ -1,7 +1,10 @@
-from typing import Self
+from typing import Literal, Self
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
+from api.query import IdList
+from api.serialization import fieldset
+
 
 class ProductCreate(BaseModel):
     name: str = Field(
@@ -61,14 +64,44 @@ class ProductOut(BaseModel):
     )
 
 
-class ProductFilter(BaseModel):
+class ProductFields(BaseModel):
+    fields: fieldset(ProductOut) | None = Field(  # pyright:ignore[reportInvalidTypeForm]
+        None,
+        description="Comma-separated subset of the `ProductOut` fields to return; only those columns are read",
+        examples=["id,name,price"],
+    )
+
+
+class ProductFilter(ProductFields):
+    ids: IdList | None = Field(
+        None,
+        description="Look up exactly these ids (at most 100), in this order, in one query; other filters and "
+        "paging are ignored, and ids that don't exist are listed in `X-Missing-Ids`",
+        examples=["12,7,40"],
+    )
     name_contains: str | None = Field(
         None, description="Only return products with name containing this", examples=["mouse"]
     )
+    q: str | None = Field(
+        None,
+        max_length=100,
+        description="Full-text search over name and description; every word matches as a prefix, best hits first",
+        examples=["wire mou"],
+    )
     min_price: float | None = Field(None, description="Products with minimum price", examples=[10])
     max_price: float | None = Field(None, description="Products with maximum price", examples=[100])
     page: int = Field(1, ge=1, description="Page number (1-based)", examples=[3])
     per_page: int = Field(20, ge=1, le=100, description="Number of items per page", examples=[50])
+    cursor: str | None = Field(
+        None,
+        description="Opaque cursor from a previous page's `X-Next-Cursor`/`Link` header; takes precedence over `page`",
+        examples=["WzQyXQ"],
+    )
+    count: Literal["exact", "estimate", "none"] = Field(
+        "exact",
+        description="`X-Total-Count` source: an exact count, a cached count up to `COUNT_CACHE_TTL` old, or none at all",
+        examples=["estimate"],
+    )
 
 
 class ProductUpdate(BaseModel):
@@ -92,6 +125,24 @@ class ProductUpdate(BaseModel):
         return self
 
 
+class ProductBulkItem(BaseModel):
+    index: int = Field(..., description="Position of the item in the submitted array / NDJSON stream", examples=[0])
+    status: Literal["created", "conflict", "invalid"] = Field(
+        ...,
+        description="`conflict`: the name (case-insensitively) exists already or appeared earlier in the batch",
+        examples=["created"],
+    )
+    id: int | None = Field(None, description="ID of the created product", examples=[123])
+    error: str | None = Field(None, description="Why the item was not created", examples=["Duplicate product name"])
+
+
+class ProductBulkOut(BaseModel):
+    created: int = Field(..., description="Number of products created", examples=[998])
+    conflicts: int = Field(..., description="Number of items skipped over a duplicate name", examples=[1])
+    invalid: int = Field(..., description="Number of items that failed validation", examples=[1])
+    results: list[ProductBulkItem] = Field(..., description="One entry per submitted item, in submission order")
+
+
 class ProductError(BaseModel):
     error: str = Field(
         ...,
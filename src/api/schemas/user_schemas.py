@@ -1,7 +1,10 @@
-from typing import Self
+from typing import Literal, Self
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, model_validator
 
+from api.query import IdList
+from api.serialization import fieldset
+
 
 class UserCreate(BaseModel):
     username: str = Field(
@@ -44,7 +47,21 @@ class UserOut(BaseModel):
     )
 
 
-class UserFilter(BaseModel):
+class UserFields(BaseModel):
+    fields: fieldset(UserOut) | None = Field(  # pyright:ignore[reportInvalidTypeForm]
+        None,
+        description="Comma-separated subset of the `UserOut` fields to return; only those columns are read",
+        examples=["id,username"],
+    )
+
+
+class UserFilter(UserFields):
+    ids: IdList | None = Field(
+        None,
+        description="Look up exactly these ids (at most 100), in this order, in one query; other filters and "
+        "paging are ignored, and ids that don't exist are listed in `X-Missing-Ids`",
+        examples=["1,5,15"],
+    )
     username_contains: str | None = Field(
         None, description="Only return users with username containing this", examples=["th"]
     )
@@ -53,6 +70,16 @@ class UserFilter(BaseModel):
     )
     page: int = Field(1, ge=1, description="Page number (1-based)", examples=[3])
     per_page: int = Field(20, ge=1, le=100, description="Number of items per page", examples=[50])
+    cursor: str | None = Field(
+        None,
+        description="Opaque cursor from a previous page's `X-Next-Cursor`/`Link` header; takes precedence over `page`",
+        examples=["WzQyXQ"],
+    )
+    count: Literal["exact", "estimate", "none"] = Field(
+        "exact",
+        description="`X-Total-Count` source: an exact count, a cached count up to `COUNT_CACHE_TTL` old, or none at all",
+        examples=["estimate"],
+    )
 
 
 class UserUpdate(BaseModel):
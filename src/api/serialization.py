@@ -0,0 +1,101 @@
+"""JSON bodies built straight from domain dataclasses, without a Pydantic model per row.
+
+The ``*Out`` schemas still describe these responses in OpenAPI and decide which attributes go out;
+orjson then encodes the projected values itself, datetimes included. A body set through
+``resp.data`` is also left alone by Spectree's response validation, the second Pydantic pass a list
+used to pay for.
+
+A ``fields`` query parameter (see :func:`fieldset`) narrows the projection to a subset of the schema.
+:func:`set_ndjson_stream` applies the same projection to a list streamed one line per item.
+"""
+
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Sequence
+from functools import cache
+from operator import attrgetter
+from typing import Annotated, Any, Literal
+
+import falcon
+import orjson
+from pydantic import AfterValidator, BaseModel, BeforeValidator
+
+from api.ndjson import NDJSON
+from api.query import split_csv
+
+type Projection = Callable[[Any], dict[str, Any]]
+type FieldSet = tuple[str, ...]
+
+
+def fieldset(model: type[BaseModel]) -> Any:  # noqa: ANN401
+    """Type of a ``fields`` query parameter: a non-empty, comma-separated subset of ``model``'s fields.
+
+    Unknown names fail validation; the result is a tuple in schema order, so ``name,id`` and ``id,name``
+    share one projection, one SQL template and one cached response.
+    """
+    names = tuple(model.model_fields)
+
+    def in_schema_order(requested: FieldSet) -> FieldSet:
+        if not requested:
+            raise ValueError("at least one field is required")  # noqa: EM101, TRY003
+
+        return tuple(name for name in names if name in requested)
+
+    return Annotated[
+        tuple[Literal[names], ...],  # pyright:ignore[reportInvalidTypeArguments]
+        BeforeValidator(split_csv),
+        AfterValidator(in_schema_order),
+    ]
+
+
+@cache
+def _projection(model: type[BaseModel], fields: FieldSet | None = None) -> Projection:
+    names = fields or tuple(model.model_fields)
+    values = attrgetter(*names)
+
+    if len(names) == 1:
+        return lambda obj: {names[0]: values(obj)}
+
+    return lambda obj: dict(zip(names, values(obj), strict=True))
+
+
+def dump_many(model: type[BaseModel], items: Iterable[Any], fields: FieldSet | None = None) -> bytes:
+    """``[model.model_validate(i).model_dump(include=fields) for i in items]`` as JSON, minus the models."""
+    return orjson.dumps(list(map(_projection(model, fields), items)))
+
+
+def set_json_list(
+    resp: falcon.Response, model: type[BaseModel], items: Iterable[Any], fields: FieldSet | None = None
+) -> None:
+    resp.data = dump_many(model, items, fields)
+    resp.content_type = falcon.MEDIA_JSON
+
+
+async def dump_ndjson(
+    model: type[BaseModel], batches: AsyncIterable[Sequence[Any]], fields: FieldSet | None = None
+) -> AsyncIterator[bytes]:
+    """``dump_many`` as NDJSON, one chunk per batch, so only the batch being sent is ever in memory."""
+    project = _projection(model, fields)
+
+    async for batch in batches:
+        if batch:
+            yield b"".join(orjson.dumps(project(item), option=orjson.OPT_APPEND_NEWLINE) for item in batch)
+
+
+def set_ndjson_stream(
+    resp: falcon.Response,
+    model: type[BaseModel],
+    batches: AsyncIterable[Sequence[Any]],
+    fields: FieldSet | None = None,
+) -> None:
+    """Stream every item of ``batches`` as ``model``; the next batch is read once the last one was sent."""
+    resp.stream = dump_ndjson(model, batches, fields)
+    resp.content_type = NDJSON
+
+
+def set_json(resp: falcon.Response, model: type[BaseModel], item: Any, fields: FieldSet | None = None) -> None:  # noqa: ANN401
+    """One ``item`` as ``model``; a sparse fieldset skips the model, whose validation it could not pass."""
+    if fields is None:
+        resp.media = model.model_validate(item).model_dump()
+        return
+
+    resp.data = orjson.dumps(_projection(model, fields)(item))
+    resp.content_type = falcon.MEDIA_JSON
@@ -0,0 +1,73 @@
+import asyncio
+import os
+from pathlib import Path
+from stat import S_ISREG
+from typing import Any, final
+
+import falcon
+import falcon.asgi
+from falcon.routing import StaticRouteAsync
+
+from common.compression import CODECS, negotiate
+
+
+def _fresh(sibling: str, modified: float) -> bool:
+    """Whether ``sibling`` exists and was written after its source last changed; an older one is stale."""
+    try:
+        stat = os.stat(sibling)
+    except OSError:
+        return False
+
+    return S_ISREG(stat.st_mode) and stat.st_mtime >= modified
+
+
+@final
+class PrecompressedStaticRoute(StaticRouteAsync):
+    """``StaticRouteAsync`` that answers with a precompressed sibling (``app.js.br``, ``app.js.gz`` …) when
+    the client accepts its coding, instead of the raw file. Ranges and 304s keep the stock behaviour.
+
+    A sibling older than its source is ignored, so an asset edited under a running server is sent raw
+    until ``manage.py precompress-static`` runs again.
+    """
+
+    async def __call__(  # pyright:ignore[reportIncompatibleMethodOverride]
+        self,
+        req: falcon.asgi.Request,
+        resp: falcon.asgi.Response,
+        ws: falcon.asgi.WebSocket | None = None,
+        **kw: Any,  # noqa: ANN401
+    ) -> None:
+        await super().__call__(req, resp, ws, **kw)
+        if resp.stream is None or falcon.http_status_to_code(resp.status) != 200:  # noqa: PLR2004
+            return
+
+        source = self._served_path(req)
+        modified = os.stat(source).st_mtime
+        available = tuple(coding for coding, (_, suffix, _) in CODECS.items() if _fresh(source + suffix, modified))
+        coding = negotiate(req.get_header("Accept-Encoding"), available)
+        resp.append_header("Vary", "Accept-Encoding")
+        if coding is None:
+            return
+
+        await resp.stream.close()  # pyright:ignore[reportAttributeAccessIssue]
+        resp.stream = None
+        resp.data = await asyncio.to_thread(Path(source + CODECS[coding][1]).read_bytes)
+        resp.content_length = len(resp.data)
+        resp.set_header("Content-Encoding", coding)
+        resp.set_header("ETag", f"W/{resp.etag}")  # same validator as the raw file, but not byte-identical
+        resp.delete_header("Accept-Ranges")
+
+    def _served_path(self, req: falcon.asgi.Request) -> str:
+        # the parent has already vetted the path: it only has to be resolved again, fallback included
+        path = os.path.join(self._directory, os.path.normpath(req.path[len(self._prefix) :]))
+        if self._fallback_filename is not None and not os.path.isfile(path):
+            return self._fallback_filename
+
+        return path
+
+
+@final
+class App(falcon.asgi.App):
+    """``falcon.asgi.App`` whose ``add_static_route`` serves precompressed siblings."""
+
+    _STATIC_ROUTE_TYPE = PrecompressedStaticRoute  # pyright:ignore[reportIncompatibleVariableOverride]
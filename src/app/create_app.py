@@ -9,28 +9,38 @@ so that DB startup/shutdown hooks fire automatically.
 from __future__ import annotations
 
 import asyncio
+from dataclasses import asdict
 from pathlib import Path
 from typing import TypedDict, final
 
-import falcon.asgi
+import falcon
 import falcon.media
 import orjson
 from falcon import CORSMiddleware
+from falcon.routing import CompiledRouter
 from swagger_ui_bundle import swagger_ui_path
 
+from api.middleware.compression import CompressionMiddleware
 from api.middleware.error_handler import generic_error_handler
 from api.middleware.jwt import JWTMiddleware
 from api.middleware.lifespan import LifespanMiddleware
 from api.middleware.request_logger import RequestLoggerMiddleware
+from api.middleware.response_cache import ResponseCacheMiddleware
+from api.routes.batch_resource import BatchResource
 from api.routes.login_resource import LoginResource
 from api.routes.order_resources import OrderDetail, OrdersCollection
 from api.routes.product_resources import ProductResource
 from api.routes.user_resources import UserResource
+from api.static import App
 from app.settings import settings
 from app.spectree import api
 from common.logging import setup_logging
-from infrastructure.databases.db import close_db, init_db
+from infrastructure.cache.counts import count_cache
+from infrastructure.cache.entities import entity_cache
+from infrastructure.cache.responses import response_cache
+from infrastructure.databases.db import ReadSessionLocal, close_db, init_db
 from infrastructure.databases.unit_of_work import UnitOfWork
+from infrastructure.databases.write_serializer import close_write_serializer, write_serializer
 from infrastructure.jwt.service import JsonWebTokenService
 from infrastructure.sqlalchemy import events as sa_events
 from infrastructure.sqlalchemy.repositories import (
@@ -40,22 +50,33 @@ from infrastructure.sqlalchemy.repositories import (
 )
 from services.use_cases.auth import AuthenticateUser
 from services.use_cases.orders import (
+    CheckoutOrder,
     CreateOrder,
     DeleteOrder,
+    ExportOrders,
     GetOrder,
+    GetOrdersByIds,
+    GetOrderVersion,
+    GroupCommitCreateOrder,
     ListOrders,
     UpdateOrderFields,
 )
 from services.use_cases.products import (
+    BulkCreateProducts,
     CreateProduct,
     DeleteProduct,
+    ExportProducts,
     GetProduct,
+    GetProductsByIds,
+    GetProductVersion,
     ListProducts,
     UpdateProductFields,
 )
 from services.use_cases.users import (
     DeleteUser,
+    ExportUsers,
     GetUser,
+    GetUsersByIds,
     ListUsers,
     RegisterUser,
     UpdateUserFields,
@@ -83,19 +104,29 @@ class _Services(TypedDict):
 
 class _UseCases(TypedDict):
     auth: AuthenticateUser
-    create_order: CreateOrder
+    create_order: CreateOrder | GroupCommitCreateOrder
+    checkout_order: CheckoutOrder
     list_orders: ListOrders
+    export_orders: ExportOrders
     get_order: GetOrder
+    get_orders_by_ids: GetOrdersByIds
+    get_order_version: GetOrderVersion
     delete_order: DeleteOrder
     update_order_fields: UpdateOrderFields
     create_product: CreateProduct
     list_products: ListProducts
+    export_products: ExportProducts
     get_product: GetProduct
+    get_products_by_ids: GetProductsByIds
+    get_product_version: GetProductVersion
     delete_product: DeleteProduct
     update_product_fields: UpdateProductFields
+    bulk_create_products: BulkCreateProducts
     register_user: RegisterUser
     list_users: ListUsers
+    export_users: ExportUsers
     get_user: GetUser
+    get_users_by_ids: GetUsersByIds
     update_user_fields: UpdateUserFields
     delete_user: DeleteUser
 
@@ -116,13 +147,14 @@ def _create_repositories() -> _Repositories:
     -------
     _Repositories
         Mapping containing fully initialised repository instances for
-        ``orders``, ``users`` and ``products`` aggregates.
+        ``orders``, ``users`` and ``products`` aggregates. They back the
+        read use cases, so their queries run on the read-only engine.
 
     """
     return {
-        "orders": SQLAlchemyOrderRepository(),
-        "users": SQLAlchemyUserRepository(),
-        "products": SQLAlchemyProductRepository(),
+        "orders": SQLAlchemyOrderRepository(read_sessions=ReadSessionLocal),
+        "users": SQLAlchemyUserRepository(read_sessions=ReadSessionLocal),
+        "products": SQLAlchemyProductRepository(read_sessions=ReadSessionLocal),
     }
 
 
@@ -161,21 +193,35 @@ def _create_use_cases(repos: _Repositories, services: _Services) -> _UseCases:
         # Auth
         "auth": AuthenticateUser(repos["users"], services["jwt"]),
         # Orders
-        "create_order": CreateOrder(UnitOfWork),
+        "create_order": GroupCommitCreateOrder(
+            UnitOfWork, settings.ORDER_GROUP_COMMIT_WINDOW_MS, settings.ORDER_GROUP_COMMIT_MAX_BATCH
+        )
+        if settings.ORDER_GROUP_COMMIT
+        else CreateOrder(UnitOfWork),
+        "checkout_order": CheckoutOrder(UnitOfWork),
         "list_orders": ListOrders(repos["orders"]),
+        "export_orders": ExportOrders(repos["orders"]),
         "get_order": GetOrder(repos["orders"]),
+        "get_orders_by_ids": GetOrdersByIds(repos["orders"]),
+        "get_order_version": GetOrderVersion(repos["orders"]),
         "delete_order": DeleteOrder(UnitOfWork),
         "update_order_fields": UpdateOrderFields(UnitOfWork),
         # Products
         "create_product": CreateProduct(UnitOfWork),
         "list_products": ListProducts(repos["products"]),
+        "export_products": ExportProducts(repos["products"]),
         "get_product": GetProduct(repos["products"]),
+        "get_products_by_ids": GetProductsByIds(repos["products"]),
+        "get_product_version": GetProductVersion(repos["products"]),
         "delete_product": DeleteProduct(UnitOfWork),
         "update_product_fields": UpdateProductFields(UnitOfWork),
+        "bulk_create_products": BulkCreateProducts(UnitOfWork),
         # Users
         "register_user": RegisterUser(UnitOfWork),
         "list_users": ListUsers(repos["users"]),
+        "export_users": ExportUsers(repos["users"]),
         "get_user": GetUser(repos["users"]),
+        "get_users_by_ids": GetUsersByIds(repos["users"]),
         "update_user_fields": UpdateUserFields(UnitOfWork),
         "delete_user": DeleteUser(UnitOfWork),
     }
@@ -198,9 +244,12 @@ def _create_resources(uc: _UseCases) -> _Resources:
     """
     return {
         "login": LoginResource(uc["auth"]),
-        "orders_collection": OrdersCollection(uc["create_order"], uc["list_orders"]),
+        "orders_collection": OrdersCollection(
+            uc["create_order"], uc["list_orders"], uc["export_orders"], uc["checkout_order"], uc["get_orders_by_ids"]
+        ),
         "order_detail": OrderDetail(
             uc["get_order"],
+            uc["get_order_version"],
             uc["delete_order"],
             uc["update_order_fields"],
         ),
@@ -208,8 +257,12 @@ def _create_resources(uc: _UseCases) -> _Resources:
             uc["create_product"],
             uc["list_products"],
             uc["get_product"],
+            uc["get_product_version"],
             uc["delete_product"],
             uc["update_product_fields"],
+            uc["bulk_create_products"],
+            uc["get_products_by_ids"],
+            uc["export_products"],
         ),
         "users": UserResource(
             uc["register_user"],
@@ -217,6 +270,8 @@ def _create_resources(uc: _UseCases) -> _Resources:
             uc["get_user"],
             uc["update_user_fields"],
             uc["delete_user"],
+            uc["get_users_by_ids"],
+            uc["export_users"],
         ),
     }
 
@@ -243,6 +298,22 @@ class _FaviconResource:
         resp.data = await asyncio.to_thread((swagger_ui_path / "favicon-32x32.png").read_bytes)
 
 
+@final
+class _StatsResource:
+    """Expose in-process cache and connection-pool counters (authenticated like every other route)."""
+
+    async def on_get(self, req: falcon.Request, resp: falcon.Response):  # noqa: PLR6301
+        _ = req
+
+        resp.media = {
+            "entity_cache": asdict(entity_cache.stats) | {"stale_writes": entity_cache.stale_writes},
+            "count_cache": asdict(count_cache.stats),
+            "response_cache": asdict(response_cache.stats),
+            "db_pool": {name: asdict(stats) for name, stats in sa_events.pool_stats.items()},
+            "write_queue": asdict(write_serializer.stats) if write_serializer is not None else None,
+        }
+
+
 @final
 class CrashResource:  # Just blowing things up =)
     async def on_get(self, req: falcon.Request, resp: falcon.Response):  # noqa: PLR6301
@@ -255,6 +326,11 @@ class CrashResource:  # Just blowing things up =)
 
 
 # ------------------------ 5. Public factory ----------------------------------
+async def _shutdown() -> None:
+    await close_write_serializer()
+    await close_db()
+
+
 def create_app() -> LifespanMiddleware:
     """Build and return an ASGI application wrapped in ``LifespanMiddleware``.
 
@@ -286,12 +362,18 @@ def create_app() -> LifespanMiddleware:
     use_cases = _create_use_cases(repos, services)
     resources = _create_resources(use_cases)
 
-    app = falcon.asgi.App(
+    # kept at hand for /batch, which resolves its sub-requests through the same router
+    router = CompiledRouter()
+    app = App(
+        router=router,
         middleware=[
+            # first in, last out: compresses the body every other middleware has finished with
+            CompressionMiddleware(settings.COMPRESSION_MIN_SIZE, settings.COMPRESSION_LEVEL),
             cors,
             RequestLoggerMiddleware(),
             JWTMiddleware(services["jwt"]),
-        ]
+            ResponseCacheMiddleware({"/products": "product"}),
+        ],
     )
 
     app.req_options.media_handlers.update(extra_handlers)  # pyright:ignore[reportUnknownMemberType]
@@ -302,24 +384,32 @@ def create_app() -> LifespanMiddleware:
 
     # Orders
     app.add_route("/orders", resources["orders_collection"])
+    app.add_route("/orders/export", resources["orders_collection"], suffix="export")
+    app.add_route("/orders/checkout", resources["orders_collection"], suffix="checkout")
     app.add_route("/orders/{order_id:int}", resources["order_detail"])
 
     # Products
     app.add_route("/products", resources["products"], suffix="collection")
+    app.add_route("/products/bulk", resources["products"], suffix="bulk")
     app.add_route("/products/{product_id:int}", resources["products"], suffix="detail")
 
     # Users
     app.add_route("/users", resources["users"], suffix="collection")
     app.add_route("/users/{user_id:int}", resources["users"], suffix="detail")
 
+    # Several of the above in one request
+    app.add_route("/batch", BatchResource(router, app.req_options, app.resp_options))
+
     # Documentation & static
     app.add_route("/apidoc", _SwaggerUIIndex())
     app.add_route("/favicon.ico", _FaviconResource())
 
     # Auxiliary
     app.add_route("/__crash__", CrashResource())
+    app.add_route("/__stats__", _StatsResource())
 
     if not settings.TESTING and STATIC_DIR.is_dir() and (STATIC_DIR / "index.html").is_file():
+        # served with their .br/.gz siblings when `manage.py precompress-static` has written them (image build)
         app.add_static_route("/static", str(STATIC_DIR))
         app.add_static_route("/", str(STATIC_DIR), fallback_filename="index.html")
         app.add_static_route("/static/css", str(BOOTSTRAP_CSS_DIR))
@@ -331,4 +421,4 @@ def create_app() -> LifespanMiddleware:
         app.add_error_handler(exc, generic_error_handler)
 
     # Wrap with lifespan management
-    return LifespanMiddleware(app, init_db, close_db)
+    return LifespanMiddleware(app, init_db, _shutdown)
@@ -1,4 +1,4 @@
-from typing import ClassVar
+from typing import ClassVar, Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -12,5 +12,50 @@ class Settings(BaseSettings):
     ALEMBIC_URI: str
     TESTING: bool = False
 
+    # SQLite connection profile, applied to every new connection. WAL keeps readers from blocking
+    # behind the writer; NORMAL syncs at checkpoints only, which WAL makes safe
+    SQLITE_JOURNAL_MODE: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY", "OFF"] = "WAL"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5_000  # wait for the write lock instead of "database is locked"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # bytes
+    SQLITE_CACHE_SIZE: int = -64_000  # negative = KiB, per connection
+    SQLITE_TEMP_STORE: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+
+    # Connection pool, per process (ignored for in-memory databases, which share one connection)
+    DB_POOL_SIZE: int = 5
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    # Separate read-only pool behind the GET use cases, so long list queries don't hold writer connections
+    DB_READ_POOL_SIZE: int = 10
+    DB_READ_POOL_MAX_OVERFLOW: int = 10
+
+    # Route UnitOfWork transactions through one writer connection, one at a time, in arrival order
+    WRITE_SERIALIZER: bool = False
+    WRITE_QUEUE_MAX_DEPTH: int = 1_000  # waiting writers beyond this get a 503
+
+    # Group commit for POST /orders: concurrent creates share one transaction
+    ORDER_GROUP_COMMIT: bool = False
+    ORDER_GROUP_COMMIT_WINDOW_MS: float = 2.0  # how long the first caller waits for company
+    ORDER_GROUP_COMMIT_MAX_BATCH: int = 64  # flush early once this many are waiting
+
+    # Read-through cache for get()/get_by_*() lookups; a size of 0 disables it
+    ENTITY_CACHE_SIZE: int = 10_000
+    ENTITY_CACHE_TTL: float = 60.0  # seconds
+
+    # Totals reused by list requests that ask for count=estimate
+    COUNT_CACHE_SIZE: int = 1_000
+    COUNT_CACHE_TTL: float = 30.0  # seconds
+
+    # Rendered GET /products pages, dropped whenever a product write commits; a size of 0 disables it
+    RESPONSE_CACHE_SIZE: int = 1_000
+    RESPONSE_CACHE_TTL: float = 60.0  # seconds
+
+    # Response bodies below this many bytes go out uncompressed; level is per coding (gzip 1-9, br 0-11, zstd 1-19)
+    COMPRESSION_MIN_SIZE: int = 1_024
+    COMPRESSION_LEVEL: int = 6
+
+    # Upper bound on items accepted by one POST /products/bulk request
+    BULK_MAX_ITEMS: int = 50_000
+
 
 settings = Settings()  # pyright:ignore[reportCallIssue] # Pydantic loads .env on runtime, so it doesn't matter
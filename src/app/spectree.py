@@ -1,5 +1,20 @@
+from typing import override
+
+from falcon import Response
 from spectree import SecurityScheme, SecuritySchemeData, SpecTree
 from spectree.models import SecureType
+from spectree.plugins.falcon_plugin import FalconAsgiPlugin
+
+
+class _StreamAwarePlugin(FalconAsgiPlugin):
+    """Leaves streamed bodies (NDJSON lists) unvalidated: they are only produced while being sent."""
+
+    @staticmethod
+    @override
+    def _data_set_manually(resp: Response) -> bool:  # pyright:ignore[reportIncompatibleMethodOverride]
+        manual = FalconAsgiPlugin._data_set_manually(resp)  # pyright:ignore[reportPrivateUsage]  # noqa: SLF001
+        return resp.stream is not None or manual
+
 
 scheme_data = SecuritySchemeData.parse_obj({  # pyright:ignore[reportDeprecated]
     "type": SecureType.HTTP.value,
@@ -9,6 +24,7 @@ scheme_data = SecuritySchemeData.parse_obj({  # pyright:ignore[reportDeprecated]
 
 api = SpecTree(
     "falcon-asgi",
+    backend=_StreamAwarePlugin,
     title="E-Commerce API",
     version="1.0.0",
     path="apidoc",  # -> /apidoc/swagger, /apidoc/redoc, /apidoc/scalar
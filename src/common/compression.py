@@ -0,0 +1,106 @@
+"""Content codings for HTTP responses: negotiation, on-the-fly compression and precompressed files.
+
+gzip is always available and ``br`` comes with the ``brotli`` dependency. ``zstd`` needs the standard
+library's ``compression.zstd`` (Python 3.14+); a codec whose module is missing is simply not offered.
+"""
+
+import gzip
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+type Compressor = Callable[[bytes, int], bytes]
+
+# File types worth compressing; images, fonts & archives are already compressed
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+COMPRESSIBLE_SUFFIXES = frozenset({".html", ".js", ".mjs", ".css", ".json", ".map", ".svg", ".txt"})
+
+
+def _gzip(data: bytes, level: int) -> bytes:
+    return gzip.compress(data, compresslevel=min(max(level, 1), 9), mtime=0)
+
+
+# coding -> (compress(data, level), sibling file suffix, strongest level); in server preference order
+CODECS: dict[str, tuple[Compressor, str, int]] = {}
+
+try:
+    from compression import zstd  # pyright:ignore[reportMissingImports]
+
+except ImportError:
+    pass
+
+else:
+    _zstd: Any = zstd
+    CODECS["zstd"] = (lambda data, level: _zstd.compress(data, level=min(max(level, 1), 19)), ".zst", 19)
+
+try:
+    import brotli  # pyright:ignore[reportMissingImports]
+
+except ImportError:
+    pass
+
+else:
+    _brotli: Any = brotli
+    CODECS["br"] = (lambda data, level: _brotli.compress(data, quality=min(max(level, 0), 11)), ".br", 11)
+
+CODECS["gzip"] = (_gzip, ".gz", 9)
+
+
+def negotiate(accept_encoding: str | None, offered: tuple[str, ...] = tuple(CODECS)) -> str | None:
+    """Pick the coding to use for ``Accept-Encoding``: the client's highest q-value, ties going to ``offered`` order."""
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                q = float(value)
+            except ValueError:
+                q = 0.0
+
+        weights[coding.strip().lower()] = q
+
+    ranked = [(weights.get(coding, weights.get("*", 0.0)), -i, coding) for i, coding in enumerate(offered)]
+    q, _, coding = max(ranked, default=(0.0, 0, None))
+    return coding if q > 0 else None
+
+
+def precompress_tree(directory: Path, min_size: int) -> int:
+    """Write a sibling per codec (``app.js.gz`` …) for every compressible file under ``directory``.
+
+    Siblings newer than their source are kept; one that would not be smaller is not written, and an
+    older one is removed. Each sibling is written to a temporary file and renamed into place, so a
+    concurrent run or a server reading it never sees half a file. Returns the number of files written.
+    """
+    written = 0
+    for source in directory.rglob("*"):
+        if source.suffix not in COMPRESSIBLE_SUFFIXES or not source.is_file():
+            continue
+
+        stat = source.stat()
+        if stat.st_size < min_size:
+            continue
+
+        data: bytes | None = None
+        for compress, suffix, strongest in CODECS.values():
+            sibling = source.with_name(source.name + suffix)
+            if sibling.exists() and sibling.stat().st_mtime >= stat.st_mtime:
+                continue
+
+            data = data if data is not None else source.read_bytes()
+            packed = compress(data, strongest)
+            if len(packed) >= len(data):
+                sibling.unlink(missing_ok=True)  # a stale one would otherwise keep being served
+                continue
+
+            partial = sibling.with_name(f".{sibling.name}.{os.getpid()}.tmp")
+            _ = partial.write_bytes(packed)
+            _ = partial.replace(sibling)
+            written += 1
+
+    return written
@@ -0,0 +1,26 @@
+import base64
+from typing import Any
+
+import orjson
+
+
+def encode_cursor(*values: Any) -> str:  # noqa: ANN401
+    """Pack the sort key of the last row on a page into an opaque, URL-safe token."""
+    return base64.urlsafe_b64encode(orjson.dumps(values)).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str) -> list[Any]:
+    """Reverse :func:`encode_cursor`.
+
+    Raises ``ValueError`` for anything that was not produced by it.
+    """
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+
+    except ValueError:  # binascii.Error, JSONDecodeError and non-ASCII input all land here
+        raise ValueError("Invalid cursor") from None  # noqa: EM101, TRY003
+
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")  # noqa: EM101, TRY003, TRY004
+
+    return values  # pyright:ignore[reportUnknownVariableType]
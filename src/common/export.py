@@ -0,0 +1,70 @@
+"""Incremental NDJSON / CSV encoders for streamed dataclass batches.
+
+Each batch becomes one chunk of bytes, so the caller's memory stays bounded by the batch size.
+Fields declared with ``metadata={"export": False}`` are left out of both formats.
+"""
+
+import csv
+import dataclasses
+import io
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Sequence
+from datetime import datetime
+from typing import Any, Literal
+
+import orjson
+
+type ExportFormat = Literal["ndjson", "csv"]
+type Encoder = Callable[[AsyncIterable[Sequence[Any]]], AsyncIterator[bytes]]
+
+
+def _exported(item: Any) -> tuple[str, ...]:  # noqa: ANN401
+    return tuple(f.name for f in dataclasses.fields(item) if f.metadata.get("export", True))
+
+
+async def ndjson_chunks(batches: AsyncIterable[Sequence[Any]]) -> AsyncIterator[bytes]:
+    """One JSON document per line; orjson serializes the field values, datetimes included, natively."""
+    fields: tuple[str, ...] | None = None
+
+    async for batch in batches:
+        if not batch:
+            continue
+
+        if fields is None:
+            fields = _exported(batch[0])
+
+        yield b"".join(
+            orjson.dumps({name: getattr(item, name) for name in fields}, option=orjson.OPT_APPEND_NEWLINE)
+            for item in batch
+        )
+
+
+def _csv_value(value: Any) -> Any:  # noqa: ANN401
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def csv_chunks(batches: AsyncIterable[Sequence[Any]]) -> AsyncIterator[bytes]:
+    """A header row taken from the exported dataclass fields, then one row per item."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    fields: tuple[str, ...] | None = None
+
+    async for batch in batches:
+        if not batch:
+            continue
+
+        if fields is None:
+            fields = _exported(batch[0])
+            writer.writerow(fields)
+
+        writer.writerows([_csv_value(getattr(item, name)) for name in fields] for item in batch)
+        yield buf.getvalue().encode()
+
+        _ = buf.seek(0)
+        _ = buf.truncate()
+
+
+# format -> (content type, file extension, encoder)
+EXPORT_FORMATS: dict[ExportFormat, tuple[str, str, Encoder]] = {
+    "ndjson": ("application/x-ndjson", "ndjson", ndjson_chunks),
+    "csv": ("text/csv; charset=utf-8", "csv", csv_chunks),
+}
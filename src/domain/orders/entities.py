@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
 
@@ -8,3 +8,11 @@ class Order:
     user_id: int
     total_price: float
     created_at: datetime | None = None
+    version: int = field(default=1, metadata={"export": False})  # bumped on every update; not exported
+
+
+@dataclass
+class OrderItem:
+    product_id: int
+    quantity: int
+    unit_price: float
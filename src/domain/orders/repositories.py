@@ -1,7 +1,9 @@
 import abc
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Collection, Sequence
 
-from .entities import Order
+from domain.pagination import CountMode
+
+from .entities import Order, OrderItem
 
 
 class AbstractOrderRepository(abc.ABC):
@@ -10,21 +12,47 @@ class AbstractOrderRepository(abc.ABC):
     async def add(self, order: Order) -> Order | None:
         pass
 
+    @abc.abstractmethod
+    async def add_many(self, orders: Sequence[Order]) -> list[Order]:
+        """Insert all orders in the current transaction; the result is aligned with the input."""
+
+    @abc.abstractmethod
+    async def add_items(self, order_id: int, items: Sequence[OrderItem]) -> None:
+        pass
+
     @abc.abstractmethod
     async def delete(self, order_id: int) -> None:
         pass
 
+    @abc.abstractmethod
+    async def update_fields(self, order_id: int, *, total_price: float | None = None) -> Order | None:
+        """Apply the given fields in one statement; return the updated order, or ``None`` if it doesn't exist."""
+
     @abc.abstractmethod
     async def update_total(self, order_id: int, new_total: float) -> None:
         pass
 
     # Read ops
     @abc.abstractmethod
-    async def get(self, order_id: int) -> Order | None:
-        pass
+    async def get(self, order_id: int, *, fields: Collection[str] | None = None) -> Order | None:
+        """``fields`` reads only those attributes (``id`` and ``version`` always come along); the rest are ``None``."""
+
+    @abc.abstractmethod
+    async def get_many(self, order_ids: Collection[int], *, fields: Collection[str] | None = None) -> dict[int, Order]:
+        """The ones of ``order_ids`` that exist, by id, in one query for those not cached; ``fields`` as for ``get``."""
+
+    @abc.abstractmethod
+    async def get_version(self, order_id: int) -> int | None:
+        """The order's current ``version``, without loading the rest of it; ``None`` if it doesn't exist."""
 
     @abc.abstractmethod
-    async def list_for_user(self, user_id: int, *, offset: int = 0, limit: int | None = None) -> Sequence[Order]:
+    async def references_product(self, product_id: int) -> bool:
+        """Whether any order line still points at ``product_id``."""
+
+    @abc.abstractmethod
+    async def list_for_user(
+        self, user_id: int, *, offset: int = 0, limit: int | None = None, after_id: int | None = None
+    ) -> Sequence[Order]:
         pass
 
     @abc.abstractmethod
@@ -33,9 +61,35 @@ class AbstractOrderRepository(abc.ABC):
         *,
         offset: int = 0,
         limit: int | None = None,
+        after_id: int | None = None,
     ) -> Sequence[Order]:
         pass
 
+    @abc.abstractmethod
+    async def list_page(
+        self,
+        *,
+        user_id: int | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+        after_id: int | None = None,
+        count: CountMode = "exact",
+        fields: Collection[str] | None = None,
+    ) -> tuple[list[Order], int | None, CountMode]:
+        """Return one page, its total as ``count`` asks (``None`` for ``none``) and the mode actually used.
+
+        ``fields`` narrows the rows as it does for ``get``.
+        """
+
+    @abc.abstractmethod
+    def stream_all(
+        self, *, user_id: int | None = None, fields: Collection[str] | None = None
+    ) -> AsyncIterator[list[Order]]:
+        """Yield every matching order in id order, one batch at a time, without loading the whole result.
+
+        ``fields`` narrows the rows as it does for ``get``.
+        """
+
     @abc.abstractmethod
     async def count_all(self) -> int:
         pass
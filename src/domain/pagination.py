@@ -0,0 +1,4 @@
+from typing import Literal
+
+# How a list request's total is produced: counted, approximated from a recent count, or skipped
+type CountMode = Literal["exact", "estimate", "none"]
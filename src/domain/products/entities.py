@@ -9,3 +9,4 @@ class Product:
     price: float
     stock: int
     owner_id: int | None = None
+    version: int = 1
@@ -1,5 +1,7 @@
 import abc
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Collection, Mapping, Sequence
+
+from domain.pagination import CountMode
 
 from .entities import Product
 
@@ -10,10 +12,27 @@ class AbstractProductRepository(abc.ABC):
     async def add(self, product: Product) -> Product:
         pass
 
+    @abc.abstractmethod
+    async def add_many(self, products: Sequence[Product]) -> list[Product | None]:
+        """Insert in bulk; ``None`` marks an item whose name is already taken, in the catalog or earlier in the batch."""
+
+    @abc.abstractmethod
+    async def reserve_stock(self, quantities: Mapping[int, int]) -> bool:
+        """Take ``quantities`` (product id -> units) off stock in one batch; ``False`` if any product falls short.
+
+        A partial reservation is left to the caller's transaction to roll back.
+        """
+
     @abc.abstractmethod
     async def delete(self, product_id: int) -> None:
         pass
 
+    @abc.abstractmethod
+    async def update_fields(
+        self, product_id: int, *, price: float | None = None, stock: int | None = None
+    ) -> Product | None:
+        """Apply the given fields in one statement; return the updated product, or ``None`` if it doesn't exist."""
+
     @abc.abstractmethod
     async def update_stock(self, product_id: int, new_stock: int) -> None:
         pass
@@ -24,8 +43,24 @@ class AbstractProductRepository(abc.ABC):
 
     # Read ops
     @abc.abstractmethod
-    async def get(self, product_id: int) -> Product | None:
-        pass
+    async def get_prices(self, product_ids: Collection[int]) -> dict[int, float]:
+        """Current price per product id; ids that don't exist are left out."""
+
+    @abc.abstractmethod
+    async def get(self, product_id: int, *, fields: Collection[str] | None = None) -> Product | None:
+        """``fields`` reads only those attributes (``id``, ``name`` and ``version`` always come along); the rest are
+        ``None``.
+        """
+
+    @abc.abstractmethod
+    async def get_many(
+        self, product_ids: Collection[int], *, fields: Collection[str] | None = None
+    ) -> dict[int, Product]:
+        """The ones of ``product_ids`` that exist, by id, in one query for those not cached; ``fields`` as for ``get``."""
+
+    @abc.abstractmethod
+    async def get_version(self, product_id: int) -> int | None:
+        """The product's current ``version``, without loading the rest of it; ``None`` if it doesn't exist."""
 
     @abc.abstractmethod
     async def get_by_name(self, name: str) -> Product | None:
@@ -40,11 +75,49 @@ class AbstractProductRepository(abc.ABC):
         name_contains: str | None = None,
         min_price: float | None = None,
         max_price: float | None = None,
+        after: tuple[str, int] | None = None,
+        q: str | None = None,
     ) -> Sequence[Product]:
         pass
 
+    @abc.abstractmethod
+    async def list_page(
+        self,
+        *,
+        offset: int = 0,
+        limit: int | None = None,
+        name_contains: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        after: tuple[str, int] | None = None,
+        q: str | None = None,
+        count: CountMode = "exact",
+        fields: Collection[str] | None = None,
+    ) -> tuple[list[Product], int | None, CountMode]:
+        """Return one page, its total as ``count`` asks (``None`` for ``none``) and the mode actually used.
+
+        ``fields`` narrows the rows as it does for ``get``.
+        """
+
+    @abc.abstractmethod
+    def stream_all(  # noqa: PLR0913
+        self,
+        *,
+        name_contains: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        q: str | None = None,
+        fields: Collection[str] | None = None,
+    ) -> AsyncIterator[list[Product]]:
+        """Yield every matching product in ``list_page`` order, one batch at a time, without loading them all."""
+
     @abc.abstractmethod
     async def count_all(
-        self, *, name_contains: str | None = None, min_price: float | None = None, max_price: float | None = None
+        self,
+        *,
+        name_contains: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        q: str | None = None,
     ) -> int:
         pass
@@ -1,4 +1,7 @@
 import abc
+from collections.abc import AsyncIterator, Collection
+
+from domain.pagination import CountMode
 
 from .entities import User
 
@@ -13,6 +16,12 @@ class AbstractUserRepository(abc.ABC):
     async def delete(self, user_id: int) -> None:
         pass
 
+    @abc.abstractmethod
+    async def update_fields(
+        self, user_id: int, *, username: str | None = None, email: str | None = None
+    ) -> User | None:
+        """Apply the given fields in one statement; return the updated user, or ``None`` if it doesn't exist."""
+
     @abc.abstractmethod
     async def update_email(self, user_id: int, new_email: str) -> None:
         pass
@@ -23,8 +32,12 @@ class AbstractUserRepository(abc.ABC):
 
     # Read ops
     @abc.abstractmethod
-    async def get(self, user_id: int) -> User | None:
-        pass
+    async def get(self, user_id: int, *, fields: Collection[str] | None = None) -> User | None:
+        """``fields`` reads only those attributes (``id`` always comes along); the rest are ``None``."""
+
+    @abc.abstractmethod
+    async def get_many(self, user_ids: Collection[int], *, fields: Collection[str] | None = None) -> dict[int, User]:
+        """The ones of ``user_ids`` that exist, by id, in one query for those not cached; ``fields`` as for ``get``."""
 
     @abc.abstractmethod
     async def get_by_username(self, username: str) -> User | None:
@@ -38,9 +51,37 @@ class AbstractUserRepository(abc.ABC):
         limit: int | None = None,
         username_contains: str | None = None,
         email_contains: str | None = None,
+        after_id: int | None = None,
     ) -> list[User]:
         pass
 
+    @abc.abstractmethod
+    async def list_page(
+        self,
+        *,
+        offset: int = 0,
+        limit: int | None = None,
+        username_contains: str | None = None,
+        email_contains: str | None = None,
+        after_id: int | None = None,
+        count: CountMode = "exact",
+        fields: Collection[str] | None = None,
+    ) -> tuple[list[User], int | None, CountMode]:
+        """Return one page, its total as ``count`` asks (``None`` for ``none``) and the mode actually used.
+
+        ``fields`` narrows the rows as it does for ``get``.
+        """
+
+    @abc.abstractmethod
+    def stream_all(
+        self,
+        *,
+        username_contains: str | None = None,
+        email_contains: str | None = None,
+        fields: Collection[str] | None = None,
+    ) -> AsyncIterator[list[User]]:
+        """Yield every matching user in ``list_page`` order, one batch at a time, without loading them all."""
+
     @abc.abstractmethod
     async def count_all(self, *, username_contains: str | None = None, email_contains: str | None = None) -> int:
         pass
@@ -0,0 +1,14 @@
+"""Recent list totals, served for ``count=estimate`` until they expire.
+
+Keys are ``(kind, filters)``; nothing invalidates them, so an estimate may lag writes by up to the TTL.
+``selectivity_cache`` keeps, per ``(column, needle)``, whether a substring filter is too common for its
+trigram index; a stale answer only picks the slower plan, never different rows.
+"""
+
+from collections.abc import Hashable
+
+from app.settings import settings
+from infrastructure.cache.ttl_cache import TTLCache
+
+count_cache: TTLCache[tuple[str, Hashable], int] = TTLCache(settings.COUNT_CACHE_SIZE, settings.COUNT_CACHE_TTL)
+selectivity_cache: TTLCache[tuple[str, str], bool] = TTLCache(settings.COUNT_CACHE_SIZE, settings.COUNT_CACHE_TTL)
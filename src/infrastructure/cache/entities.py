@@ -0,0 +1,76 @@
+"""Process-wide read-through cache for single-entity lookups.
+
+Keys are ``(kind, id)`` for entities and ``(alias, value)`` -> id for secondary lookups such as
+usernames. Writes inside a :class:`~infrastructure.databases.unit_of_work.UnitOfWork` only queue
+their keys on the session; the UoW drops them once its transaction has committed.
+
+A read-through fill takes its kind's generation before the SELECT and hands it back to ``set``: if an
+entity of that kind was invalidated in between, the row just read may predate the write and is not stored.
+"""
+
+from collections.abc import Hashable, Iterable
+from typing import final
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.settings import settings
+from infrastructure.cache.ttl_cache import CacheStats, TTLCache
+
+type CacheKey = tuple[str, Hashable]
+
+PENDING_INVALIDATIONS = "entity_cache.pending"
+
+
+@final
+class EntityCache:
+    """:class:`TTLCache` of entities that refuses fills racing an invalidation of the same kind."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._cache: TTLCache[CacheKey, object] = TTLCache(maxsize, ttl)
+        self._generations: dict[str, int] = {}
+        self._stale_writes = 0
+
+    def generation(self, kind: str) -> int:
+        """Capture this before reading the row, then hand it back to :meth:`set`."""
+        return self._generations.get(kind, 0)
+
+    def get(self, key: CacheKey) -> object | None:
+        return self._cache.get(key)
+
+    def set(self, kind: str, generation: int, key: CacheKey, value: object) -> None:
+        """Store ``value`` unless an entity of ``kind`` was invalidated since ``generation``."""
+        if generation != self.generation(kind):
+            self._stale_writes += 1
+            return
+
+        self._cache.set(key, value)
+
+    def invalidate(self, *keys: CacheKey) -> None:
+        for kind in {key[0] for key in keys}:
+            self._generations[kind] = self.generation(kind) + 1
+
+        self._cache.invalidate(*keys)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    @property
+    def stale_writes(self) -> int:
+        return self._stale_writes
+
+
+entity_cache = EntityCache(settings.ENTITY_CACHE_SIZE, settings.ENTITY_CACHE_TTL)
+
+
+def defer_invalidation(session: AsyncSession, keys: Iterable[CacheKey]) -> None:
+    """Remember ``keys`` until the transaction owning ``session`` commits."""
+    pending: set[CacheKey] = session.info.setdefault(PENDING_INVALIDATIONS, set())
+    pending.update(keys)
+
+
+def flush_invalidations(session: AsyncSession, *, committed: bool) -> None:
+    """Apply (after a commit) or forget (after a rollback) the keys queued on ``session``."""
+    pending: set[CacheKey] = session.info.pop(PENDING_INVALIDATIONS, set())
+    if committed:
+        entity_cache.invalidate(*pending)
@@ -0,0 +1,77 @@
+"""Process-wide cache of rendered GET responses, invalidated by tag.
+
+Every entry is filed under a tag (an entity kind such as ``product``) and that tag's current
+generation. Invalidating a tag bumps its generation, so all its entries become unreachable at once
+and age out of the LRU. Writers queue their tags on the session like entity keys, and the
+:class:`~infrastructure.databases.unit_of_work.UnitOfWork` applies them once it has committed.
+"""
+
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
+from typing import final
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.settings import settings
+from infrastructure.cache.ttl_cache import CacheStats, TTLCache
+
+PENDING_TAGS = "response_cache.pending"
+
+
+@final
+@dataclass(frozen=True, slots=True)
+class TaggedCacheStats:
+    cache: CacheStats
+    invalidations: int
+    stale_writes: int
+
+
+@final
+class TaggedCache[V]:
+    """:class:`TTLCache` whose entries can be dropped a whole tag at a time."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._cache: TTLCache[tuple[str, int, Hashable], V] = TTLCache(maxsize, ttl)
+        self._generations: dict[str, int] = {}
+        self._invalidations = 0
+        self._stale_writes = 0
+
+    def generation(self, tag: str) -> int:
+        """Capture this before computing a value, then hand it back to :meth:`set`."""
+        return self._generations.get(tag, 0)
+
+    def get(self, tag: str, key: Hashable) -> V | None:
+        return self._cache.get((tag, self.generation(tag), key))
+
+    def set(self, tag: str, generation: int, key: Hashable, value: V) -> None:
+        """Store ``value`` unless ``tag`` was invalidated since ``generation``: it may predate that write."""
+        if generation != self.generation(tag):
+            self._stale_writes += 1
+            return
+
+        self._cache.set((tag, generation, key), value)
+
+    def invalidate(self, *tags: str) -> None:
+        for tag in tags:
+            self._generations[tag] = self.generation(tag) + 1
+            self._invalidations += 1
+
+    @property
+    def stats(self) -> TaggedCacheStats:
+        return TaggedCacheStats(self._cache.stats, self._invalidations, self._stale_writes)
+
+
+response_cache: TaggedCache[object] = TaggedCache(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL)
+
+
+def defer_tag_invalidation(session: AsyncSession, tags: Iterable[str]) -> None:
+    """Remember ``tags`` until the transaction owning ``session`` commits."""
+    pending: set[str] = session.info.setdefault(PENDING_TAGS, set())
+    pending.update(tags)
+
+
+def flush_tag_invalidations(session: AsyncSession, *, committed: bool) -> None:
+    """Apply (after a commit) or forget (after a rollback) the tags queued on ``session``."""
+    pending: set[str] = session.info.pop(PENDING_TAGS, set())
+    if committed:
+        response_cache.invalidate(*pending)
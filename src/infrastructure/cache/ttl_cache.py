@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import final
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    maxsize: int
+
+
+@final
+class TTLCache[K: Hashable, V]:
+    """Bounded LRU map whose entries also expire ``ttl`` seconds after they were stored.
+
+    Not thread-safe: meant to be shared by coroutines on a single event loop.
+    A ``maxsize`` of 0 turns the cache into a no-op.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self._expirations += 1
+            self._misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        if self._maxsize <= 0:
+            return
+
+        self._data[key] = (self._clock() + self._ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self._maxsize:
+            _ = self._data.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, *keys: K) -> None:
+        for key in keys:
+            _ = self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            expirations=self._expirations,
+            size=len(self._data),
+            maxsize=self._maxsize,
+        )
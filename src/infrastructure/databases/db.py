@@ -3,14 +3,14 @@ from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from sqlalchemy import StaticPool, inspect, select
+from sqlalchemy import StaticPool, inspect, select, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from alembic import command
-from alembic.config import Config
+from alembic import command, config
 from app.settings import settings
 from common.utils import hash_password
 from infrastructure.sqlalchemy import events as sa_events
+from infrastructure.sqlalchemy.models import COUNTER_REBUILD_SQL, Counter
 from infrastructure.sqlalchemy.models import User as UserORM
 
 DEBUG = settings.DEBUG
@@ -23,17 +23,37 @@ if SQLITE_URI.startswith("sqlite+aiosqlite") and ":memory:" in SQLITE_URI:
     engine_args["poolclass"] = StaticPool
     engine_args["connect_args"] = {"check_same_thread": False, "uri": True}
     engine_args["pool_reset_on_return"] = "none"
+else:
+    engine_args["pool_size"] = settings.DB_POOL_SIZE
+    engine_args["max_overflow"] = settings.DB_POOL_MAX_OVERFLOW
+    engine_args["pool_timeout"] = settings.DB_POOL_TIMEOUT
 
 engine = create_async_engine(SQLITE_URI, **engine_args)
 AsyncSessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
 sa_events.register_engine_events(engine)
 
+# Read-only engine for the GET paths. An in-memory database exists only on its one shared connection,
+# so there the readers simply reuse `engine`
+if engine_args.get("poolclass") is not None:
+    read_engine = engine
+else:
+    read_engine = create_async_engine(
+        SQLITE_URI,
+        **{
+            **engine_args,
+            "pool_size": settings.DB_READ_POOL_SIZE,
+            "max_overflow": settings.DB_READ_POOL_MAX_OVERFLOW,
+        },
+    )
+    sa_events.register_engine_events(read_engine, name="readonly", query_only=True)
+ReadSessionLocal = async_sessionmaker(bind=read_engine, expire_on_commit=False)
+
 BASE_DIR = Path(__file__).resolve().parents[3]
 _ALEMBIC_INI = BASE_DIR / "alembic.ini"
 
 
 async def _apply_migrations() -> None:
-    cfg = Config(str(_ALEMBIC_INI))
+    cfg = config.Config(str(_ALEMBIC_INI))
 
     await asyncio.to_thread(command.upgrade, cfg, "head")
 
@@ -83,6 +103,18 @@ async def init_db(seed: bool = False):  # noqa: FBT001, FBT002  # Why not?
     print("[init_db] Relying on Alembic migrations to create/update tables.")
 
 
+async def rebuild_counters() -> dict[str, int]:
+    """Recount the ``counters`` table from the data in one transaction; returns the global totals."""
+    async with engine.begin() as conn:
+        for sql in COUNTER_REBUILD_SQL:
+            _ = await conn.execute(text(sql))
+
+        rows = await conn.execute(select(Counter.scope, Counter.value).where(Counter.scope != "user_orders"))
+        return {scope: value for scope, value in rows}
+
+
 async def close_db():
+    if read_engine is not engine:
+        await read_engine.dispose()
     await engine.dispose()
     print("[close_db] Database engine disposed.")
@@ -1,33 +1,83 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from types import TracebackType
-from typing import final
+from typing import Any, final
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from infrastructure.cache.entities import flush_invalidations
+from infrastructure.cache.responses import flush_tag_invalidations
 from infrastructure.databases.db import AsyncSessionLocal
+from infrastructure.databases.write_serializer import WriteSerializer, write_serializer
 from infrastructure.sqlalchemy.repositories import (
     SQLAlchemyOrderRepository,
     SQLAlchemyProductRepository,
     SQLAlchemyUserRepository,
 )
 
+# (owning task, shared UnitOfWork) while a UnitOfWork.shared() block runs
+_shared: ContextVar[tuple[asyncio.Task[Any] | None, "UnitOfWork"] | None] = ContextVar(
+    "shared_unit_of_work", default=None
+)
+
 
 @final
 class UnitOfWork:
-    """Holds one session and all repos; commits or rolls back as a unit."""
+    """Holds one session and all repos; commits or rolls back as a unit.
 
+    Inside :meth:`shared`, every ``UnitOfWork`` entered by the same task joins the shared one instead:
+    it reuses that session and leaves the commit (or rollback) to it.
+    """
+
+    _writer: WriteSerializer | None
     _session: AsyncSession | None
+    _joined: bool
     users: SQLAlchemyUserRepository | None
     orders: SQLAlchemyOrderRepository | None
     products: SQLAlchemyProductRepository | None
 
-    def __init__(self) -> None:
+    def __init__(self, writer: WriteSerializer | None = write_serializer) -> None:
+        self._writer = writer
         self._session = None
+        self._joined = False
         self.users = None
         self.orders = None
         self.products = None
 
+    @classmethod
+    @asynccontextmanager
+    async def shared(cls, writer: WriteSerializer | None = write_serializer) -> AsyncIterator["UnitOfWork"]:
+        """One transaction for every ``UnitOfWork`` the current task enters until the block ends."""
+        async with cls(writer) as uow:
+            token = _shared.set((asyncio.current_task(), uow))
+            try:
+                yield uow
+            finally:
+                _shared.reset(token)
+
+    @staticmethod
+    def in_shared() -> bool:
+        """Whether a ``UnitOfWork`` entered now would join a :meth:`shared` one."""
+        shared = _shared.get()
+        return shared is not None and shared[0] is asyncio.current_task()
+
     async def __aenter__(self) -> "UnitOfWork":
-        self._session = AsyncSessionLocal()
+        shared = _shared.get()
+        # tasks spawned from the block inherit the variable, but only the owning task's work belongs to it
+        if shared is not None and shared[0] is asyncio.current_task():
+            outer = shared[1]
+            self._joined = True
+            self._session = outer._session  # noqa: SLF001
+            self.users, self.orders, self.products = outer.users, outer.orders, outer.products
+            return self
+
+        if self._writer is not None:
+            await self._writer.acquire()
+            self._session = self._writer.session_factory()
+        else:
+            self._session = AsyncSessionLocal()
 
         # inject the same session into each repo
         self.users = SQLAlchemyUserRepository(session=self._session)
@@ -41,16 +91,28 @@ class UnitOfWork:
         _ = tb
 
         assert self._session is not None
+        if self._joined:
+            return  # an exception still reaches the shared block, which rolls everything back
 
+        committed = False
         try:
             if exc_type:
                 await self._session.rollback()
             else:
                 try:
                     await self._session.commit()
+                    committed = True
 
                 except Exception:
                     await self._session.rollback()
                     raise
         finally:
-            await self._session.close()
+            # cached copies of rows written here go stale only once the commit is visible
+            flush_invalidations(self._session, committed=committed)
+            flush_tag_invalidations(self._session, committed=committed)
+            try:
+                await self._session.close()
+
+            finally:
+                if self._writer is not None:
+                    self._writer.release()
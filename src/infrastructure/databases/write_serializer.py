@@ -0,0 +1,120 @@
+"""Optional single-writer queue for :class:`~infrastructure.databases.unit_of_work.UnitOfWork` transactions.
+
+SQLite admits one writer at a time; letting every UoW race for that lock turns bursts into
+``busy_timeout`` waits and ``database is locked`` errors. With ``WRITE_SERIALIZER`` enabled, each UoW
+takes a turn from a FIFO queue instead and runs its transaction on one dedicated writer connection.
+Plain reads never enter the queue and keep using the pool.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import final
+
+import falcon
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.settings import settings
+from infrastructure.databases.db import SQLITE_URI, engine, engine_args
+from infrastructure.sqlalchemy import events as sa_events
+
+
+@final
+@dataclass
+class WriteQueueStats:
+    max_depth: int
+    enqueued: int = 0
+    granted: int = 0
+    rejected: int = 0
+    depth: int = 0
+    peak_depth: int = 0
+    wait_ms_total: float = 0.0
+    wait_ms_max: float = 0.0
+
+
+@final
+class WriteSerializer:
+    """Grants write turns one at a time, in arrival order, through a bounded ``asyncio.Queue``."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], max_depth: int) -> None:
+        self.session_factory = session_factory
+        self.stats = WriteQueueStats(max_depth=max_depth)
+        self._queue: asyncio.Queue[asyncio.Future[None]] = asyncio.Queue(max_depth)
+        self._released = asyncio.Event()
+        self._worker: asyncio.Task[None] | None = None
+
+    async def acquire(self) -> None:
+        """Wait for the writer connection; answers 503 when ``max_depth`` callers are already waiting."""  # noqa: DOC501
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run(), name="write-serializer")
+
+        turn: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait(turn)
+
+        except asyncio.QueueFull:
+            self.stats.rejected += 1
+            raise falcon.HTTPServiceUnavailable(description="Too many pending writes", retry_after=1) from None
+
+        self.stats.enqueued += 1
+        self.stats.depth += 1
+        self.stats.peak_depth = max(self.stats.peak_depth, self.stats.depth)
+        queued_at = time.perf_counter()
+
+        try:
+            await turn
+
+        except asyncio.CancelledError:
+            if turn.done() and not turn.cancelled():  # granted just as we were cancelled: pass it on
+                self.release()
+            raise
+
+        finally:
+            self.stats.depth -= 1
+
+        waited_ms = (time.perf_counter() - queued_at) * 1000
+        self.stats.granted += 1
+        self.stats.wait_ms_total += waited_ms
+        self.stats.wait_ms_max = max(self.stats.wait_ms_max, waited_ms)
+
+    def release(self) -> None:
+        self._released.set()
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            _ = self._worker.cancel()
+            self._worker = None
+
+    async def _run(self) -> None:
+        while True:
+            turn = await self._queue.get()
+            if turn.cancelled():  # the caller gave up while waiting
+                continue
+
+            self._released.clear()
+            turn.set_result(None)
+            await self._released.wait()
+
+
+def _writer_engine() -> AsyncEngine:
+    if engine_args.get("poolclass") is not None:  # in-memory: there is only the one shared connection
+        return engine
+
+    writer = create_async_engine(SQLITE_URI, **{**engine_args, "pool_size": 1, "max_overflow": 0})
+    _ = sa_events.register_engine_events(writer, name="writer")
+    return writer
+
+
+write_serializer: WriteSerializer | None = None
+if settings.WRITE_SERIALIZER:
+    write_serializer = WriteSerializer(
+        async_sessionmaker(bind=_writer_engine(), expire_on_commit=False), settings.WRITE_QUEUE_MAX_DEPTH
+    )
+
+
+async def close_write_serializer() -> None:
+    if write_serializer is not None:
+        await write_serializer.close()
+        writer = write_serializer.session_factory.kw["bind"]
+        if writer is not engine:
+            await writer.dispose()
@@ -1,10 +1,14 @@
-from typing import Any
+import time
+from dataclasses import dataclass, field
+from typing import Any, final
 
 from loguru import logger
-from sqlalchemy import event
+from sqlalchemy import QueuePool, event
 from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.orm import Session
 
+from app.settings import settings
+
 
 def _warn_unexpected_rollback(session: Session) -> None:
     logger.warning("Session {} issued an unexpected ROLLBACK", id(session))
@@ -17,17 +21,102 @@ def register_session_events() -> None:
     event.listen(Session, "after_rollback", _warn_unexpected_rollback, propagate=True)
 
 
-def register_engine_events(engine: AsyncEngine) -> None:
+def sqlite_pragmas() -> dict[str, str | int]:
+    """The connection profile from settings, in the order it is applied."""
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+        # off by default in SQLite; without it the ondelete rules on order_items are never applied
+        "foreign_keys": 1,
+    }
+
+
+@final
+@dataclass
+class PoolStats:
+    """Counters fed by pool events; ``pragmas`` holds the values SQLite reported back, not the requested ones."""
+
+    pool_size: int | None
+    max_overflow: int | None
+    pragmas: dict[str, Any] = field(default_factory=dict)
+    connects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    in_use: int = 0
+    peak_in_use: int = 0
+    hold_ms_total: float = 0.0
+    hold_ms_max: float = 0.0
+
+
+# engine name -> stats, for /__stats__
+pool_stats: dict[str, PoolStats] = {}
+
+
+def _apply_pragmas(dbapi_conn: Any, stats: PoolStats, pragmas: dict[str, str | int]) -> None:  # noqa: ANN401
+    cursor = dbapi_conn.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+        # read back: an in-memory database stays in journal_mode=memory and has no mmap_size at all
+        for name in pragmas:
+            cursor.execute(f"PRAGMA {name}")
+            row = cursor.fetchone()
+            stats.pragmas[name] = row[0] if row else None
+    finally:
+        cursor.close()
+
+
+def register_engine_events(engine: AsyncEngine, name: str = "primary", *, query_only: bool = False) -> PoolStats:
+    """Apply the connection profile to ``engine`` and count its pool traffic under ``pool_stats[name]``.
+
+    ``query_only`` makes every connection refuse writes, for engines that only serve reads.
+    """
+    # query_only goes last: setting journal_mode may itself need to write
+    pragmas = sqlite_pragmas() | ({"query_only": 1} if query_only else {})
+
+    pool = engine.sync_engine.pool
+    if isinstance(pool, QueuePool):
+        stats = PoolStats(pool_size=pool.size(), max_overflow=pool._max_overflow)  # pyright:ignore[reportPrivateUsage]
+    else:  # StaticPool & co. hand out one shared connection
+        stats = PoolStats(pool_size=None, max_overflow=None)
+    pool_stats[name] = stats
+
+    def _on_connect(dbapi_conn: Any, conn_record: Any) -> None:  # noqa: ANN401
+        _ = conn_record
+
+        stats.connects += 1
+        if engine.dialect.name == "sqlite":
+            _apply_pragmas(dbapi_conn, stats, pragmas)
+
     def _on_checkout(dbapi_conn: Any, conn_record: Any, conn_proxy: Any):  # noqa: ANN401
         _ = dbapi_conn, conn_proxy
 
-        conn_record.info["checked_out"] = "True"
+        conn_record.info["checked_out"] = time.perf_counter()
+        stats.checkouts += 1
+        stats.in_use += 1
+        stats.peak_in_use = max(stats.peak_in_use, stats.in_use)
 
     def _on_checkin(dbapi_conn: Any, conn_record: Any) -> None:  # noqa: ANN401
         _ = dbapi_conn
 
-        conn_record.info.pop("checked_out", None)
+        since: float | None = conn_record.info.pop("checked_out", None)
+        if since is None:  # invalidated before it was ever handed out
+            return
+
+        held_ms = (time.perf_counter() - since) * 1000
+        stats.checkins += 1
+        stats.in_use -= 1
+        stats.hold_ms_total += held_ms
+        stats.hold_ms_max = max(stats.hold_ms_max, held_ms)
 
     sync_engine = engine.sync_engine
+    event.listen(sync_engine, "connect", _on_connect)
     event.listen(sync_engine, "checkout", _on_checkout)
     event.listen(sync_engine, "checkin", _on_checkin)
+
+    return stats
@@ -1,7 +1,20 @@
 import datetime
 from typing import Any, final, override
 
-from sqlalchemy import CheckConstraint, DateTime, Float, ForeignKey, Index, Integer, String, func
+from sqlalchemy import (
+    DDL,
+    CheckConstraint,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    column,
+    event,
+    func,
+    table,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -17,11 +30,15 @@ class Order(Base):
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
     total_price: Mapped[float] = mapped_column(Float, nullable=False)
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # bumped by every repository UPDATE; the ETag of the order's representation
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
 
     user: Mapped["User"] = relationship("User", back_populates="orders")
 
     __table_args__: tuple[Any, ...] | dict[str, Any] = (
         CheckConstraint("total_price >= 0", name="check_total_price_non_negative"),
+        # ids are never handed out again, so "order-<id>-v<version>" can't name a later order
+        {"sqlite_autoincrement": True},
     )
 
     @override
@@ -34,6 +51,50 @@ class Order(Base):
         )
 
 
+@final
+class OrderItem(Base):
+    """One product line of an order; ``unit_price`` is the catalog price when the order was placed."""
+
+    __tablename__: str = "order_items"
+
+    order_id: Mapped[int] = mapped_column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), primary_key=True)
+    product_id: Mapped[int] = mapped_column(Integer, ForeignKey("products.id", ondelete="RESTRICT"), primary_key=True)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    unit_price: Mapped[float] = mapped_column(Float, nullable=False)
+
+    __table_args__: tuple[Any, ...] | dict[str, Any] = (
+        CheckConstraint("quantity > 0", name="check_quantity_positive"),
+        Index("ix_order_items_product_id", "product_id"),
+    )
+
+    @override
+    def __repr__(self) -> str:
+        return (
+            f"<OrderItem(order id={self.order_id}, "
+            f"product id={self.product_id}, "
+            f"quantity={self.quantity}, "
+            f"unit price='{self.unit_price}')>"
+        )
+
+
+@final
+class Counter(Base):
+    """Row counts kept current by triggers, so unfiltered totals are a primary-key lookup instead of COUNT(*).
+
+    ``scope`` is ``orders``/``users``/``products`` with ``key`` 0, or ``user_orders`` keyed by user id.
+    """
+
+    __tablename__: str = "counters"
+
+    scope: Mapped[str] = mapped_column(String(20), primary_key=True)
+    key: Mapped[int] = mapped_column(Integer, primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    @override
+    def __repr__(self) -> str:
+        return f"<Counter(scope='{self.scope}', key={self.key}, value={self.value})>"
+
+
 @final
 class User(Base):
     __tablename__ = "users"
@@ -65,6 +126,8 @@ class Product(Base):
     description: Mapped[str] = mapped_column(String(length=255), nullable=True)
     price: Mapped[float] = mapped_column(Float, nullable=False)
     stock: Mapped[int] = mapped_column(Integer, nullable=False)
+    # bumped by every repository UPDATE; the ETag of the product's representation
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
 
     owner_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     owner: Mapped["User"] = relationship("User", back_populates="products", lazy="joined")
@@ -73,6 +136,8 @@ class Product(Base):
         CheckConstraint("price >= 0", name="check_price_non_negative"),
         CheckConstraint("stock >= 0", name="check_stock_non_negative"),
         Index("ux_products_name_lower", func.lower(name), unique=True),
+        # ids are never handed out again, so "product-<id>-v<version>" can't name a later product
+        {"sqlite_autoincrement": True},
     )
 
     @override
@@ -84,3 +149,108 @@ class Product(Base):
             f"price='{self.price}', "
             f"stock='{self.stock}')>"
         )
+
+
+# Full-text search: FTS5 external-content tables over ``products``, kept in sync by triggers.
+# ``products_fts`` backs ranked word/prefix search (``q=``); ``products_name_trgm`` backs substring search.
+products_fts = table("products_fts", column("rowid", Integer), column("name"), column("description"), column("rank"))
+products_name_trgm = table("products_name_trgm", column("rowid", Integer), column("name"))
+
+PRODUCT_SEARCH_DDL: tuple[str, ...] = (
+    "CREATE VIRTUAL TABLE products_fts USING fts5("
+    "name, description, content='products', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE VIRTUAL TABLE products_name_trgm USING fts5("
+    "name, content='products', content_rowid='id', tokenize='trigram')",
+    """CREATE TRIGGER products_search_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+        INSERT INTO products_name_trgm(rowid, name) VALUES (new.id, new.name);
+    END""",
+    """CREATE TRIGGER products_search_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO products_name_trgm(products_name_trgm, rowid, name) VALUES ('delete', old.id, old.name);
+    END""",
+    """CREATE TRIGGER products_search_au AFTER UPDATE OF name, description ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO products_name_trgm(products_name_trgm, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO products_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+        INSERT INTO products_name_trgm(rowid, name) VALUES (new.id, new.name);
+    END""",
+)
+
+for _ddl in PRODUCT_SEARCH_DDL:  # so that metadata.create_all() (tests) matches the Alembic schema
+    event.listen(Product.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+
+for _drop in ("DROP TABLE IF EXISTS products_fts", "DROP TABLE IF EXISTS products_name_trgm"):
+    event.listen(Product.__table__, "before_drop", DDL(_drop).execute_if(dialect="sqlite"))
+
+
+# Substring search over usernames/emails: a trigram FTS5 table over ``users``, synced the same way.
+# ``users_trgm_vocab`` reads back how many rows hold each trigram, per column, to size a search up front.
+users_trgm = table("users_trgm", column("rowid", Integer), column("username"), column("email"))
+users_trgm_vocab = table("users_trgm_vocab", column("term"), column("col"), column("doc", Integer))
+
+USER_SEARCH_DDL: tuple[str, ...] = (
+    "CREATE VIRTUAL TABLE users_trgm USING fts5("
+    "username, email, content='users', content_rowid='id', tokenize='trigram', detail='column')",
+    """CREATE TRIGGER users_search_ai AFTER INSERT ON users BEGIN
+        INSERT INTO users_trgm(rowid, username, email) VALUES (new.id, new.username, new.email);
+    END""",
+    """CREATE TRIGGER users_search_ad AFTER DELETE ON users BEGIN
+        INSERT INTO users_trgm(users_trgm, rowid, username, email) VALUES ('delete', old.id, old.username, old.email);
+    END""",
+    """CREATE TRIGGER users_search_au AFTER UPDATE OF username, email ON users BEGIN
+        INSERT INTO users_trgm(users_trgm, rowid, username, email) VALUES ('delete', old.id, old.username, old.email);
+        INSERT INTO users_trgm(rowid, username, email) VALUES (new.id, new.username, new.email);
+    END""",
+    "CREATE VIRTUAL TABLE users_trgm_vocab USING fts5vocab(users_trgm, 'col')",
+)
+
+for _ddl in USER_SEARCH_DDL:
+    event.listen(User.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+
+for _drop in ("DROP TABLE IF EXISTS users_trgm_vocab", "DROP TABLE IF EXISTS users_trgm"):
+    event.listen(User.__table__, "before_drop", DDL(_drop).execute_if(dialect="sqlite"))
+
+
+# Counters: every insert/delete on a counted table bumps its row(s) in ``counters`` in the same transaction
+def _bump(scope: str, key: str, delta: int) -> str:
+    return (
+        f"INSERT INTO counters(scope, key, value) VALUES ('{scope}', {key}, {delta}) "
+        f"ON CONFLICT(scope, key) DO UPDATE SET value = value + ({delta});"
+    )
+
+
+COUNTER_DDL: tuple[str, ...] = (
+    f"""CREATE TRIGGER orders_count_ai AFTER INSERT ON orders BEGIN
+        {_bump("orders", "0", 1)}
+        {_bump("user_orders", "new.user_id", 1)}
+    END""",
+    f"""CREATE TRIGGER orders_count_ad AFTER DELETE ON orders BEGIN
+        {_bump("orders", "0", -1)}
+        {_bump("user_orders", "old.user_id", -1)}
+    END""",
+    f"""CREATE TRIGGER orders_count_au AFTER UPDATE OF user_id ON orders BEGIN
+        {_bump("user_orders", "old.user_id", -1)}
+        {_bump("user_orders", "new.user_id", 1)}
+    END""",
+    f"CREATE TRIGGER users_count_ai AFTER INSERT ON users BEGIN {_bump('users', '0', 1)} END",
+    f"CREATE TRIGGER users_count_ad AFTER DELETE ON users BEGIN {_bump('users', '0', -1)} END",
+    f"CREATE TRIGGER products_count_ai AFTER INSERT ON products BEGIN {_bump('products', '0', 1)} END",
+    f"CREATE TRIGGER products_count_ad AFTER DELETE ON products BEGIN {_bump('products', '0', -1)} END",
+)
+
+# Recount from scratch (manage.py rebuild-counters); run in one transaction
+COUNTER_REBUILD_SQL: tuple[str, ...] = (
+    "DELETE FROM counters",
+    "INSERT INTO counters(scope, key, value) SELECT 'orders', 0, count(*) FROM orders",
+    "INSERT INTO counters(scope, key, value) SELECT 'user_orders', user_id, count(*) FROM orders GROUP BY user_id",
+    "INSERT INTO counters(scope, key, value) SELECT 'users', 0, count(*) FROM users",
+    "INSERT INTO counters(scope, key, value) SELECT 'products', 0, count(*) FROM products",
+)
+
+# the triggers span several tables, so they go in once the whole schema exists
+for _ddl in COUNTER_DDL:
+    event.listen(Base.metadata, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
@@ -1,23 +1,76 @@
-from collections.abc import Callable, Sequence
+from collections.abc import AsyncIterator, Callable, Collection, Mapping, Sequence
 from contextlib import asynccontextmanager, nullcontext
 from inspect import isawaitable
 from typing import Any, TypeVar, final, override
 
 import falcon
-from sqlalchemy import Select, delete, func, select, update
+from sqlalchemy import Select, Update, delete, func, select, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from domain.orders.entities import Order
+from domain.orders.entities import Order, OrderItem
 from domain.orders.repositories import AbstractOrderRepository
+from domain.pagination import CountMode
 from domain.products.entities import Product
 from domain.products.repositories import AbstractProductRepository
 from domain.users.entities import User
 from domain.users.repositories import AbstractUserRepository
+from infrastructure.cache.counts import count_cache, selectivity_cache
+from infrastructure.cache.entities import CacheKey, defer_invalidation, entity_cache
+from infrastructure.cache.responses import defer_tag_invalidation, response_cache
 from infrastructure.databases.db import AsyncSessionLocal
 from infrastructure.sqlalchemy.models import Order as OrderORM
 from infrastructure.sqlalchemy.models import Product as ProductORM
 from infrastructure.sqlalchemy.models import User as UserORM
+from infrastructure.sqlalchemy.statements import (
+    GET_ORDER,
+    GET_ORDER_VERSION,
+    GET_PRODUCT,
+    GET_PRODUCT_BY_NAME,
+    GET_PRODUCT_VERSION,
+    GET_USER,
+    GET_USER_BY_USERNAME,
+    INSERT_ORDER_ITEMS,
+    INSERT_ORDERS,
+    INSERT_PRODUCTS,
+    ORDERED_PRODUCT,
+    PRODUCT_PRICES,
+    RESERVE_STOCK,
+    USER_TRIGRAM_DOCS,
+    Params,
+    Shape,
+    order_count,
+    order_get,
+    order_get_many,
+    order_list,
+    order_params,
+    order_update,
+    paging_params,
+    product_count,
+    product_get,
+    product_get_many,
+    product_list,
+    product_params,
+    product_update,
+    set_params,
+    trigrams,
+    user_count,
+    user_get,
+    user_get_many,
+    user_list,
+    user_params,
+    user_update,
+)
+
+# Rows per bulk INSERT: 5 bound values each keeps a statement well under SQLite's variable limit
+_BULK_CHUNK = 500
+
+# Rows fetched per round-trip while streaming a result out
+_STREAM_BATCH = 1_000
+
+# Share of the table past which re-checking a needle's trigram candidates costs more than an ILIKE scan;
+# scripts/bench_user_search.py puts a candidate at roughly five scanned rows
+_TRIGRAM_MAX_SHARE = 0.1
 
 Entity = TypeVar("Entity")
 Domain = TypeVar("Domain")
@@ -34,18 +87,49 @@ def _user_to_domain(row: UserORM) -> User:
 
 def _product_to_domain(row: ProductORM) -> Product:
     return Product(
-        id=row.id, name=row.name, description=row.description, price=row.price, stock=row.stock, owner_id=row.owner_id
+        id=row.id,
+        name=row.name,
+        description=row.description,
+        price=row.price,
+        stock=row.stock,
+        owner_id=row.owner_id,
+        version=row.version,
     )
 
 
 def _order_to_domain(row: OrderORM) -> Order:
-    return Order(id=row.id, user_id=row.user_id, total_price=row.total_price, created_at=row.created_at)
+    return Order(
+        id=row.id, user_id=row.user_id, total_price=row.total_price, created_at=row.created_at, version=row.version
+    )
+
+
+# Row mappers: the read templates select their columns in dataclass field order
+def _user_from_row(row: Sequence[Any]) -> User:
+    return User(*row)
+
+
+def _product_from_row(row: Sequence[Any]) -> Product:
+    return Product(*row)
+
+
+def _order_from_row(row: Sequence[Any]) -> Order:
+    return Order(*row)
 
 
 class BaseSQLAlchemyRepo[Entity, Domain]:  # noqa: B903
-    def __init__(self, session: AsyncSession | None, to_domain: Callable[[Entity], Domain]):
+    def __init__(
+        self,
+        session: AsyncSession | None,
+        to_domain: Callable[[Entity], Domain],
+        from_row: Callable[[Sequence[Any]], Domain],
+        kind: str,
+        read_sessions: async_sessionmaker[AsyncSession],
+    ):
         self._session: AsyncSession | None = session
-        self._to_domain: Callable[[Entity], Domain] = to_domain
+        self._read_sessions: async_sessionmaker[AsyncSession] = read_sessions  # unbound reads only
+        self._to_domain: Callable[[Entity], Domain] = to_domain  # ORM instances, on the write paths
+        self._from_row: Callable[[Sequence[Any]], Domain] = from_row  # column rows, on the read paths
+        self._kind: str = kind
 
     @staticmethod
     async def _maybe_await(value: Any) -> Any:  # noqa: ANN401
@@ -63,6 +147,16 @@ class BaseSQLAlchemyRepo[Entity, Domain]:  # noqa: B903
         async with AsyncSessionLocal() as session:
             yield session
 
+    @asynccontextmanager
+    async def _read_session(self):
+        if self._session is not None:
+            async with nullcontext(self._session):
+                yield self._session
+            return
+
+        async with self._read_sessions() as session:
+            yield session
+
     async def _save(self, orm: Entity, work: Callable[[AsyncSession, Entity], Any]) -> Domain:
         if self._session is not None:
             sess = self._session
@@ -76,6 +170,7 @@ class BaseSQLAlchemyRepo[Entity, Domain]:  # noqa: B903
                 raise
 
             await sess.refresh(orm)
+            self._invalidate_responses()
             return self._to_domain(orm)
 
         async with AsyncSessionLocal() as sess:
@@ -90,6 +185,7 @@ class BaseSQLAlchemyRepo[Entity, Domain]:  # noqa: B903
                 raise
 
             await sess.refresh(orm)
+            self._invalidate_responses()
             return self._to_domain(orm)
 
     async def _exec(self, work: Callable[[AsyncSession], Any]):
@@ -112,46 +208,243 @@ class BaseSQLAlchemyRepo[Entity, Domain]:  # noqa: B903
             await sess.commit()
             return
 
+    async def _update_returning(
+        self, entity_id: int, values: Mapping[str, Any], template: Callable[[Shape], Update]
+    ) -> Scalar[Domain]:
+        """Apply the non-``None`` ``values`` in one ``UPDATE ... RETURNING``; ``None`` when no row has that id."""
+        values = {name: value for name, value in values.items() if value is not None}
+        if not values:
+            raise ValueError("Nothing to update")  # noqa: EM101, TRY003
+
+        stmt, params = template(frozenset(values)), set_params(entity_id, values)
+
+        if self._session is not None:
+            row = (await self._session.execute(stmt, params)).one_or_none()
+        else:
+            async with AsyncSessionLocal() as sess:
+                row = (await sess.execute(stmt, params)).one_or_none()
+                await sess.commit()
+
+        if row is None:
+            return None
+
+        self._invalidate(entity_id)
+        return self._from_row(row)
+
     async def _fetch_one(
         self,
         stmt: Select[Any],
+        params: Params,
         *,
-        mapper: Callable[[Entity], Domain] | None = None,
+        mapper: Callable[[Sequence[Any]], Domain] | None = None,
     ) -> Scalar[Domain]:
-        mapper = mapper or self._to_domain
-        async with self._get_session() as s:
-            res = await s.execute(stmt)
-            row: Entity | None = res.scalar_one_or_none()
-            return mapper(row) if row else None
+        mapper = mapper or self._from_row
+        async with self._read_session() as s:
+            row = (await s.execute(stmt, params)).one_or_none()
+            return mapper(row) if row is not None else None
 
     async def _fetch_many(
         self,
         stmt: Select[Any],
+        params: Params,
         *,
-        mapper: Callable[[Entity], Domain] | None = None,
+        mapper: Callable[[Sequence[Any]], Domain] | None = None,
     ) -> Many[Domain]:
-        mapper = mapper or self._to_domain
-        async with self._get_session() as s:
-            res = await s.execute(stmt)
-            return [mapper(r) for r in res.scalars().all()]
+        mapper = mapper or self._from_row
+        async with self._read_session() as s:
+            res = await s.execute(stmt, params)
+            return [mapper(r) for r in res]
+
+    async def _cached_get(
+        self, entity_id: int, stmt: Select[Any], *, projected: Select[Any] | None = None
+    ) -> Scalar[Domain]:
+        """Read-through ``get`` on a template keyed by ``:id``; UoW-bound repositories always read the database.
+
+        A cached entity also answers a sparse fieldset; on a miss, the ``projected`` template is read instead
+        and its partial entity is not cached.
+        """
+        if self._session is not None:
+            return await self._fetch_one(projected if projected is not None else stmt, {"id": entity_id})
+
+        cached = entity_cache.get((self._kind, entity_id))
+        if cached is not None:
+            return cached  # pyright:ignore[reportReturnType]
+
+        if projected is not None:
+            return await self._fetch_one(projected, {"id": entity_id})
+
+        generation = entity_cache.generation(self._kind)
+        found = await self._fetch_one(stmt, {"id": entity_id})
+        if found is not None:
+            entity_cache.set(self._kind, generation, (self._kind, entity_id), found)
+
+        return found
+
+    async def _cached_get_many(
+        self,
+        entity_ids: Collection[int],
+        template: Callable[[Shape | None], Select[Any]],
+        fields: Collection[str] | None,
+    ) -> dict[int, Domain]:
+        """Read-through ``get`` of many ids: cached entities as they are, the rest in one ``WHERE id IN (...)``.
+
+        As with ``_cached_get``, only full entities are cached, and UoW-bound repositories read them all.
+        """
+        found: dict[int, Domain] = {}
+        wanted = list(dict.fromkeys(entity_ids))
+
+        if self._session is None:
+            for entity_id in wanted:
+                cached = entity_cache.get((self._kind, entity_id))
+                if cached is not None:
+                    found[entity_id] = cached  # pyright:ignore[reportArgumentType]
+
+        missing = [entity_id for entity_id in wanted if entity_id not in found]
+        if not missing:
+            return found
+
+        shape = None if fields is None else frozenset(fields)
+        generation = entity_cache.generation(self._kind)
+        for entity in await self._fetch_many(template(shape), {"ids": missing}):
+            entity_id: int = getattr(entity, "id")  # noqa: B009
+            found[entity_id] = entity
+            if self._session is None and shape is None:
+                entity_cache.set(self._kind, generation, (self._kind, entity_id), entity)
+
+        return found
+
+    async def _cached_get_by(
+        self, alias: CacheKey, stmt: Select[Any], params: Params, matches: Callable[[Domain], bool]
+    ) -> Scalar[Domain]:
+        """Read-through lookup by a secondary key; the alias only maps to an id, ``matches`` re-checks the entity."""
+        if self._session is not None:
+            return await self._fetch_one(stmt, params)
+
+        entity_id = entity_cache.get(alias)
+        if entity_id is not None:
+            cached = entity_cache.get((self._kind, entity_id))
+            if cached is not None and matches(cached):  # pyright:ignore[reportArgumentType]
+                return cached  # pyright:ignore[reportReturnType]
+
+        generation = entity_cache.generation(self._kind)
+        found = await self._fetch_one(stmt, params)
+        if found is not None:
+            entity_id = getattr(found, "id")  # noqa: B009
+            entity_cache.set(self._kind, generation, (self._kind, entity_id), found)
+            entity_cache.set(self._kind, generation, alias, entity_id)
+
+        return found
+
+    async def _cached_version(self, entity_id: int, stmt: Select[Any]) -> int | None:
+        """The row's ``version``: read off a cached entity if there is one, else looked up on its own by ``:id``."""
+        if self._session is None:
+            cached = entity_cache.get((self._kind, entity_id))
+            if cached is not None:
+                return getattr(cached, "version")  # noqa: B009
+
+        async with self._read_session() as s:
+            return (await s.execute(stmt, {"id": entity_id})).scalar_one_or_none()
+
+    def _invalidate(self, entity_id: int) -> None:
+        """Drop the cached entity, and every cached response listing its kind, now or once the owning UoW commits."""
+        if self._session is not None:
+            defer_invalidation(self._session, [(self._kind, entity_id)])
+        else:
+            entity_cache.invalidate((self._kind, entity_id))
+
+        self._invalidate_responses()
+
+    def _invalidate_responses(self) -> None:
+        """Drop cached responses tagged with this repository's kind now, or once the owning UoW commits."""
+        if self._session is not None:
+            defer_tag_invalidation(self._session, [self._kind])
+        else:
+            response_cache.invalidate(self._kind)
+
+    async def _fetch_page(
+        self,
+        page_stmt: Callable[..., Select[Any]],
+        count_stmt: Select[Any],
+        filters: Params,
+        paging: Params,
+        count: CountMode,
+        fields: Collection[str] | None = None,
+    ) -> tuple[Many[Domain], int | None, CountMode]:
+        """Fetch one page plus its total as ``count`` asks; also reports the mode the total was produced in.
+
+        ``exact`` runs the ``(*columns, total)`` form of ``page_stmt`` and only falls back to ``count_stmt``
+        on an empty page. ``estimate`` serves a recent total from ``count_cache`` and counts on a miss;
+        every total that does get counted refreshes the cache. ``fields`` narrows the selected columns.
+        """
+        params = filters | paging
+        with_total = count == "exact"
+        key = (self._kind, frozenset(filters.items()))
+
+        async with self._read_session() as s:
+            shape = None if fields is None else frozenset(fields)
+            stmt = page_stmt(frozenset(params), with_total=with_total, fields=shape)
+            rows = (await s.execute(stmt, params)).all()
+            if with_total and rows:
+                count_cache.set(key, rows[0].total)
+                return [self._from_row(r[:-1]) for r in rows], rows[0].total, "exact"
+
+            items = [self._from_row(r) for r in rows]
+            if count == "none":
+                return items, None, "none"
+
+            if count == "estimate":
+                cached = count_cache.get(key)
+                if cached is not None:
+                    return items, cached, "estimate"
+
+            total: int = (await s.execute(count_stmt, filters)).scalar_one()
+            count_cache.set(key, total)
+            return items, total, "exact"
+
+    async def _stream(
+        self, list_stmt: Callable[..., Select[Any]], filters: Params, fields: Collection[str] | None = None
+    ) -> AsyncIterator[Many[Domain]]:
+        """Yield every row ``list_stmt`` matches, in its order, ``_STREAM_BATCH`` at a time off a server-side cursor.
+
+        The next batch is only fetched once the consumer asks for it, so a slow reader holds one batch in
+        memory rather than the whole result.
+        """
+        params = filters | paging_params(0, None)
+        stmt = list_stmt(frozenset(params), fields=None if fields is None else frozenset(fields))
+
+        async with self._read_session() as s:
+            result = await s.stream(stmt, params, execution_options={"yield_per": _STREAM_BATCH})
+            async for rows in result.partitions():
+                yield [self._from_row(r) for r in rows]
+
+    async def _count(self, stmt: Select[Any], params: Params) -> int:
+        async with self._read_session() as s:
+            return (await s.execute(stmt, params)).scalar_one()
 
 
 @final
 class SQLAlchemyOrderRepository(BaseSQLAlchemyRepo[OrderORM, Order], AbstractOrderRepository):
-    def __init__(self, session: AsyncSession | None = None) -> None:
-        super().__init__(session, to_domain=_order_to_domain)
+    def __init__(
+        self, session: AsyncSession | None = None, read_sessions: async_sessionmaker[AsyncSession] = AsyncSessionLocal
+    ) -> None:
+        super().__init__(
+            session, to_domain=_order_to_domain, from_row=_order_from_row, kind="order", read_sessions=read_sessions
+        )
 
     @override
     async def count_all(self) -> int:
-        async with AsyncSessionLocal() as s:
-            stmt = select(func.count()).select_from(OrderORM)
-            return (await s.execute(stmt)).scalar_one()
+        return await self._count(order_count(frozenset()), {})
 
     @override
     async def count_for_user(self, user_id: int) -> int:
-        async with AsyncSessionLocal() as s:
-            stmt = select(func.count()).select_from(OrderORM).where(OrderORM.user_id == user_id)
-            return (await s.execute(stmt)).scalar_one()
+        params = order_params(user_id)
+        return await self._count(order_count(frozenset(params)), params)
+
+    @override
+    def stream_all(
+        self, *, user_id: int | None = None, fields: Collection[str] | None = None
+    ) -> AsyncIterator[list[Order]]:
+        return self._stream(order_list, order_params(user_id), fields)
 
     #  Write ops
     @override
@@ -160,66 +453,128 @@ class SQLAlchemyOrderRepository(BaseSQLAlchemyRepo[OrderORM, Order], AbstractOrd
 
         return await self._save(orm, lambda sess, o: sess.add(o))
 
+    @override
+    async def add_many(self, orders: Sequence[Order]) -> list[Order]:
+        params = [{"user_id": o.user_id, "total_price": o.total_price} for o in orders]
+
+        async with self._get_session() as sess:
+            created = [_order_from_row(row) for row in await sess.execute(INSERT_ORDERS, params)]
+
+            if self._session is None:
+                await sess.commit()
+
+        self._invalidate_responses()
+        return created
+
+    @override
+    async def add_items(self, order_id: int, items: Sequence[OrderItem]) -> None:
+        params = [
+            {"order_id": order_id, "product_id": i.product_id, "quantity": i.quantity, "unit_price": i.unit_price}
+            for i in items
+        ]
+
+        async with self._get_session() as sess:
+            _ = await sess.execute(INSERT_ORDER_ITEMS, params)
+
+            if self._session is None:
+                await sess.commit()
+
     @override
     async def delete(self, order_id: int) -> None:
+        # the order's lines go with it: order_items.order_id is ON DELETE CASCADE
         await self._exec(lambda sess: sess.execute(delete(OrderORM).where(OrderORM.id == order_id)))
+        self._invalidate(order_id)
+
+    @override
+    async def update_fields(self, order_id: int, *, total_price: float | None = None) -> Order | None:
+        return await self._update_returning(order_id, {"total_price": total_price}, order_update)
 
     @override
     async def update_total(self, order_id: int, new_total: float) -> None:
         await self._exec(
-            lambda sess: sess.execute(update(OrderORM).where(OrderORM.id == order_id).values(total_price=new_total))
+            lambda sess: sess.execute(
+                update(OrderORM)
+                .where(OrderORM.id == order_id)
+                .values(total_price=new_total, version=OrderORM.version + 1)
+            )
         )
+        self._invalidate(order_id)
 
     # Read ops
     @override
-    async def get(self, order_id: int) -> Order | None:
-        stmt = select(OrderORM).where(OrderORM.id == order_id)
-        return await self._fetch_one(stmt)
+    async def get(self, order_id: int, *, fields: Collection[str] | None = None) -> Order | None:
+        projected = None if fields is None else order_get(frozenset(fields))
+        return await self._cached_get(order_id, GET_ORDER, projected=projected)
+
+    @override
+    async def get_many(self, order_ids: Collection[int], *, fields: Collection[str] | None = None) -> dict[int, Order]:
+        return await self._cached_get_many(order_ids, order_get_many, fields)
+
+    @override
+    async def get_version(self, order_id: int) -> int | None:
+        return await self._cached_version(order_id, GET_ORDER_VERSION)
 
     @override
-    async def list_for_user(self, user_id: int, *, offset: int = 0, limit: int | None = None) -> Sequence[Order]:
-        stmt = select(OrderORM).where(OrderORM.user_id == user_id).offset(offset)
-        if limit is not None:
-            stmt = stmt.limit(limit)
+    async def references_product(self, product_id: int) -> bool:
+        async with self._read_session() as s:
+            return await s.scalar(ORDERED_PRODUCT, {"product_id": product_id}) is not None
 
-        return await self._fetch_many(stmt)
+    @override
+    async def list_for_user(
+        self, user_id: int, *, offset: int = 0, limit: int | None = None, after_id: int | None = None
+    ) -> Sequence[Order]:
+        params = order_params(user_id) | self._paging(offset, limit, after_id)
+        return await self._fetch_many(order_list(frozenset(params)), params)
 
     @override
-    async def list_all(self, *, offset: int = 0, limit: int | None = None) -> Sequence[Order]:
-        stmt = select(OrderORM).offset(offset)
-        if limit is not None:
-            stmt = stmt.limit(limit)
+    async def list_all(
+        self, *, offset: int = 0, limit: int | None = None, after_id: int | None = None
+    ) -> Sequence[Order]:
+        params = self._paging(offset, limit, after_id)
+        return await self._fetch_many(order_list(frozenset(params)), params)
+
+    @override
+    async def list_page(
+        self,
+        *,
+        user_id: int | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+        after_id: int | None = None,
+        count: CountMode = "exact",
+        fields: Collection[str] | None = None,
+    ) -> tuple[list[Order], int | None, CountMode]:
+        filters, paging = order_params(user_id), self._paging(offset, limit, after_id)
+
+        return await self._fetch_page(order_list, order_count(frozenset(filters)), filters, paging, count, fields)
 
-        return await self._fetch_many(stmt)
+    @staticmethod
+    def _paging(offset: int, limit: int | None, after_id: int | None) -> Params:
+        return paging_params(offset, limit, None if after_id is None else {"after_id": after_id})
 
 
 @final
 class SQLAlchemyUserRepository(BaseSQLAlchemyRepo[UserORM, User], AbstractUserRepository):
-    def __init__(self, session: AsyncSession | None = None) -> None:
-        super().__init__(session, to_domain=_user_to_domain)
+    def __init__(
+        self, session: AsyncSession | None = None, read_sessions: async_sessionmaker[AsyncSession] = AsyncSessionLocal
+    ) -> None:
+        super().__init__(
+            session, to_domain=_user_to_domain, from_row=_user_from_row, kind="user", read_sessions=read_sessions
+        )
 
     @override
     async def count_all(self, *, username_contains: str | None = None, email_contains: str | None = None) -> int:
-        stmt = select(func.count()).select_from(UserORM)
-
-        if username_contains:
-            stmt = stmt.where(UserORM.username.ilike(f"%{username_contains}%"))
-
-        if email_contains:
-            stmt = stmt.where(UserORM.email.ilike(f"%{email_contains}%"))
-
-        async with AsyncSessionLocal() as sess:
-            return (await sess.execute(stmt)).scalar_one()
+        params = await self._filters(username_contains, email_contains)
+        return await self._count(user_count(frozenset(params)), params)
 
     #  Write ops
     @override
     async def add(self, user: User) -> User:
         async with self._get_session() as sess:
-            existing = await sess.execute(select(UserORM).where(UserORM.username == user.username))
-            row: UserORM | None = existing.scalar_one_or_none()
+            row = (await sess.execute(GET_USER_BY_USERNAME, {"username": user.username})).one_or_none()
 
-            if row:
-                return _user_to_domain(row)
+            if row is not None:
+                return _user_from_row(row)
 
         orm = UserORM(username=user.username, email=user.email, password=user.password_hash)
         return await self._save(orm, lambda sess, o: sess.add(o))
@@ -227,27 +582,41 @@ class SQLAlchemyUserRepository(BaseSQLAlchemyRepo[UserORM, User], AbstractUserRe
     @override
     async def delete(self, user_id: int) -> None:
         await self._exec(lambda sess: sess.execute(delete(UserORM).where(UserORM.id == user_id)))
+        self._invalidate(user_id)
+
+    @override
+    async def update_fields(
+        self, user_id: int, *, username: str | None = None, email: str | None = None
+    ) -> User | None:
+        return await self._update_returning(user_id, {"username": username, "email": email}, user_update)
 
     @override
     async def update_email(self, user_id: int, new_email: str) -> None:
         await self._exec(lambda s: s.execute(update(UserORM).where(UserORM.id == user_id).values(email=new_email)))
+        self._invalidate(user_id)
 
     @override
     async def update_username(self, user_id: int, new_username: str) -> None:
         await self._exec(
             lambda s: s.execute(update(UserORM).where(UserORM.id == user_id).values(username=new_username))
         )
+        self._invalidate(user_id)
 
     # Read ops
     @override
-    async def get(self, user_id: int) -> User | None:
-        stmt = select(UserORM).where(UserORM.id == user_id)
-        return await self._fetch_one(stmt)
+    async def get(self, user_id: int, *, fields: Collection[str] | None = None) -> User | None:
+        projected = None if fields is None else user_get(frozenset(fields))
+        return await self._cached_get(user_id, GET_USER, projected=projected)
+
+    @override
+    async def get_many(self, user_ids: Collection[int], *, fields: Collection[str] | None = None) -> dict[int, User]:
+        return await self._cached_get_many(user_ids, user_get_many, fields)
 
     @override
     async def get_by_username(self, username: str) -> User | None:
-        stmt = select(UserORM).where(UserORM.username == username)
-        return await self._fetch_one(stmt)
+        return await self._cached_get_by(
+            ("username", username), GET_USER_BY_USERNAME, {"username": username}, lambda u: u.username == username
+        )
 
     @override
     async def list_all(
@@ -257,45 +626,97 @@ class SQLAlchemyUserRepository(BaseSQLAlchemyRepo[UserORM, User], AbstractUserRe
         limit: int | None = None,
         username_contains: str | None = None,
         email_contains: str | None = None,
+        after_id: int | None = None,
     ) -> list[User]:
-        stmt = select(UserORM).order_by(UserORM.id)
-
-        if username_contains:
-            stmt = stmt.where(UserORM.username.ilike(f"%{username_contains}%"))
+        params = await self._filters(username_contains, email_contains) | self._paging(offset, limit, after_id)
+        return await self._fetch_many(user_list(frozenset(params)), params)
 
-        if email_contains:
-            stmt = stmt.where(UserORM.email.ilike(f"%{email_contains}%"))
+    @override
+    async def list_page(
+        self,
+        *,
+        offset: int = 0,
+        limit: int | None = None,
+        username_contains: str | None = None,
+        email_contains: str | None = None,
+        after_id: int | None = None,
+        count: CountMode = "exact",
+        fields: Collection[str] | None = None,
+    ) -> tuple[list[User], int | None, CountMode]:
+        filters = await self._filters(username_contains, email_contains)
+        paging = self._paging(offset, limit, after_id)
 
-        stmt = stmt.offset(offset)
+        return await self._fetch_page(user_list, user_count(frozenset(filters)), filters, paging, count, fields)
 
-        if limit is not None:
-            stmt = stmt.limit(limit)
+    @override
+    async def stream_all(
+        self,
+        *,
+        username_contains: str | None = None,
+        email_contains: str | None = None,
+        fields: Collection[str] | None = None,
+    ) -> AsyncIterator[list[User]]:
+        filters = await self._filters(username_contains, email_contains)
+        async for batch in self._stream(user_list, filters, fields):
+            yield batch
+
+    async def _filters(self, username_contains: str | None, email_contains: str | None) -> Params:
+        """``user_params``, leaving needles too common for the trigram index to a plain ILIKE scan."""
+        needles = {"username": username_contains, "email": email_contains}
+        scan = [column for column, needle in needles.items() if await self._too_common(column, needle)]
+        return user_params(username_contains, email_contains, scan)
+
+    async def _too_common(self, column: str, needle: str | None) -> bool:
+        """Whether the index would hand back more than ``_TRIGRAM_MAX_SHARE`` of the users to re-check.
+
+        The rarest of the needle's trigrams bounds the candidates: ``@example`` matches every row of a
+        one-domain user base, and the index then loses to a scan; a trigram no row holds means no match.
+        """
+        terms = trigrams(needle)
+        if not terms:
+            return False
+
+        key = (column, "".join(terms))
+        cached = selectivity_cache.get(key)
+        if cached is not None:
+            return cached
+
+        async with self._read_session() as s:
+            found, rarest, rows = (await s.execute(USER_TRIGRAM_DOCS, {"col": column, "terms": list(terms)})).one()
+
+        common = found == len(terms) and rarest > rows * _TRIGRAM_MAX_SHARE
+        selectivity_cache.set(key, common)
+        return common
 
-        return await self._fetch_many(stmt)
+    @staticmethod
+    def _paging(offset: int, limit: int | None, after_id: int | None) -> Params:
+        return paging_params(offset, limit, None if after_id is None else {"after_id": after_id})
 
 
 @final
 class SQLAlchemyProductRepository(BaseSQLAlchemyRepo[ProductORM, Product], AbstractProductRepository):
-    def __init__(self, session: AsyncSession | None = None) -> None:
-        super().__init__(session, to_domain=_product_to_domain)
+    def __init__(
+        self, session: AsyncSession | None = None, read_sessions: async_sessionmaker[AsyncSession] = AsyncSessionLocal
+    ) -> None:
+        super().__init__(
+            session,
+            to_domain=_product_to_domain,
+            from_row=_product_from_row,
+            kind="product",
+            read_sessions=read_sessions,
+        )
 
     @override
     async def count_all(
-        self, *, name_contains: str | None = None, min_price: float | None = None, max_price: float | None = None
+        self,
+        *,
+        name_contains: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        q: str | None = None,
     ) -> int:
-        stmt = select(func.count()).select_from(ProductORM)
-
-        if name_contains:
-            stmt = stmt.where(ProductORM.name.ilike(f"%{name_contains}%"))
-
-        if min_price is not None:
-            stmt = stmt.where(ProductORM.price >= min_price)
-
-        if max_price is not None:
-            stmt = stmt.where(ProductORM.price <= max_price)
-
-        async with AsyncSessionLocal() as sess:
-            return (await sess.execute(stmt)).scalar_one()
+        params = product_params(name_contains, min_price, max_price, q)
+        return await self._count(product_count(frozenset(params)), params)
 
     # Write ops
     @override
@@ -317,35 +738,113 @@ class SQLAlchemyProductRepository(BaseSQLAlchemyRepo[ProductORM, Product], Abstr
         )
         return await self._save(orm, lambda sess, o: sess.add(o))
 
+    @override
+    async def add_many(self, products: Sequence[Product]) -> list[Product | None]:
+        results: list[Product | None] = []
+
+        async with self._get_session() as sess:
+            for start in range(0, len(products), _BULK_CHUNK):
+                chunk = products[start : start + _BULK_CHUNK]
+                params = [
+                    {
+                        "name": p.name,
+                        "description": p.description,
+                        "price": p.price,
+                        "stock": p.stock,
+                        "owner_id": p.owner_id,
+                    }
+                    for p in chunk
+                ]
+                inserted = {row.name: _product_from_row(row) for row in await sess.execute(INSERT_PRODUCTS, params)}
+
+                # only the first item carrying a name can have been inserted; pop() leaves exact repeats unmatched
+                results.extend(inserted.pop(p.name, None) for p in chunk)
+
+            if self._session is None:
+                await sess.commit()
+
+        self._invalidate_responses()
+        return results
+
     @override
     async def delete(self, product_id: int) -> None:
         await self._exec(lambda sess: sess.execute(delete(ProductORM).where(ProductORM.id == product_id)))
+        self._invalidate(product_id)
+
+    @override
+    async def update_fields(
+        self, product_id: int, *, price: float | None = None, stock: int | None = None
+    ) -> Product | None:
+        return await self._update_returning(product_id, {"price": price, "stock": stock}, product_update)
+
+    @override
+    async def reserve_stock(self, quantities: Mapping[int, int]) -> bool:
+        params = [{"where_id": product_id, "quantity": quantity} for product_id, quantity in quantities.items()]
+
+        async with self._get_session() as sess:
+            result = await sess.execute(RESERVE_STOCK, params)
+            reserved = result.rowcount == len(params)  # pyright:ignore[reportAttributeAccessIssue]
+
+            if self._session is None:
+                await (sess.commit() if reserved else sess.rollback())
+
+        for product_id in quantities:
+            self._invalidate(product_id)
+
+        return reserved
 
     @override
     async def update_stock(self, product_id: int, new_stock: int) -> None:
         await self._exec(
-            lambda sess: sess.execute(update(ProductORM).where(ProductORM.id == product_id).values(stock=new_stock))
+            lambda sess: sess.execute(
+                update(ProductORM)
+                .where(ProductORM.id == product_id)
+                .values(stock=new_stock, version=ProductORM.version + 1)
+            )
         )
+        self._invalidate(product_id)
 
     @override
     async def update_price(self, product_id: int, new_price: float) -> None:
         await self._exec(
-            lambda sess: sess.execute(update(ProductORM).where(ProductORM.id == product_id).values(price=new_price))
+            lambda sess: sess.execute(
+                update(ProductORM)
+                .where(ProductORM.id == product_id)
+                .values(price=new_price, version=ProductORM.version + 1)
+            )
         )
+        self._invalidate(product_id)
 
     # Read ops
     @override
-    async def get(self, product_id: int) -> Product | None:
-        stmt = select(ProductORM).where(ProductORM.id == product_id)
-        return await self._fetch_one(stmt)
+    async def get(self, product_id: int, *, fields: Collection[str] | None = None) -> Product | None:
+        projected = None if fields is None else product_get(frozenset(fields))
+        return await self._cached_get(product_id, GET_PRODUCT, projected=projected)
+
+    @override
+    async def get_many(
+        self, product_ids: Collection[int], *, fields: Collection[str] | None = None
+    ) -> dict[int, Product]:
+        return await self._cached_get_many(product_ids, product_get_many, fields)
+
+    @override
+    async def get_version(self, product_id: int) -> int | None:
+        return await self._cached_version(product_id, GET_PRODUCT_VERSION)
+
+    @override
+    async def get_prices(self, product_ids: Collection[int]) -> dict[int, float]:
+        async with self._get_session() as sess:
+            rows = await sess.execute(PRODUCT_PRICES, {"ids": list(product_ids)})
+            return {product_id: price for product_id, price in rows}
 
     @override
     async def get_by_name(self, name: str) -> Product | None:
-        stmt = select(ProductORM).where(ProductORM.name == name)
-        return await self._fetch_one(stmt)
+        return await self._cached_get_by(
+            ("product_name", name), GET_PRODUCT_BY_NAME, {"name": name}, lambda p: p.name == name
+        )
 
     @override
-    async def list_all(
+    async def list_all(  # noqa: PLR0913
         self,
         *,
         offset: int = 0,
@@ -353,20 +852,43 @@ class SQLAlchemyProductRepository(BaseSQLAlchemyRepo[ProductORM, Product], Abstr
         name_contains: str | None = None,
         min_price: float | None = None,
         max_price: float | None = None,
+        after: tuple[str, int] | None = None,
+        q: str | None = None,
     ) -> Sequence[Product]:
-        stmt = select(ProductORM)
-        if name_contains:
-            stmt = stmt.where(ProductORM.name.ilike(f"%{name_contains}%"))
+        params = product_params(name_contains, min_price, max_price, q) | self._paging(offset, limit, after)
+        return await self._fetch_many(product_list(frozenset(params)), params)
 
-        if min_price is not None:
-            stmt = stmt.where(ProductORM.price >= min_price)
+    @override
+    async def list_page(  # noqa: PLR0913
+        self,
+        *,
+        offset: int = 0,
+        limit: int | None = None,
+        name_contains: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        after: tuple[str, int] | None = None,
+        q: str | None = None,
+        count: CountMode = "exact",
+        fields: Collection[str] | None = None,
+    ) -> tuple[list[Product], int | None, CountMode]:
+        filters = product_params(name_contains, min_price, max_price, q)
+        paging = self._paging(offset, limit, after)
 
-        if max_price is not None:
-            stmt = stmt.where(ProductORM.price <= max_price)
+        return await self._fetch_page(product_list, product_count(frozenset(filters)), filters, paging, count, fields)
 
-        stmt = stmt.order_by(func.lower(ProductORM.name))
-        stmt = stmt.offset(offset)
-        if limit is not None:
-            stmt = stmt.limit(limit)
+    @override
+    def stream_all(  # noqa: PLR0913
+        self,
+        *,
+        name_contains: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        q: str | None = None,
+        fields: Collection[str] | None = None,
+    ) -> AsyncIterator[list[Product]]:
+        return self._stream(product_list, product_params(name_contains, min_price, max_price, q), fields)
 
-        return await self._fetch_many(stmt)
+    @staticmethod
+    def _paging(offset: int, limit: int | None, after: tuple[str, int] | None) -> Params:
+        return paging_params(offset, limit, None if after is None else {"after_name": after[0], "after_id": after[1]})
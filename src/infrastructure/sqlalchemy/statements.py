@@ -0,0 +1,406 @@
+"""Prebuilt statement templates for the repositories' hot paths.
+
+SQLAlchemy memoizes a statement's cache key on the statement object, so re-executing the *same*
+object with new bound parameters skips both cache-key generation and compilation. Fixed lookups
+are module constants; filtered lists are built once per *shape* (the set of parameters present)
+and memoized, with every user-supplied value travelling as a bound parameter.
+"""
+
+import re
+from collections.abc import Callable, Collection, Mapping
+from functools import cache
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    Update,
+    bindparam,
+    func,
+    insert,
+    literal_column,
+    null,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from infrastructure.sqlalchemy.models import Counter, products_fts, products_name_trgm, users_trgm, users_trgm_vocab
+from infrastructure.sqlalchemy.models import Order as OrderORM
+from infrastructure.sqlalchemy.models import OrderItem as OrderItemORM
+from infrastructure.sqlalchemy.models import Product as ProductORM
+from infrastructure.sqlalchemy.models import User as UserORM
+
+type Params = dict[str, Any]
+type Shape = frozenset[str]
+
+# A trigram index can only narrow LIKE patterns whose literal part spans at least one trigram
+_TRIGRAM_MIN = 3
+_WORD = re.compile(r"\w+")
+
+# Read templates select plain columns, in the field order of the matching domain dataclass, so rows
+# unpack straight into it without loading (and identity-mapping) ORM instances
+ORDER_COLUMNS = (OrderORM.id, OrderORM.user_id, OrderORM.total_price, OrderORM.created_at, OrderORM.version)
+USER_COLUMNS = (UserORM.id, UserORM.username, UserORM.email, UserORM.password)
+PRODUCT_COLUMNS = (
+    ProductORM.id,
+    ProductORM.name,
+    ProductORM.description,
+    ProductORM.price,
+    ProductORM.stock,
+    ProductORM.owner_id,
+    ProductORM.version,
+)
+
+# Columns a sparse fieldset always keeps: the identity, the ``version`` behind ETags and the keyset seek key
+ORDER_KEY_FIELDS: Shape = frozenset({"id", "version"})
+USER_KEY_FIELDS: Shape = frozenset({"id"})
+PRODUCT_KEY_FIELDS: Shape = frozenset({"id", "name", "version"})
+
+# Single-row lookups
+GET_ORDER = select(*ORDER_COLUMNS).where(OrderORM.id == bindparam("id"))
+GET_USER = select(*USER_COLUMNS).where(UserORM.id == bindparam("id"))
+GET_USER_BY_USERNAME = select(*USER_COLUMNS).where(UserORM.username == bindparam("username"))
+GET_PRODUCT = select(*PRODUCT_COLUMNS).where(ProductORM.id == bindparam("id"))
+GET_PRODUCT_BY_NAME = select(*PRODUCT_COLUMNS).where(ProductORM.name == bindparam("name"))
+
+# Version-only lookups, enough to answer a conditional GET without loading the row
+GET_ORDER_VERSION = select(OrderORM.version).where(OrderORM.id == bindparam("id"))
+GET_PRODUCT_VERSION = select(ProductORM.version).where(ProductORM.id == bindparam("id"))
+
+# Bulk writes: executed with a list of parameter sets, one multi-row INSERT per page of rows.
+# A name clash with ux_products_name_lower skips the row, so RETURNING lists only the rows that went in
+INSERT_PRODUCTS = sqlite_insert(ProductORM).on_conflict_do_nothing().returning(*PRODUCT_COLUMNS)
+# every row goes in, so RETURNING can be matched back to the parameter sets by position
+INSERT_ORDERS = insert(OrderORM).returning(*ORDER_COLUMNS, sort_by_parameter_order=True)
+
+
+# Checkout: order lines priced from the catalog, with stock reserved by one conditional UPDATE batch.
+# The Core tables keep a list of parameter sets a plain executemany (the ORM would read it as update-by-pk)
+_products = ProductORM.__table__
+_order_items = OrderItemORM.__table__
+
+PRODUCT_PRICES = select(_products.c.id, _products.c.price).where(_products.c.id.in_(bindparam("ids", expanding=True)))
+# a short product matches no row, so the batch's rowcount falls below the number of lines
+RESERVE_STOCK = (
+    update(_products)
+    .where(_products.c.id == bindparam("where_id"), _products.c.stock >= bindparam("quantity"))
+    .values(stock=_products.c.stock - bindparam("quantity"), version=_products.c.version + 1)
+)
+INSERT_ORDER_ITEMS = insert(_order_items)
+ORDERED_PRODUCT = select(_order_items.c.order_id).where(_order_items.c.product_id == bindparam("product_id")).limit(1)
+
+
+# Filter clauses, keyed by the bound parameter that feeds them
+_ORDER_FILTERS: Mapping[str, Callable[[], ColumnElement[bool]]] = {
+    "user_id": lambda: OrderORM.user_id == bindparam("user_id"),
+}
+
+# only ASCII needles take the trigram path (see ``trigrams``): for those, the case-insensitive index and ILIKE agree
+_USER_FILTERS: Mapping[str, Callable[[], ColumnElement[bool]]] = {
+    "username_trgm": lambda: UserORM.id.in_(
+        select(users_trgm.c.rowid).where(users_trgm.c.username.like(bindparam("username_trgm")))
+    ),
+    "username_like": lambda: UserORM.username.ilike(bindparam("username_like")),
+    "email_trgm": lambda: UserORM.id.in_(
+        select(users_trgm.c.rowid).where(users_trgm.c.email.like(bindparam("email_trgm")))
+    ),
+    "email_like": lambda: UserORM.email.ilike(bindparam("email_like")),
+}
+
+_PRODUCT_FILTERS: Mapping[str, Callable[[], ColumnElement[bool]]] = {
+    "name_trgm": lambda: ProductORM.id.in_(
+        select(products_name_trgm.c.rowid).where(products_name_trgm.c.name.like(bindparam("name_trgm")))
+    ),
+    "name_like": lambda: ProductORM.name.ilike(bindparam("name_like")),
+    "min_price": lambda: ProductORM.price >= bindparam("min_price"),
+    "max_price": lambda: ProductORM.price <= bindparam("max_price"),
+}
+
+
+# Parameter builders: the keys they emit *are* the statement shape
+def trigrams(needle: str | None) -> tuple[str, ...]:
+    """The distinct trigrams of ``needle`` as the index stores them; none if the index can't serve it.
+
+    Only ASCII needles qualify: the trigram tokenizer folds case across Unicode but SQLite's ``lower()``,
+    and so ILIKE, only across ASCII, so for anything else the two could disagree on which rows match.
+    """
+    if not needle or len(needle) < _TRIGRAM_MIN or not needle.isascii():
+        return ()
+
+    folded = needle.lower()
+    return tuple(sorted({folded[i : i + _TRIGRAM_MIN] for i in range(len(folded) - _TRIGRAM_MIN + 1)}))
+
+
+def _substring(params: Params, key: str, needle: str | None, *, scan: bool = False) -> None:
+    if needle and trigrams(needle) and not scan:
+        params[f"{key}_trgm"] = f"%{needle}%"
+
+    elif needle:
+        params[f"{key}_like"] = f"%{needle}%"
+
+
+def _fts_query(text: str | None) -> str | None:
+    """Turn free text into an FTS5 query: every word has to match, each one as a prefix."""
+    if not text:
+        return None
+
+    return " ".join(f'"{word}"*' for word in _WORD.findall(text)) or None
+
+
+def order_params(user_id: int | None) -> Params:
+    return {} if user_id is None else {"user_id": user_id}
+
+
+def user_params(username_contains: str | None, email_contains: str | None, scan: Collection[str] = ()) -> Params:
+    """``scan`` names the columns whose needle should skip the trigram index for a plain ILIKE."""
+    params: Params = {}
+    _substring(params, "username", username_contains, scan="username" in scan)
+    _substring(params, "email", email_contains, scan="email" in scan)
+    return params
+
+
+def product_params(
+    name_contains: str | None, min_price: float | None, max_price: float | None, q: str | None
+) -> Params:
+    params: Params = {}
+    _substring(params, "name", name_contains)
+
+    if min_price is not None:
+        params["min_price"] = min_price
+
+    if max_price is not None:
+        params["max_price"] = max_price
+
+    if match := _fts_query(q):
+        params["match"] = match
+
+    return params
+
+
+def set_params(entity_id: int, values: Mapping[str, Any]) -> Params:
+    """Parameters for an ``*_update`` template; the new values travel as ``set_<column>``.
+
+    UPDATE reserves column names as bind names, hence ``where_id`` rather than ``id``.
+    """
+    return {"where_id": entity_id} | {f"set_{name}": value for name, value in values.items()}
+
+
+def paging_params(offset: int, limit: int | None, after: Params | None = None) -> Params:
+    params: Params = {"offset": offset, **(after or {})}
+    if limit is not None:
+        params["limit"] = limit
+
+    return params
+
+
+# Template builders, memoized per shape
+def _where(stmt: Select[Any], filters: Mapping[str, Callable[[], ColumnElement[bool]]], shape: Shape) -> Select[Any]:
+    return stmt.where(*(clause() for key, clause in filters.items() if key in shape))
+
+
+def _project(columns: tuple[Any, ...], fields: Shape | None, keep: Shape) -> tuple[Any, ...]:
+    """``columns`` narrowed to ``fields`` (plus ``keep``); the rest are selected as ``NULL``, so rows still
+    unpack positionally into the domain dataclass while the table columns themselves are never read.
+    """
+    if fields is None:
+        return columns
+
+    return tuple(c if c.key in fields or c.key in keep else null().label(c.key) for c in columns)
+
+
+def _paginate(stmt: Select[Any], shape: Shape) -> Select[Any]:
+    stmt = stmt.offset(bindparam("offset"))
+    if "limit" in shape:
+        stmt = stmt.limit(bindparam("limit"))
+
+    return stmt
+
+
+def _total_column(count_stmt: Select[Any], *, subquery: bool) -> ColumnElement[int]:
+    """Total number of filtered rows, carried as an extra column of the page query.
+
+    ``COUNT(*) OVER ()`` is evaluated before ``LIMIT``/``OFFSET`` and costs nothing extra, but a
+    seek predicate narrows the window, and a maintained counter beats counting at all, so keyset
+    pages and counter-backed totals embed ``count_stmt`` as a scalar subquery instead.
+    """
+    if subquery:
+        return count_stmt.scalar_subquery().label("total")
+
+    return func.count().over().label("total")
+
+
+def _counter(scope: str, key: ColumnElement[int] | int = 0) -> Select[Any]:
+    """Read a maintained count; a missing row means nothing has been counted yet, i.e. 0."""
+    return select(func.coalesce(func.max(Counter.value), 0)).where(Counter.scope == scope, Counter.key == key)
+
+
+# (trigrams found, rows holding the rarest of them, rows in ``users``) for the ``:terms`` of column ``:col``
+USER_TRIGRAM_DOCS = select(func.count(), func.min(users_trgm_vocab.c.doc), _counter("users").scalar_subquery()).where(
+    users_trgm_vocab.c.col == bindparam("col"), users_trgm_vocab.c.term.in_(bindparam("terms", expanding=True))
+)
+
+
+def _order_counter(shape: Shape) -> Select[Any] | None:
+    filters = shape & _ORDER_FILTERS.keys()
+    if not filters:
+        return _counter("orders")
+    if filters == {"user_id"}:
+        return _counter("user_orders", bindparam("user_id"))
+    return None
+
+
+def _unfiltered_counter(scope: str, shape: Shape, filters: Mapping[str, Any]) -> Select[Any] | None:
+    return _counter(scope) if not shape & (filters.keys() | {"match"}) else None
+
+
+def _update(model: Any, columns: tuple[Any, ...], fields: Shape, *, versioned: bool = False) -> Update:  # noqa: ANN401
+    """``UPDATE ... SET <fields> WHERE id = :where_id RETURNING <columns>``; no row back means no such id.
+
+    ``versioned`` also bumps the row's ``version``.
+    """
+    values: dict[str, Any] = {name: bindparam(f"set_{name}") for name in sorted(fields)}
+    if versioned:
+        values["version"] = model.version + 1
+
+    return update(model).where(model.id == bindparam("where_id")).values(values).returning(*columns)
+
+
+@cache
+def order_update(fields: Shape) -> Update:
+    return _update(OrderORM, ORDER_COLUMNS, fields, versioned=True)
+
+
+@cache
+def user_update(fields: Shape) -> Update:
+    return _update(UserORM, USER_COLUMNS, fields)
+
+
+@cache
+def product_update(fields: Shape) -> Update:
+    return _update(ProductORM, PRODUCT_COLUMNS, fields, versioned=True)
+
+
+@cache
+def order_get(fields: Shape) -> Select[Any]:
+    return select(*_project(ORDER_COLUMNS, fields, ORDER_KEY_FIELDS)).where(OrderORM.id == bindparam("id"))
+
+
+@cache
+def user_get(fields: Shape) -> Select[Any]:
+    return select(*_project(USER_COLUMNS, fields, USER_KEY_FIELDS)).where(UserORM.id == bindparam("id"))
+
+
+@cache
+def product_get(fields: Shape) -> Select[Any]:
+    return select(*_project(PRODUCT_COLUMNS, fields, PRODUCT_KEY_FIELDS)).where(ProductORM.id == bindparam("id"))
+
+
+@cache
+def order_get_many(fields: Shape | None = None) -> Select[Any]:
+    columns = _project(ORDER_COLUMNS, fields, ORDER_KEY_FIELDS)
+    return select(*columns).where(OrderORM.id.in_(bindparam("ids", expanding=True)))
+
+
+@cache
+def user_get_many(fields: Shape | None = None) -> Select[Any]:
+    columns = _project(USER_COLUMNS, fields, USER_KEY_FIELDS)
+    return select(*columns).where(UserORM.id.in_(bindparam("ids", expanding=True)))
+
+
+@cache
+def product_get_many(fields: Shape | None = None) -> Select[Any]:
+    columns = _project(PRODUCT_COLUMNS, fields, PRODUCT_KEY_FIELDS)
+    return select(*columns).where(ProductORM.id.in_(bindparam("ids", expanding=True)))
+
+
+@cache
+def order_count(shape: Shape) -> Select[Any]:
+    counter = _order_counter(shape)
+    if counter is not None:
+        return counter
+
+    return _where(select(func.count()).select_from(OrderORM), _ORDER_FILTERS, shape)
+
+
+@cache
+def order_list(shape: Shape, *, with_total: bool = False, fields: Shape | None = None) -> Select[Any]:
+    seeking = "after_id" in shape
+    columns = _project(ORDER_COLUMNS, fields, ORDER_KEY_FIELDS)
+    if with_total:
+        subquery = seeking or _order_counter(shape) is not None
+        columns = (*columns, _total_column(order_count(shape), subquery=subquery))
+
+    stmt = _where(select(*columns), _ORDER_FILTERS, shape).order_by(OrderORM.id)
+    if seeking:
+        stmt = stmt.where(OrderORM.id > bindparam("after_id"))
+
+    return _paginate(stmt, shape)
+
+
+@cache
+def user_count(shape: Shape) -> Select[Any]:
+    counter = _unfiltered_counter("users", shape, _USER_FILTERS)
+    if counter is not None:
+        return counter
+
+    return _where(select(func.count()).select_from(UserORM), _USER_FILTERS, shape)
+
+
+@cache
+def user_list(shape: Shape, *, with_total: bool = False, fields: Shape | None = None) -> Select[Any]:
+    seeking = "after_id" in shape
+    columns = _project(USER_COLUMNS, fields, USER_KEY_FIELDS)
+    if with_total:
+        subquery = seeking or _unfiltered_counter("users", shape, _USER_FILTERS) is not None
+        columns = (*columns, _total_column(user_count(shape), subquery=subquery))
+
+    stmt = _where(select(*columns), _USER_FILTERS, shape).order_by(UserORM.id)
+    if seeking:
+        stmt = stmt.where(UserORM.id > bindparam("after_id"))
+
+    return _paginate(stmt, shape)
+
+
+def _match_products(stmt: Select[Any], shape: Shape) -> Select[Any]:
+    if "match" not in shape:
+        return stmt
+
+    return stmt.join(products_fts, products_fts.c.rowid == ProductORM.id).where(
+        literal_column("products_fts").op("MATCH")(bindparam("match"))
+    )
+
+
+@cache
+def product_count(shape: Shape) -> Select[Any]:
+    counter = _unfiltered_counter("products", shape, _PRODUCT_FILTERS)
+    if counter is not None:
+        return counter
+
+    stmt = _where(select(func.count()).select_from(ProductORM), _PRODUCT_FILTERS, shape)
+    return _match_products(stmt, shape)
+
+
+@cache
+def product_list(shape: Shape, *, with_total: bool = False, fields: Shape | None = None) -> Select[Any]:
+    seeking = "after_id" in shape
+    columns = _project(PRODUCT_COLUMNS, fields, PRODUCT_KEY_FIELDS)
+    if with_total:
+        subquery = seeking or _unfiltered_counter("products", shape, _PRODUCT_FILTERS) is not None
+        columns = (*columns, _total_column(product_count(shape), subquery=subquery))
+
+    stmt = _match_products(_where(select(*columns), _PRODUCT_FILTERS, shape), shape)
+    if "match" in shape:
+        # best hits first; the name/id keys below only break ties
+        stmt = stmt.order_by(products_fts.c.rank)
+
+    if seeking:
+        # Seek past the last row of the previous page; rides ux_products_name_lower instead of OFFSET
+        stmt = stmt.where(
+            tuple_(func.lower(ProductORM.name), ProductORM.id)
+            > tuple_(func.lower(bindparam("after_name")), bindparam("after_id"))
+        )
+
+    stmt = stmt.order_by(func.lower(ProductORM.name), ProductORM.id)
+    return _paginate(stmt, shape)
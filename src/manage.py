@@ -1,9 +1,17 @@
 import asyncio
+import sys
+from pathlib import Path
+from typing import Literal
 
 import typer
 import uvicorn
 
-from infrastructure.databases.db import init_db
+from app.create_app import BOOTSTRAP_CSS_DIR, BOOTSTRAP_JS_DIR, STATIC_DIR
+from app.settings import settings
+from common.compression import precompress_tree
+from common.export import EXPORT_FORMATS, ExportFormat
+from infrastructure.databases.db import ReadSessionLocal, close_db, init_db, rebuild_counters
+from infrastructure.sqlalchemy.repositories import SQLAlchemyOrderRepository
 
 cli = typer.Typer(add_completion=False)
 
@@ -19,5 +27,51 @@ def dev(host: str = "127.0.0.1", port: int = 8000) -> None:
     uvicorn.run("asgi:application", host=host, port=port)  # A little noisy with [init_db].
 
 
+async def _export_orders(fmt: ExportFormat, user_id: int | None, output: Path | None) -> None:
+    _, _, encode = EXPORT_FORMATS[fmt]
+    sink = output.open("wb") if output else sys.stdout.buffer
+
+    try:
+        repo = SQLAlchemyOrderRepository(read_sessions=ReadSessionLocal)
+        async for chunk in encode(repo.stream_all(user_id=user_id)):
+            sink.write(chunk)
+
+    finally:
+        if output:
+            sink.close()
+        await close_db()
+
+
+@cli.command(help="Stream all orders as NDJSON or CSV (stdout unless --output)")
+def export_orders(
+    fmt: Literal["ndjson", "csv"] = typer.Option("ndjson", "--format"),  # noqa: B008
+    user_id: int | None = None,
+    output: Path | None = None,
+) -> None:
+    asyncio.run(_export_orders(fmt, user_id, output))
+
+
+async def _rebuild_counters() -> None:
+    try:
+        totals = await rebuild_counters()
+    finally:
+        await close_db()
+
+    for scope, value in sorted(totals.items()):
+        print(f"{scope}: {value}")
+
+
+@cli.command(name="rebuild-counters", help="Recount the maintained row counters behind X-Total-Count")
+def rebuild_counters_command() -> None:
+    asyncio.run(_rebuild_counters())
+
+
+@cli.command(name="precompress-static", help="Write the .br/.gz siblings served for static assets")
+def precompress_static() -> None:
+    for directory in (STATIC_DIR, BOOTSTRAP_CSS_DIR, BOOTSTRAP_JS_DIR):
+        if directory.is_dir():
+            print(f"{directory}: {precompress_tree(directory, settings.COMPRESSION_MIN_SIZE)}")
+
+
 if __name__ == "__main__":
     cli()
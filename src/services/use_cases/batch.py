@@ -0,0 +1,8 @@
+from collections.abc import Iterable, Mapping
+
+
+def in_request_order[T](ids: Iterable[int], found: Mapping[int, T]) -> tuple[list[T], list[int]]:
+    """Line ``found`` up with the requested ``ids`` (repeats once); also returns the ids that were not found."""
+    wanted = list(dict.fromkeys(ids))
+
+    return [found[i] for i in wanted if i in found], [i for i in wanted if i not in found]
@@ -1,13 +1,17 @@
-from collections.abc import Callable
+import asyncio
+from collections.abc import AsyncIterator, Callable, Collection, Mapping, Sequence
 from typing import final
 
 import falcon
 
-from domain.orders.entities import Order
+from domain.orders.entities import Order, OrderItem
 from domain.orders.repositories import AbstractOrderRepository
+from domain.pagination import CountMode
 from infrastructure.databases.unit_of_work import UnitOfWork
 from services.use_cases import BaseUseCase
 from services.use_cases.access_control import assert_owner
+from services.use_cases.batch import in_request_order
+from services.use_cases.pagination import seek_key, split_page
 
 
 class CreateOrder:
@@ -30,25 +34,173 @@ class CreateOrder:
 
 
 @final
-class ListOrders(BaseUseCase[AbstractOrderRepository]):
-    async def __call__(self, user_id: int | None = None, page: int = 1, per_page: int = 20) -> tuple[list[Order], int]:
-        offset = (page - 1) * per_page
+class CheckoutOrder:
+    """Order placed from product lines: priced from the catalog, with the stock reserved in the same UoW."""
+
+    def __init__(self, uow_factory: Callable[[], UnitOfWork]) -> None:
+        self._uow_factory = uow_factory
+
+    async def __call__(self, user_id: int, quantities: Mapping[int, int]) -> tuple[Order, list[OrderItem]]:
+        async with self._uow_factory() as uow:
+            assert uow.users is not None, "UnitOfWork.users not initialized"
+            assert uow.products is not None, "UnitOfWork.products not initialized"
+            assert uow.orders is not None, "UnitOfWork.orders not initialized"
+
+            if await uow.users.get(user_id) is None:
+                raise falcon.HTTPNotFound(description="User not found")
+
+            prices = await uow.products.get_prices(quantities.keys())
+            missing = sorted(quantities.keys() - prices.keys())
+            if missing:
+                raise falcon.HTTPNotFound(description=f"Products not found: {', '.join(map(str, missing))}")
 
-        if user_id is None:
-            items = list(await self._repo.list_all(offset=offset, limit=per_page))
-            total = await self._repo.count_all()
+            if not await uow.products.reserve_stock(quantities):
+                raise falcon.HTTPConflict(description="Insufficient stock")
 
-        else:
-            items = list(await self._repo.list_for_user(user_id, offset=offset, limit=per_page))
-            total = await self._repo.count_for_user(user_id)
+            items = [OrderItem(product_id=pid, quantity=qty, unit_price=prices[pid]) for pid, qty in quantities.items()]
+            total = round(sum(item.quantity * item.unit_price for item in items), 2)
 
-        return items, total
+            order = await uow.orders.add(Order(id=None, user_id=user_id, total_price=total))
+            assert order.id is not None
+            await uow.orders.add_items(order.id, items)
+
+            return order, items
+
+
+@final
+class GroupCommitCreateOrder:
+    """Drop-in for :class:`CreateOrder` that shares one transaction between concurrent callers.
+
+    Calls arriving within ``window_ms`` of the first pending one, up to ``max_batch`` of them, are
+    inserted together and committed once. Each caller still gets its own ``Order`` or its own error:
+    a batch whose transaction fails is replayed one caller at a time, so only the culprit sees it.
+    """
+
+    def __init__(self, uow_factory: Callable[[], UnitOfWork], window_ms: float, max_batch: int) -> None:
+        self._uow_factory = uow_factory
+        self._window = window_ms / 1000
+        self._max_batch = max_batch
+        self._pending: list[tuple[Order, asyncio.Future[Order]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task[None]] = set()
+
+    async def __call__(self, user_id: int, total: float) -> Order:
+        if UnitOfWork.in_shared():
+            # already inside someone's transaction: there is nothing to group, and the flush could not join it
+            return await CreateOrder(self._uow_factory)(user_id, total)
+
+        loop = asyncio.get_running_loop()
+        created: asyncio.Future[Order] = loop.create_future()
+        self._pending.append((Order(id=None, user_id=user_id, total_price=total), created))
+
+        if len(self._pending) >= self._max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._start_flush)
+
+        return await created
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[tuple[Order, asyncio.Future[Order]]]) -> None:
+        batch = [(order, created) for order, created in batch if not created.cancelled()]
+        try:
+            async with self._uow_factory() as uow:
+                assert uow.users is not None, "UnitOfWork.users not initialized"
+                assert uow.orders is not None, "UnitOfWork.orders not initialized"
+
+                known = (await uow.users.get_many({o.user_id for o, _ in batch})).keys()
+                accepted = [(order, created) for order, created in batch if order.user_id in known]
+                orders = await uow.orders.add_many([order for order, _ in accepted]) if accepted else []
+
+        except Exception as exc:  # noqa: BLE001
+            if len(batch) > 1:
+                # the shared transaction rolled back for everyone; find out whose call it was
+                await self._replay(batch)
+            elif batch and not batch[0][1].done():
+                batch[0][1].set_exception(exc)
+            return
+
+        # results are handed out only once the transaction has committed
+        for (_, created), order in zip(accepted, orders, strict=True):
+            if not created.done():
+                created.set_result(order)
+
+        for order, created in batch:
+            if order.user_id not in known and not created.done():
+                created.set_exception(falcon.HTTPNotFound(description="User not found"))
+
+    async def _replay(self, batch: list[tuple[Order, asyncio.Future[Order]]]) -> None:
+        create = CreateOrder(self._uow_factory)
+        for order, created in batch:
+            if created.done():
+                continue
+
+            try:
+                result = await create(order.user_id, order.total_price)
+            except Exception as exc:  # noqa: BLE001
+                if not created.done():
+                    created.set_exception(exc)
+            else:
+                if not created.done():
+                    created.set_result(result)
+
+
+@final
+class ListOrders(BaseUseCase[AbstractOrderRepository]):
+    async def __call__(  # noqa: PLR0913, PLR0917
+        self,
+        user_id: int | None = None,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: str | None = None,
+        count: CountMode = "exact",
+        fields: Collection[str] | None = None,
+    ) -> tuple[list[Order], int | None, str | None, CountMode]:
+        after_id = seek_key(cursor, int)[0] if cursor else None
+        offset = 0 if after_id is not None else (page - 1) * per_page
+
+        rows, total, count_mode = await self._repo.list_page(
+            user_id=user_id, offset=offset, limit=per_page + 1, after_id=after_id, count=count, fields=fields
+        )
+        items, next_cursor = split_page(rows, per_page, lambda o: (o.id,))
+
+        return items, total, next_cursor, count_mode
+
+
+@final
+class ExportOrders(BaseUseCase[AbstractOrderRepository]):
+    def __call__(self, user_id: int | None = None, fields: Collection[str] | None = None) -> AsyncIterator[list[Order]]:
+        return self._repo.stream_all(user_id=user_id, fields=fields)
 
 
 @final
 class GetOrder(BaseUseCase[AbstractOrderRepository]):
-    async def __call__(self, order_id: int) -> Order | None:
-        return await self._repo.get(order_id)
+    async def __call__(self, order_id: int, fields: Collection[str] | None = None) -> Order | None:
+        return await self._repo.get(order_id, fields=fields)
+
+
+@final
+class GetOrdersByIds(BaseUseCase[AbstractOrderRepository]):
+    async def __call__(
+        self, order_ids: Sequence[int], fields: Collection[str] | None = None
+    ) -> tuple[list[Order], list[int]]:
+        """The orders in ``order_ids`` order, from one batched read, plus the ids that don't exist."""
+        return in_request_order(order_ids, await self._repo.get_many(order_ids, fields=fields))
+
+
+@final
+class GetOrderVersion(BaseUseCase[AbstractOrderRepository]):
+    async def __call__(self, order_id: int) -> int | None:
+        return await self._repo.get_version(order_id)
 
 
 @final
@@ -73,15 +225,15 @@ class UpdateOrderFields:
     def __init__(self, uow_factory: Callable[[], UnitOfWork]) -> None:
         self._uow_factory = uow_factory
 
-    async def __call__(self, order_id: int, total_price: float | None) -> None:
+    async def __call__(self, order_id: int, total_price: float | None) -> Order:
         if total_price is None:
             raise ValueError("total_price is required.")  # noqa: EM101, TRY003
 
         async with self._uow_factory() as uow:
             assert uow.orders is not None
 
-            order = await uow.orders.get(order_id)
+            order = await uow.orders.update_fields(order_id, total_price=total_price)
             if order is None:
                 raise falcon.HTTPNotFound(description="Order not found")
 
-            await uow.orders.update_total(order_id, total_price)
+            return order
@@ -0,0 +1,29 @@
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import falcon
+
+from common.cursor import decode_cursor, encode_cursor
+
+
+def seek_key(cursor: str, *types: type) -> tuple[Any, ...]:
+    """Decode a client-supplied cursor into a typed seek key, or answer 400."""  # noqa: DOC501
+    try:
+        values = decode_cursor(cursor)
+
+    except ValueError:
+        raise falcon.HTTPBadRequest(description="Invalid cursor") from None
+
+    if len(values) != len(types) or not all(type(v) is t for v, t in zip(values, types, strict=True)):
+        raise falcon.HTTPBadRequest(description="Invalid cursor")
+
+    return tuple(values)
+
+
+def split_page[T](rows: Sequence[T], per_page: int, key: Callable[[T], tuple[Any, ...]]) -> tuple[list[T], str | None]:
+    """Trim a ``per_page + 1`` look-ahead fetch and build the cursor for the next page, if there is one."""
+    items = list(rows[:per_page])
+    if len(rows) <= per_page:
+        return items, None
+
+    return items, encode_cursor(*key(items[-1]))
@@ -1,12 +1,37 @@
-from collections.abc import Callable
-from typing import final
+from collections.abc import AsyncIterator, Callable, Collection, Sequence
+from dataclasses import dataclass
+from typing import Literal, final
 
 import falcon
 
+from domain.pagination import CountMode
 from domain.products.entities import Product
 from domain.products.repositories import AbstractProductRepository
 from infrastructure.databases.unit_of_work import UnitOfWork
 from services.use_cases import BaseUseCase
+from services.use_cases.batch import in_request_order
+from services.use_cases.pagination import seek_key, split_page
+
+type BulkStatus = Literal["created", "conflict", "invalid"]
+
+
+@final
+@dataclass(frozen=True, slots=True)
+class BulkResult:
+    status: BulkStatus
+    product: Product | None = None
+    error: str | None = None
+
+
+def _check_fields(name: str, price: float, stock: int) -> None:
+    if not name or not name.strip():
+        raise ValueError("name must be at least 1 character")  # noqa: EM101, TRY003
+
+    if price < 0:
+        raise ValueError("price must be ≥ 0")  # noqa: EM101, TRY003
+
+    if stock < 0:
+        raise ValueError("stock must be ≥ 0")  # noqa: EM101, TRY003
 
 
 @final
@@ -19,14 +44,7 @@ class CreateProduct:
     async def __call__(
         self, name: str, description: str, price: float, stock: int, owner_id: int | None = None
     ) -> Product:
-        if not name or not name.strip():
-            raise ValueError("name must be at least 1 character")  # noqa: EM101, TRY003
-
-        if price < 0:
-            raise ValueError("price must be ≥ 0")  # noqa: EM101, TRY003
-
-        if stock < 0:
-            raise ValueError("stock must be ≥ 0")  # noqa: EM101, TRY003
+        _check_fields(name, price, stock)
 
         async with self._uow_factory() as uow:
             assert uow.products is not None, "UnitOfWork.products not initialised"
@@ -36,41 +54,112 @@ class CreateProduct:
             )
 
 
+@final
+class BulkCreateProducts:
+    def __init__(self, uow_factory: Callable[[], UnitOfWork]) -> None:
+        self._uow_factory = uow_factory
+
+    async def __call__(self, products: Sequence[Product]) -> list[BulkResult]:
+        """Insert every valid product in one transaction; the results line up with ``products``."""
+        results: list[BulkResult | None] = [None] * len(products)
+        valid: list[int] = []
+
+        for i, p in enumerate(products):
+            try:
+                _check_fields(p.name, p.price, p.stock)
+
+            except ValueError as exc:
+                results[i] = BulkResult("invalid", error=str(exc))
+
+            else:
+                valid.append(i)
+
+        async with self._uow_factory() as uow:
+            assert uow.products is not None, "UnitOfWork.products not initialised"
+
+            created = await uow.products.add_many([products[i] for i in valid])
+
+        for i, product in zip(valid, created, strict=True):
+            results[i] = (
+                BulkResult("created", product=product)
+                if product is not None
+                else BulkResult("conflict", error="Duplicate product name")
+            )
+
+        return results  # pyright:ignore[reportReturnType] # every slot is filled by now
+
+
 @final
 class ListProducts(BaseUseCase[AbstractProductRepository]):
-    async def __call__(
+    async def __call__(  # noqa: PLR0913, PLR0917
         self,
         page: int = 1,
         per_page: int = 20,
         name_contains: str | None = None,
         min_price: float | None = None,
         max_price: float | None = None,
-    ) -> tuple[list[Product], int]:
-        offset = (page - 1) * per_page
-
-        items = list(
-            await self._repo.list_all(
-                offset=offset,
-                limit=per_page,
-                name_contains=name_contains,
-                min_price=min_price,
-                max_price=max_price,
-            )
-        )
-
-        total = await self._repo.count_all(
+        cursor: str | None = None,
+        q: str | None = None,
+        count: CountMode = "exact",
+        fields: Collection[str] | None = None,
+    ) -> tuple[list[Product], int | None, str | None, CountMode]:
+        if q and cursor:
+            # ranked results have no stable seek key
+            raise falcon.HTTPBadRequest(description="'cursor' cannot be combined with full-text search ('q')")
+
+        after = seek_key(cursor, str, int) if cursor else None
+        offset = 0 if after else (page - 1) * per_page
+
+        rows, total, count_mode = await self._repo.list_page(
+            offset=offset,
+            limit=per_page + 1,
             name_contains=name_contains,
             min_price=min_price,
             max_price=max_price,
+            after=after,
+            q=q,
+            count=count,
+            fields=fields,
         )
+        items, next_cursor = split_page(rows, per_page, lambda p: (p.name, p.id))
 
-        return items, total
+        return items, total, None if q else next_cursor, count_mode
+
+
+@final
+class ExportProducts(BaseUseCase[AbstractProductRepository]):
+    def __call__(  # noqa: PLR0913, PLR0917
+        self,
+        name_contains: str | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        q: str | None = None,
+        fields: Collection[str] | None = None,
+    ) -> AsyncIterator[list[Product]]:
+        return self._repo.stream_all(
+            name_contains=name_contains, min_price=min_price, max_price=max_price, q=q, fields=fields
+        )
 
 
 @final
 class GetProduct(BaseUseCase[AbstractProductRepository]):
-    async def __call__(self, product_id: int) -> Product | None:
-        return await self._repo.get(product_id)
+    async def __call__(self, product_id: int, fields: Collection[str] | None = None) -> Product | None:
+        return await self._repo.get(product_id, fields=fields)
+
+
+@final
+class GetProductsByIds(BaseUseCase[AbstractProductRepository]):
+    async def __call__(
+        self, product_ids: Sequence[int], fields: Collection[str] | None = None
+    ) -> tuple[list[Product], list[int]]:
+        """The products in ``product_ids`` order, from one batched read, plus the ids that don't exist."""
+        return in_request_order(product_ids, await self._repo.get_many(product_ids, fields=fields))
+
+
+@final
+class GetProductVersion(BaseUseCase[AbstractProductRepository]):
+    async def __call__(self, product_id: int) -> int | None:
+        return await self._repo.get_version(product_id)
 
 
 @final
@@ -80,7 +169,12 @@ class DeleteProduct:
 
     async def __call__(self, product_id: int) -> None:
         async with self._uow_factory() as uow:
+            assert uow.orders is not None
             assert uow.products is not None
+
+            # the RESTRICT foreign key refuses it anyway; checking first turns that into a readable 409
+            if await uow.orders.references_product(product_id):
+                raise falcon.HTTPConflict(title="Cannot delete product — orders still reference it.")
             await uow.products.delete(product_id)
 
 
@@ -89,20 +183,16 @@ class UpdateProductFields:
     def __init__(self, uow_factory: Callable[[], UnitOfWork]) -> None:
         self._uow_factory = uow_factory
 
-    async def __call__(self, product_id: int, price: float | None, stock: int | None) -> None:
+    async def __call__(self, product_id: int, price: float | None, stock: int | None) -> Product:
         if price is None and stock is None:
             raise ValueError("At least one of 'price' or 'stock' must be provided")  # noqa: EM101, TRY003
 
         async with self._uow_factory() as uow:
             assert uow.products is not None
 
-            existing = await uow.products.get(product_id)
+            updated = await uow.products.update_fields(product_id, price=price, stock=stock)
 
-            if existing is None:
+            if updated is None:
                 raise falcon.HTTPNotFound(description="Product not found")
 
-            if price is not None:
-                await uow.products.update_price(product_id, price)
-
-            if stock is not None:
-                await uow.products.update_stock(product_id, stock)
+            return updated
@@ -1,4 +1,4 @@
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable, Collection, Sequence
 from typing import final
 
 import falcon
@@ -6,10 +6,13 @@ from falcon import HTTPConflict
 from sqlalchemy.exc import IntegrityError
 
 from common.utils import hash_password
+from domain.pagination import CountMode
 from domain.users.entities import User
 from domain.users.repositories import AbstractUserRepository
 from infrastructure.databases.unit_of_work import UnitOfWork
 from services.use_cases import BaseUseCase
+from services.use_cases.batch import in_request_order
+from services.use_cases.pagination import seek_key, split_page
 
 
 @final
@@ -36,33 +39,57 @@ class RegisterUser:
 
 @final
 class ListUsers(BaseUseCase[AbstractUserRepository]):
-    async def __call__(
+    async def __call__(  # noqa: PLR0913, PLR0917
         self,
         page: int = 1,
         per_page: int = 20,
         username_contains: str | None = None,
         email_contains: str | None = None,
-    ) -> tuple[list[User], int]:
-        offset = (page - 1) * per_page
-
-        items = list(
-            await self._repo.list_all(
-                offset=offset,
-                limit=per_page,
-                username_contains=username_contains,
-                email_contains=email_contains,
-            )
+        cursor: str | None = None,
+        count: CountMode = "exact",
+        fields: Collection[str] | None = None,
+    ) -> tuple[list[User], int | None, str | None, CountMode]:
+        after_id = seek_key(cursor, int)[0] if cursor else None
+        offset = 0 if after_id is not None else (page - 1) * per_page
+
+        rows, total, count_mode = await self._repo.list_page(
+            offset=offset,
+            limit=per_page + 1,
+            username_contains=username_contains,
+            email_contains=email_contains,
+            after_id=after_id,
+            count=count,
+            fields=fields,
         )
+        items, next_cursor = split_page(rows, per_page, lambda u: (u.id,))
+
+        return items, total, next_cursor, count_mode
 
-        total = await self._repo.count_all(username_contains=username_contains, email_contains=email_contains)
 
-        return items, total
+@final
+class ExportUsers(BaseUseCase[AbstractUserRepository]):
+    def __call__(
+        self,
+        username_contains: str | None = None,
+        email_contains: str | None = None,
+        fields: Collection[str] | None = None,
+    ) -> AsyncIterator[list[User]]:
+        return self._repo.stream_all(username_contains=username_contains, email_contains=email_contains, fields=fields)
 
 
 @final
 class GetUser(BaseUseCase[AbstractUserRepository]):
-    async def __call__(self, user_id: int) -> User | None:
-        return await self._repo.get(user_id)
+    async def __call__(self, user_id: int, fields: Collection[str] | None = None) -> User | None:
+        return await self._repo.get(user_id, fields=fields)
+
+
+@final
+class GetUsersByIds(BaseUseCase[AbstractUserRepository]):
+    async def __call__(
+        self, user_ids: Sequence[int], fields: Collection[str] | None = None
+    ) -> tuple[list[User], list[int]]:
+        """The users in ``user_ids`` order, from one batched read, plus the ids that don't exist."""
+        return in_request_order(user_ids, await self._repo.get_many(user_ids, fields=fields))
 
 
 @final
@@ -70,23 +97,19 @@ class UpdateUserFields:
     def __init__(self, uow_factory: Callable[[], UnitOfWork]) -> None:
         self._uow_factory = uow_factory
 
-    async def __call__(self, user_id: int, username: str | None = None, email: str | None = None) -> None:
+    async def __call__(self, user_id: int, username: str | None = None, email: str | None = None) -> User:
         if username is None and email is None:
             raise ValueError("At least one of 'username' or 'email' must be provided")  # noqa: EM101, TRY003
 
         async with self._uow_factory() as uow:
             assert uow.users is not None
 
-            existing = await uow.users.get(user_id)
+            updated = await uow.users.update_fields(user_id, username=username, email=email)
 
-            if existing is None:
+            if updated is None:
                 raise falcon.HTTPNotFound(description="User not found")
 
-            if username is not None:
-                await uow.users.update_username(user_id, username)
-
-            if email is not None:
-                await uow.users.update_email(user_id, email)
+            return updated
 
 
 class DeleteUser:
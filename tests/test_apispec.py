@@ -2,19 +2,24 @@ import pytest
 from httpx import AsyncClient
 
 EXPECTED = {
-    ("/orders", "get"): {"200", "400"},
+    ("/batch", "post"): {"200", "400"},
+    ("/orders", "get"): {"200", "304", "400"},
     ("/orders", "post"): {"201", "400", "404"},
-    ("/orders/{order_id}", "get"): {"200", "400", "404"},
-    ("/orders/{order_id}", "patch"): {"204", "400", "404"},
+    ("/orders/export", "get"): {"200", "400"},
+    ("/orders/checkout", "post"): {"201", "400", "404", "409"},
+    ("/orders/{order_id}", "get"): {"200", "304", "400", "404"},
+    ("/orders/{order_id}", "patch"): {"200", "204", "400", "404"},
     ("/orders/{order_id}", "delete"): {"204", "400", "404", "403"},
-    ("/products", "get"): {"200", "400"},
+    ("/products", "get"): {"200", "304", "400"},
     ("/products", "post"): {"201", "400"},
-    ("/products/{product_id}", "get"): {"200", "400", "404"},
-    ("/products/{product_id}", "patch"): {"204", "400", "404"},
-    ("/products/{product_id}", "delete"): {"204", "400", "404"},
+    ("/products/bulk", "post"): {"200", "400", "413"},
+    ("/products/{product_id}", "get"): {"200", "304", "400", "404"},
+    ("/products/{product_id}", "patch"): {"200", "204", "400", "404"},
+    ("/products/{product_id}", "delete"): {"204", "400", "404", "409"},
     ("/users", "get"): {"200", "400"},
     ("/users", "post"): {"201", "400"},
     ("/users/{user_id}", "get"): {"200", "400", "404"},
+    ("/users/{user_id}", "patch"): {"200", "204", "400", "404"},
     ("/users/{user_id}", "delete"): {"204", "400", "404", "409"},
 }
 
@@ -0,0 +1,66 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_reads_and_writes_in_one_call(async_client: AsyncClient, auth_token: str):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    payload = {"name": "Multiplexed Lamp", "description": "", "price": 40.0, "stock": 2}
+    product_id = (await async_client.post("/products", json=payload, headers=headers)).json()["id"]
+
+    resp = await async_client.post(
+        "/batch",
+        json={
+            "requests": [
+                {"method": "GET", "path": f"/products/{product_id}?fields=id,price"},
+                {
+                    "method": "PATCH",
+                    "path": f"/products/{product_id}",
+                    "body": {"price": 35.0},
+                    "headers": {"Prefer": "return=representation"},
+                },
+                {"method": "POST", "path": "/products", "body": {"name": "Multiplexed Shade", "price": 5, "stock": 1}},
+                {"method": "GET", "path": "/products/999999"},
+                {"method": "GET", "path": "/nowhere"},
+                {"method": "GET", "path": "/products?per_page=0"},
+            ],
+            # the in-memory test database is one StaticPool connection, shared reads would trip its pool stats
+            "concurrent_reads": False,
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    read, patched, created, missing, unrouted, invalid = resp.json()
+
+    assert read["status"] == 200
+    assert read["body"] == {"id": product_id, "price": 40.0}  # reads see the database as of before the writes
+    assert read["headers"]["etag"]
+    assert (patched["status"], patched["body"]["price"]) == (200, 35.0)
+    assert created["status"] == 201
+    assert [missing["status"], unrouted["status"], invalid["status"]] == [404, 404, 400]
+
+    after = await async_client.get(f"/products/{product_id}", headers=headers)
+    assert after.json()["price"] == 35.0
+
+
+@pytest.mark.asyncio
+async def test_batch_rolls_back_every_write_when_one_fails(async_client: AsyncClient, auth_token: str):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+
+    resp = await async_client.post(
+        "/batch",
+        json={
+            "requests": [
+                {"method": "POST", "path": "/products", "body": {"name": "Unborn Vase", "price": 1, "stock": 1}},
+                {"method": "PATCH", "path": "/products/999999", "body": {"stock": 3}},
+            ]
+        },
+        headers=headers,
+    )
+    assert [r["status"] for r in resp.json()] == [424, 404]
+
+    found = await async_client.get("/products?name_contains=Unborn Vase", headers=headers)
+    assert found.json() == []
+
+    unauthenticated = await async_client.post("/batch", json={"requests": [{"method": "GET", "path": "/users"}]})
+    assert unauthenticated.status_code == 401
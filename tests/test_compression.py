@@ -0,0 +1,79 @@
+import gzip
+import os
+from pathlib import Path
+
+import falcon.testing
+import pytest
+from httpx import AsyncClient
+
+from api.static import App
+from common.compression import CODECS, negotiate, precompress_tree
+
+
+def test_negotiate_follows_q_values_then_server_preference():
+    offered = ("br", "gzip")
+
+    assert negotiate("gzip, br", offered) == "br"
+    assert negotiate("gzip;q=1, br;q=0.5", offered) == "gzip"
+    assert negotiate("br;q=0, *", offered) == "gzip"
+    assert negotiate("identity", offered) is None
+    assert negotiate(None, offered) is None
+
+
+@pytest.mark.asyncio
+async def test_large_json_is_gzipped_small_json_is_not(async_client: AsyncClient, auth_token: str):
+    headers = {"Authorization": f"Bearer {auth_token}", "Accept-Encoding": "gzip"}
+    for i in range(20):
+        payload = {"name": f"Squeezed Lamp {i}", "description": "x" * 40, "price": 1.0, "stock": 1}
+        _ = await async_client.post("/products", json=payload, headers=headers)
+
+    resp = await async_client.get("/products?name_contains=Squeezed Lamp&per_page=20", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert resp.headers["ETag"].startswith('W/"')
+    assert len(resp.json()) == 20  # decoded by httpx
+
+    small = await async_client.get("/products?name_contains=Squeezed Lamp&per_page=1", headers=headers)
+    assert "Content-Encoding" not in small.headers
+
+
+def test_static_route_serves_the_precompressed_sibling(tmp_path: Path):
+    source = tmp_path / "app.js"
+    _ = source.write_text("console.log('hello');\n" * 200)
+    assert precompress_tree(tmp_path, min_size=1_024) == len(CODECS)
+    assert precompress_tree(tmp_path, min_size=1_024) == 0  # the siblings are up to date
+
+    app = App()
+    app.add_static_route("/static", str(tmp_path))
+    client = falcon.testing.TestClient(app)
+
+    packed = client.simulate_get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert packed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(packed.content) == source.read_bytes()
+
+    plain = client.simulate_get("/static/app.js")
+    assert "Content-Encoding" not in plain.headers
+    assert plain.content == source.read_bytes()
+    assert plain.headers["Vary"] == "Accept-Encoding"
+
+
+def test_stale_siblings_are_neither_served_nor_kept(tmp_path: Path):
+    source = tmp_path / "app.css"
+    _ = source.write_text("body { margin: 0; }\n" * 200)
+    _ = precompress_tree(tmp_path, min_size=1_024)
+    sibling = tmp_path / "app.css.gz"
+
+    # edited under a running server: the old sibling no longer matches the file
+    _ = source.write_bytes(os.urandom(4_096))
+    os.utime(source, (sibling.stat().st_mtime + 10,) * 2)
+
+    app = App()
+    app.add_static_route("/static", str(tmp_path))
+    resp = falcon.testing.TestClient(app).simulate_get("/static/app.css", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in resp.headers
+    assert resp.content == source.read_bytes()
+
+    # random bytes don't compress, so the rebuild writes nothing and drops the stale sibling
+    assert precompress_tree(tmp_path, min_size=1_024) == 0
+    assert not sibling.exists()
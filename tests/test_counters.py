@@ -0,0 +1,57 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+
+from domain.orders.entities import Order
+from infrastructure.databases.db import AsyncSessionLocal, rebuild_counters
+from infrastructure.databases.unit_of_work import UnitOfWork
+from infrastructure.sqlalchemy.models import Counter
+from infrastructure.sqlalchemy.models import Order as OrderORM
+from infrastructure.sqlalchemy.repositories import SQLAlchemyOrderRepository
+
+
+async def _actual_orders(user_id: int | None = None) -> int:
+    stmt = select(func.count()).select_from(OrderORM)
+    if user_id is not None:
+        stmt = stmt.where(OrderORM.user_id == user_id)
+
+    async with AsyncSessionLocal() as s:
+        return (await s.execute(stmt)).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_order_counters_follow_inserts_and_deletes(async_client: AsyncClient, create_user):  # noqa: ANN001  # pyright:ignore[reportUnknownParameterType, reportMissingParameterType]
+    user = await create_user("counteduser", "counted@example.com", "password123")  # pyright:ignore[reportUnknownVariableType]
+    repo = SQLAlchemyOrderRepository()
+
+    async with UnitOfWork() as uow:
+        assert uow.orders is not None
+        created = [await uow.orders.add(Order(id=None, user_id=user["id"], total_price=p)) for p in (1.0, 2.0, 3.0)]  # pyright:ignore[reportUnknownArgumentType]
+
+    async with UnitOfWork() as uow:
+        assert uow.orders is not None
+        assert created[0].id is not None
+        await uow.orders.delete(created[0].id)
+
+    assert await repo.count_for_user(user["id"]) == 2  # pyright:ignore[reportUnknownArgumentType]
+    assert await repo.count_all() == await _actual_orders()
+
+    login = await async_client.post("/login", json={"username": user["username"], "password": user["password"]})  # pyright:ignore[reportUnknownArgumentType]
+    headers = {"Authorization": f"Bearer {login.json()['token']}"}
+    resp = await async_client.get(f"/orders?user_id={user['id']}&per_page=1", headers=headers)
+    assert resp.headers["X-Total-Count"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_rebuild_counters_repairs_drift():
+    async with AsyncSessionLocal() as s:
+        _ = await s.execute(update(Counter).where(Counter.scope == "orders").values(value=999_999))
+        await s.commit()
+
+    repo = SQLAlchemyOrderRepository()
+    assert await repo.count_all() == 999_999  # the total really comes from the counter
+
+    totals = await rebuild_counters()
+
+    assert totals["orders"] == await _actual_orders()
+    assert await repo.count_all() == totals["orders"]
@@ -0,0 +1,132 @@
+import pytest
+from httpx import AsyncClient
+
+from domain.products.entities import Product
+from infrastructure.cache.entities import entity_cache
+from infrastructure.cache.responses import TaggedCache
+from infrastructure.cache.ttl_cache import TTLCache
+from infrastructure.databases.unit_of_work import UnitOfWork
+from infrastructure.sqlalchemy.repositories import SQLAlchemyProductRepository
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_evicts_lru_and_expires():
+    clock = _Clock()
+    cache: TTLCache[str, int] = TTLCache(2, ttl=10, clock=clock)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    clock.now = 11
+    assert cache.get("a") is None
+
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.evictions, stats.expirations) == (2, 2, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_product_reads_hit_cache_until_update_commits(async_client: AsyncClient, auth_token: str):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    payload = {"name": "Read-through Lamp", "description": "", "price": 10.0, "stock": 1}
+    product_id = (await async_client.post("/products", json=payload, headers=headers)).json()["id"]
+
+    _ = await async_client.get(f"/products/{product_id}", headers=headers)
+    hits_before = entity_cache.stats.hits
+    _ = await async_client.get(f"/products/{product_id}", headers=headers)
+    assert entity_cache.stats.hits == hits_before + 1
+
+    _ = await async_client.patch(f"/products/{product_id}", json={"price": 7.5}, headers=headers)
+    resp = await async_client.get(f"/products/{product_id}", headers=headers)
+    assert resp.json()["price"] == 7.5
+
+    stats = (await async_client.get("/__stats__", headers=headers)).json()["entity_cache"]
+    assert {"hits", "misses", "evictions"} <= stats.keys()
+
+
+@pytest.mark.asyncio
+async def test_row_read_before_a_committed_update_is_not_cached(
+    async_client: AsyncClient, auth_token: str, monkeypatch: pytest.MonkeyPatch
+):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    payload = {"name": "Racing Lamp", "description": "", "price": 10.0, "stock": 1}
+    product_id = (await async_client.post("/products", json=payload, headers=headers)).json()["id"]
+    entity_cache.invalidate(("product", product_id))
+
+    repo = SQLAlchemyProductRepository()
+    fetch_one = repo._fetch_one  # pyright:ignore[reportPrivateUsage]  # noqa: SLF001
+
+    async def fetch_then_commit(*args: object, **kwargs: object) -> Product | None:
+        row = await fetch_one(*args, **kwargs)  # pyright:ignore[reportArgumentType]
+        async with UnitOfWork() as uow:  # commits, and flushes its invalidations, before the fill
+            assert uow.products is not None
+            await uow.products.update_price(product_id, 7.5)
+        return row
+
+    monkeypatch.setattr(repo, "_fetch_one", fetch_then_commit)
+    stale_writes = entity_cache.stale_writes
+
+    stale = await repo.get(product_id)
+    assert stale is not None and stale.price == 10.0  # noqa: PT018
+    assert entity_cache.stale_writes == stale_writes + 1
+
+    fresh = await SQLAlchemyProductRepository().get(product_id)
+    assert fresh is not None and fresh.price == 7.5  # noqa: PT018
+
+
+def test_tagged_cache_drops_a_tag_and_refuses_stale_writes():
+    cache: TaggedCache[str] = TaggedCache(10, ttl=60)
+
+    before = cache.generation("product")
+    cache.set("product", before, "page-1", "old")
+    cache.set("user", cache.generation("user"), "page-1", "users")
+    assert cache.get("product", "page-1") == "old"
+
+    cache.invalidate("product")
+    assert cache.get("product", "page-1") is None
+    assert cache.get("user", "page-1") == "users"
+
+    # computed before the write committed: kept out of the new generation
+    cache.set("product", before, "page-1", "old")
+    assert cache.get("product", "page-1") is None
+    assert (cache.stats.invalidations, cache.stats.stale_writes) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_product_list_served_from_response_cache_until_a_write(async_client: AsyncClient, auth_token: str):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    payload = {"name": "Shelved Vase", "description": "", "price": 12.0, "stock": 6}
+    product_id = (await async_client.post("/products", json=payload, headers=headers)).json()["id"]
+
+    miss = await async_client.get("/products?per_page=5&name_contains=Shelved%20Vase", headers=headers)
+    hit = await async_client.get("/products?name_contains=Shelved%20Vase&per_page=5", headers=headers)
+    assert (miss.headers["X-Cache"], hit.headers["X-Cache"]) == ("MISS", "HIT")
+    assert hit.content == miss.content
+    assert (hit.headers["X-Total-Count"], hit.headers["ETag"]) == ("1", miss.headers["ETag"])
+    assert hit.headers["X-Request-ID"] != miss.headers["X-Request-ID"]
+
+    revalidated = await async_client.get(
+        "/products?name_contains=Shelved%20Vase&per_page=5", headers={**headers, "If-None-Match": miss.headers["ETag"]}
+    )
+    assert (revalidated.status_code, revalidated.headers["X-Cache"]) == (304, "HIT")
+
+    _ = await async_client.patch(f"/products/{product_id}", json={"stock": 5}, headers=headers)
+
+    after = await async_client.get("/products?per_page=5&name_contains=Shelved%20Vase", headers=headers)
+    assert after.headers["X-Cache"] == "MISS"
+    assert after.json()[0]["stock"] == 5
+
+    stats = (await async_client.get("/__stats__", headers=headers)).json()["response_cache"]
+    assert stats["cache"]["hits"] >= 2
+    assert stats["invalidations"] >= 1
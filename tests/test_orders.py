@@ -1,5 +1,15 @@
+import asyncio
+import csv
+import io
+import json
+
+import falcon
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.exc import IntegrityError
+
+from infrastructure.databases.unit_of_work import UnitOfWork
+from services.use_cases.orders import GroupCommitCreateOrder
 
 
 @pytest.mark.asyncio
@@ -23,3 +33,137 @@ async def test_create_list_and_delete_order(async_client: AsyncClient, create_us
 
     resp_get = await async_client.get(f"/orders/{order_id}", headers={"Authorization": f"Bearer {token}"})
     assert resp_get.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_recreated_order_never_matches_a_deleted_ones_etag(async_client: AsyncClient, create_user):  # noqa: ANN001  # pyright:ignore[reportUnknownParameterType, reportMissingParameterType]
+    user = await create_user("reuseuser", "reuse@example.com", "password123")  # pyright:ignore[reportUnknownVariableType]
+    login = await async_client.post("/login", json={"username": user["username"], "password": user["password"]})  # pyright:ignore[reportUnknownArgumentType]
+    headers = {"Authorization": f"Bearer {login.json()['token']}"}
+    payload = {"user_id": user["id"], "total_price": 3.0}  # pyright:ignore[reportUnknownVariableType]
+
+    gone = (await async_client.post("/orders", json=payload, headers=headers)).json()["id"]
+    etag = (await async_client.get(f"/orders/{gone}", headers=headers)).headers["ETag"]
+    assert (await async_client.delete(f"/orders/{gone}", headers=headers)).status_code == 204
+
+    assert (await async_client.post("/orders", json=payload, headers=headers)).json()["id"] != gone
+    stale = await async_client.get(f"/orders/{gone}", headers={**headers, "If-None-Match": etag})
+    assert stale.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_export_orders_streams_ndjson_and_csv(async_client: AsyncClient, create_user):  # noqa: ANN001  # pyright:ignore[reportUnknownParameterType, reportMissingParameterType]
+    user = await create_user("exportuser", "export@example.com", "password123")  # pyright:ignore[reportUnknownVariableType]
+    login = await async_client.post("/login", json={"username": user["username"], "password": user["password"]})  # pyright:ignore[reportUnknownArgumentType]
+    headers = {"Authorization": f"Bearer {login.json()['token']}"}
+
+    created = [
+        (await async_client.post("/orders", json={"user_id": user["id"], "total_price": p}, headers=headers)).json()  # pyright:ignore[reportUnknownArgumentType]
+        for p in (5.0, 7.5, 12.25)
+    ]
+
+    resp = await async_client.get(f"/orders/export?user_id={user['id']}", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["Content-Type"].startswith("application/x-ndjson")
+    assert "orders.ndjson" in resp.headers["Content-Disposition"]
+
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert lines == [{k: o[k] for k in ("id", "user_id", "total_price", "created_at")} for o in created]
+
+    resp_csv = await async_client.get(f"/orders/export?user_id={user['id']}&format=csv", headers=headers)
+    rows = list(csv.DictReader(io.StringIO(resp_csv.text)))
+    assert [(int(r["id"]), float(r["total_price"])) for r in rows] == [(o["id"], o["total_price"]) for o in created]
+
+    bad = await async_client.get("/orders/export?format=xml", headers=headers)
+    assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_group_commit_shares_transactions_between_callers(create_user):  # noqa: ANN001  # pyright:ignore[reportUnknownParameterType, reportMissingParameterType]
+    user = await create_user("groupuser", "group@example.com", "password123")  # pyright:ignore[reportUnknownVariableType]
+    transactions = 0
+
+    def uow_factory() -> UnitOfWork:
+        nonlocal transactions
+        transactions += 1
+        return UnitOfWork()
+
+    create = GroupCommitCreateOrder(uow_factory, window_ms=50, max_batch=4)
+    results = await asyncio.gather(
+        *(create(user["id"], float(i)) for i in range(6)),  # pyright:ignore[reportUnknownArgumentType]
+        create(999_999, 1.0),
+        return_exceptions=True,
+    )
+
+    assert transactions == 2  # four flushed on reaching max_batch, the rest when the window closed
+    orders, missing = results[:6], results[6]
+    assert [o.total_price for o in orders] == [float(i) for i in range(6)]  # pyright:ignore[reportAttributeAccessIssue]
+    assert len({o.id for o in orders}) == 6  # pyright:ignore[reportAttributeAccessIssue]
+    assert all(o.created_at is not None for o in orders)  # pyright:ignore[reportAttributeAccessIssue]
+    assert isinstance(missing, falcon.HTTPNotFound)
+
+
+@pytest.mark.asyncio
+async def test_group_commit_failure_reaches_only_its_caller(create_user):  # noqa: ANN001  # pyright:ignore[reportUnknownParameterType, reportMissingParameterType]
+    user = await create_user("replayuser", "replay@example.com", "password123")  # pyright:ignore[reportUnknownVariableType]
+
+    create = GroupCommitCreateOrder(UnitOfWork, window_ms=50, max_batch=3)
+    first, bad, last = await asyncio.gather(
+        create(user["id"], 1.0),  # pyright:ignore[reportUnknownArgumentType]
+        create(user["id"], -1.0),  # pyright:ignore[reportUnknownArgumentType]  # breaks the CHECK on total_price
+        create(user["id"], 2.0),  # pyright:ignore[reportUnknownArgumentType]
+        return_exceptions=True,
+    )
+
+    assert isinstance(bad, Exception)
+    assert [first.total_price, last.total_price] == [1.0, 2.0]  # pyright:ignore[reportAttributeAccessIssue]
+    assert first.id is not None and last.id is not None  # pyright:ignore[reportAttributeAccessIssue]  # noqa: PT018
+
+
+@pytest.mark.asyncio
+async def test_checkout_prices_lines_and_reserves_stock(async_client: AsyncClient, create_user):  # noqa: ANN001  # pyright:ignore[reportUnknownParameterType, reportMissingParameterType]
+    user = await create_user("checkoutuser", "checkout@example.com", "password123")  # pyright:ignore[reportUnknownVariableType]
+    login = await async_client.post("/login", json={"username": user["username"], "password": user["password"]})  # pyright:ignore[reportUnknownArgumentType]
+    headers = {"Authorization": f"Bearer {login.json()['token']}"}
+
+    pen, pad = [
+        (await async_client.post("/products", json=p, headers=headers)).json()["id"]
+        for p in (
+            {"name": "Till Pen", "description": "", "price": 1.25, "stock": 10},
+            {"name": "Till Pad", "description": "", "price": 4.0, "stock": 3},
+        )
+    ]
+
+    lines = [{"product_id": pen, "quantity": 2}, {"product_id": pad, "quantity": 3}, {"product_id": pen, "quantity": 2}]
+    resp = await async_client.post("/orders/checkout", json={"user_id": user["id"], "items": lines}, headers=headers)  # pyright:ignore[reportUnknownArgumentType]
+    assert resp.status_code == 201
+    body = resp.json()
+    assert body["total_price"] == 17.0
+    lines_out = sorted((i["product_id"], i["quantity"], i["unit_price"]) for i in body["items"])
+    assert lines_out == [(pen, 4, 1.25), (pad, 3, 4.0)]
+
+    stock = [(await async_client.get(f"/products/{pid}", headers=headers)).json()["stock"] for pid in (pen, pad)]
+    assert stock == [6, 0]
+
+    short = await async_client.post(
+        "/orders/checkout",
+        json={"user_id": user["id"], "items": [{"product_id": pen, "quantity": 1}, {"product_id": pad, "quantity": 1}]},  # pyright:ignore[reportUnknownArgumentType]
+        headers=headers,
+    )
+    assert short.status_code == 409
+    assert (await async_client.get(f"/products/{pen}", headers=headers)).json()["stock"] == 6  # rolled back
+
+    unknown = await async_client.post(
+        "/orders/checkout",
+        json={"user_id": user["id"], "items": [{"product_id": 999_999, "quantity": 1}]},  # pyright:ignore[reportUnknownArgumentType]
+        headers=headers,
+    )
+    assert unknown.status_code == 404
+
+    assert (await async_client.delete(f"/products/{pad}", headers=headers)).status_code == 409  # still ordered
+    with pytest.raises(IntegrityError):  # the foreign key refuses it too, without the use case's check
+        async with UnitOfWork() as uow:
+            assert uow.products is not None
+            await uow.products.delete(pad)
+    assert (await async_client.delete(f"/orders/{body['id']}", headers=headers)).status_code == 204
+    assert (await async_client.delete(f"/products/{pad}", headers=headers)).status_code == 204
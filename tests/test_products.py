@@ -1,6 +1,8 @@
 import pytest
 from httpx import AsyncClient
 
+from infrastructure.sqlalchemy.statements import product_list
+
 
 @pytest.mark.asyncio
 async def test_product_crud(async_client: AsyncClient, auth_token: str):
@@ -31,6 +33,68 @@ async def test_product_crud(async_client: AsyncClient, auth_token: str):
     assert resp_del.status_code == 204
 
 
+@pytest.mark.asyncio
+async def test_patch_can_return_the_updated_product(async_client: AsyncClient, auth_token: str):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    payload = {"name": "Returning Desk", "description": "", "price": 80.0, "stock": 2}
+    product_id = (await async_client.post("/products", json=payload, headers=headers)).json()["id"]
+
+    resp = await async_client.patch(
+        f"/products/{product_id}",
+        json={"price": 70.0, "stock": 5},
+        headers={**headers, "Prefer": "return=representation"},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["Preference-Applied"] == "return=representation"
+    body = resp.json()
+    assert (body["id"], body["name"], body["price"], body["stock"]) == (product_id, "Returning Desk", 70.0, 5)
+
+    missing = await async_client.patch("/products/999999", json={"stock": 1}, headers=headers)
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_answers_304_until_the_product_changes(async_client: AsyncClient, auth_token: str):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    payload = {"name": "Validator Lamp", "description": "", "price": 30.0, "stock": 4}
+    product_id = (await async_client.post("/products", json=payload, headers=headers)).json()["id"]
+    url, page_url = f"/products/{product_id}", "/products?name_contains=Validator%20Lamp"
+
+    first = await async_client.get(url, headers=headers)
+    etag = first.headers["ETag"]
+    page_etag = (await async_client.get(page_url, headers=headers)).headers["ETag"]
+
+    cached = await async_client.get(url, headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert (await async_client.get(page_url, headers={**headers, "If-None-Match": page_etag})).status_code == 304
+
+    patched = await async_client.patch(url, json={"stock": 3}, headers=headers)
+    assert patched.headers["ETag"] != etag
+
+    fresh = await async_client.get(url, headers={**headers, "If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["stock"] == 3
+    assert fresh.headers["ETag"] == patched.headers["ETag"]
+    assert (await async_client.get(page_url, headers={**headers, "If-None-Match": page_etag})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_recreated_product_never_matches_a_deleted_ones_etag(async_client: AsyncClient, auth_token: str):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    payload = {"description": "", "price": 5.0, "stock": 1}
+    gone = (await async_client.post("/products", json={**payload, "name": "Vanishing Lamp"}, headers=headers)).json()
+    etag = (await async_client.get(f"/products/{gone['id']}", headers=headers)).headers["ETag"]
+    assert (await async_client.delete(f"/products/{gone['id']}", headers=headers)).status_code == 204
+
+    # the deleted row held the highest id, the one a plain SQLite rowid hands out next
+    new = (await async_client.post("/products", json={**payload, "name": "Vanishing Vase"}, headers=headers)).json()
+    assert new["id"] != gone["id"]
+
+    stale = await async_client.get(f"/products/{gone['id']}", headers={**headers, "If-None-Match": etag})
+    assert stale.status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_duplicate_name_case_insensitive(async_client: AsyncClient, auth_token: str):
     payload = {"name": "Unique", "description": "", "price": 1.0, "stock": 1}
@@ -53,3 +117,114 @@ async def test_product_not_found_includes_request_id(async_client: AsyncClient,
 
     assert body["error"] == "Product not found"
     assert body["request_id"] == rid
+
+
+@pytest.mark.asyncio
+async def test_full_text_search_ranks_and_matches_prefixes(async_client: AsyncClient, auth_token: str):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    for name, description in (
+        ("Zebrawood Desk", "solid zebrawood top"),
+        ("Zebra Print Mug", "ceramic"),
+        ("Plain Lamp", "desk lamp with a zebrawood base"),
+    ):
+        payload = {"name": name, "description": description, "price": 1.0, "stock": 1}
+        assert (await async_client.post("/products", json=payload, headers=headers)).status_code == 201
+
+    resp = await async_client.get("/products?q=zebraw", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["X-Total-Count"] == "2"
+    assert resp.json()[0]["name"] == "Zebrawood Desk"  # hit in name and description outranks description only
+
+    resp_and = await async_client.get("/products?q=zeb%20mug", headers=headers)
+    assert [p["name"] for p in resp_and.json()] == ["Zebra Print Mug"]
+
+    # substring search goes through the trigram index and stays case-insensitive
+    resp_sub = await async_client.get("/products?name_contains=RAWOO", headers=headers)
+    assert [p["name"] for p in resp_sub.json()] == ["Zebrawood Desk"]
+
+    # deletes keep the index in sync
+    desk_id = resp.json()[0]["id"]
+    _ = await async_client.delete(f"/products/{desk_id}", headers=headers)
+    resp_after = await async_client.get("/products?q=zebraw", headers=headers)
+    assert [p["name"] for p in resp_after.json()] == ["Plain Lamp"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_each_item(async_client: AsyncClient, auth_token: str):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    _ = await async_client.post(
+        "/products", json={"name": "Stock Taken", "description": "", "price": 1.0, "stock": 1}, headers=headers
+    )
+
+    items = [
+        {"name": "Stock Chair", "description": "oak", "price": 40.0, "stock": 3},
+        {"name": "stock chair", "description": "", "price": 1.0, "stock": 1},  # clashes with the item above
+        {"name": "STOCK TAKEN", "description": "", "price": 1.0, "stock": 1},  # clashes with the catalog
+        {"name": "Stock Table", "description": "", "price": -1, "stock": 1},
+        {"name": "Stock Table", "description": "", "price": 90.0, "stock": 1},
+    ]
+    resp = await async_client.post("/products/bulk", json=items, headers=headers)
+    assert resp.status_code == 200
+
+    body = resp.json()
+    assert (body["created"], body["conflicts"], body["invalid"]) == (2, 2, 1)
+    assert [r["status"] for r in body["results"]] == ["created", "conflict", "conflict", "invalid", "created"]
+    assert "price" in body["results"][3]["error"]
+
+    chair = await async_client.get(f"/products/{body['results'][0]['id']}", headers=headers)
+    assert chair.json()["name"] == "Stock Chair"
+
+    ndjson = (
+        b'{"name": "Stock Lamp", "price": 5, "stock": 2}\n\nnot json\n{"name": "Stock Chair", "price": 1, "stock": 1}'
+    )
+    resp_nd = await async_client.post(
+        "/products/bulk", content=ndjson, headers={**headers, "Content-Type": "application/x-ndjson"}
+    )
+    assert [r["status"] for r in resp_nd.json()["results"]] == ["created", "invalid", "conflict"]
+
+    not_array = await async_client.post("/products/bulk", json={"name": "x"}, headers=headers)
+    assert not_array.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_sparse_fieldset_narrows_the_body_and_the_select(async_client: AsyncClient, auth_token: str):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    payload = {"name": "Sparse Kettle", "description": "Only on request", "price": 21.0, "stock": 3}
+    product_id = (await async_client.post("/products", json=payload, headers=headers)).json()["id"]
+
+    page = await async_client.get("/products?name_contains=Sparse%20Kettle&fields=price,id", headers=headers)
+    assert page.json() == [{"id": product_id, "price": 21.0}]
+
+    full = await async_client.get("/products?name_contains=Sparse%20Kettle", headers=headers)
+    assert full.headers["ETag"] != page.headers["ETag"]
+
+    detail = await async_client.get(f"/products/{product_id}?fields=name", headers=headers)
+    assert detail.json() == {"name": "Sparse Kettle"}
+
+    bad = await async_client.get("/products?fields=id,owner_id", headers=headers)
+    assert bad.status_code == 400
+
+    stmt = str(product_list(frozenset({"offset"}), fields=frozenset({"price"})))
+    assert "products.description" not in stmt
+    assert "products.price" in stmt
+
+
+@pytest.mark.asyncio
+async def test_ids_lookup_keeps_request_order_and_reports_missing(async_client: AsyncClient, auth_token: str):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    ids: list[int] = []
+    for name in ("Grouped Cup", "Grouped Jug", "Grouped Pot"):
+        payload = {"name": name, "description": "", "price": 3.0, "stock": 1}
+        ids.append((await async_client.post("/products", json=payload, headers=headers)).json()["id"])
+
+    _ = await async_client.get(f"/products/{ids[1]}", headers=headers)  # one of them comes from the entity cache
+    wanted = [ids[2], 999_999, ids[0], ids[1], ids[2]]
+
+    for _attempt in range(2):  # the second one is a response cache hit
+        resp = await async_client.get(f"/products?ids={','.join(map(str, wanted))}&fields=id", headers=headers)
+        assert resp.status_code == 200
+        assert resp.json() == [{"id": ids[2]}, {"id": ids[0]}, {"id": ids[1]}]
+        assert resp.headers["X-Missing-Ids"] == "999999"
+
+    too_many = await async_client.get(f"/products?ids={','.join(map(str, range(1, 102)))}", headers=headers)
+    assert too_many.status_code == 400
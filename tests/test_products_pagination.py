@@ -1,5 +1,6 @@
 import uuid
 
+import orjson
 import pytest
 from httpx import AsyncClient
 
@@ -26,7 +27,72 @@ async def test_products_pagination_and_filter(async_client: AsyncClient, auth_to
     for item in resp_f.json():
         assert 15 <= item["price"] <= 35
 
-    resp_p = await async_client.get("/products?page=2&per_page=2", headers=headers)
+    resp_p = await async_client.get(f"/products?name_contains={prefix}_prod&page=2&per_page=2", headers=headers)
     assert resp_p.status_code == 200
     names_page2 = [p["name"] for p in resp_p.json()]
     assert names_page2 == [seeded[2]["name"], seeded[3]["name"]]
+
+
+@pytest.mark.asyncio
+async def test_products_cursor_pagination(async_client: AsyncClient, auth_token: str):
+    prefix = uuid.uuid4().hex[:6]
+    headers = {"Authorization": f"Bearer {auth_token}"}
+
+    for i in range(5):
+        payload = {"name": f"{prefix}_cur{i}", "description": "", "price": 1.0, "stock": 1}
+        resp = await async_client.post("/products", json=payload, headers=headers)
+        assert resp.status_code == 201
+
+    seen: list[str] = []
+    url = f"/products?name_contains={prefix}_cur&per_page=2"
+    while url:
+        resp = await async_client.get(url, headers=headers)
+        assert resp.status_code == 200
+        assert resp.headers["X-Total-Count"] == "5"
+        seen.extend(p["name"] for p in resp.json())
+        url = resp.links.get("next", {}).get("url")
+
+    assert seen == [f"{prefix}_cur{i}" for i in range(5)]
+
+    bad = await async_client.get("/products?cursor=not-a-cursor", headers=headers)
+    assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_products_total_survives_page_past_the_end(async_client: AsyncClient, auth_token: str):
+    prefix = uuid.uuid4().hex[:6]
+    headers = {"Authorization": f"Bearer {auth_token}"}
+
+    for i in range(3):
+        payload = {"name": f"{prefix}_tot{i}", "description": "", "price": 1.0, "stock": 1}
+        _ = await async_client.post("/products", json=payload, headers=headers)
+
+    resp = await async_client.get(f"/products?name_contains={prefix}_tot&page=1&per_page=2", headers=headers)
+    assert resp.headers["X-Total-Count"] == "3"
+
+    resp_empty = await async_client.get(f"/products?name_contains={prefix}_tot&page=9&per_page=2", headers=headers)
+    assert resp_empty.json() == []
+    assert resp_empty.headers["X-Total-Count"] == "3"
+
+
+@pytest.mark.asyncio
+async def test_products_stream_as_ndjson_past_the_page_size(async_client: AsyncClient, auth_token: str):
+    prefix = f"zz{uuid.uuid4().hex[:6]}"
+    headers = {"Authorization": f"Bearer {auth_token}"}
+
+    for i in range(3):
+        payload = {"name": f"{prefix}_prod{i}", "description": "", "price": 5, "stock": 1}
+        _ = await async_client.post("/products", json=payload, headers=headers)
+
+    url = f"/products?name_contains={prefix}&per_page=1&fields=id,name"
+    resp = await async_client.get(url, headers=headers | {"Accept": "application/x-ndjson"})
+    assert resp.status_code == 200
+    assert resp.headers["Content-Type"].startswith("application/x-ndjson")
+    assert "X-Total-Count" not in resp.headers
+
+    rows = [orjson.loads(line) for line in resp.text.splitlines()]
+    assert [r["name"] for r in rows] == [f"{prefix}_prod{i}" for i in range(3)]
+    assert all(r.keys() == {"id", "name"} for r in rows)
+
+    page = await async_client.get(url, headers=headers)  # same query, the default representation
+    assert len(page.json()) == 1
@@ -1,8 +1,14 @@
+from pathlib import Path
+
 import pytest
 from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
 
+from app.settings import settings
 from infrastructure.databases.unit_of_work import UnitOfWork
-from infrastructure.sqlalchemy.events import register_session_events
+from infrastructure.sqlalchemy.events import pool_stats, register_engine_events, register_session_events
 
 
 @pytest.mark.asyncio
@@ -19,3 +25,44 @@ async def test_after_rollback_logs(caplog):  # noqa: ANN001  # pyright:ignore[re
 
     assert "issued an unexpected ROLLBACK" in caplog.text  # pyright:ignore[reportUnknownMemberType]
     _ = logger.complete()
+
+
+@pytest.mark.asyncio
+async def test_engine_events_apply_pragmas_and_count_checkouts():
+    stats = pool_stats["primary"]
+    before = stats.checkouts
+
+    async with UnitOfWork() as uow:
+        assert uow.users is not None
+        _ = await uow.users.list_all()
+
+    assert stats.checkouts > before
+    assert stats.in_use == 0
+    assert stats.pragmas["busy_timeout"] == settings.SQLITE_BUSY_TIMEOUT_MS
+    assert stats.pragmas["temp_store"] == 2  # MEMORY
+    assert stats.pragmas["foreign_keys"] == 1
+
+
+@pytest.mark.asyncio
+async def test_query_only_engine_reads_but_refuses_writes(tmp_path: Path):
+    uri = f"sqlite+aiosqlite:///{tmp_path / 'split.db'}"
+    primary = create_async_engine(uri)
+    readonly = create_async_engine(uri)
+    stats = register_engine_events(readonly, name="test-readonly", query_only=True)
+
+    try:
+        async with primary.begin() as conn:
+            _ = await conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            _ = await conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        async with readonly.connect() as conn:
+            assert (await conn.execute(text("SELECT x FROM t"))).scalar_one() == 1
+
+            with pytest.raises(OperationalError, match="readonly"):
+                _ = await conn.execute(text("INSERT INTO t VALUES (2)"))
+
+        assert stats.pragmas["query_only"] == 1
+    finally:
+        _ = pool_stats.pop("test-readonly", None)
+        await readonly.dispose()
+        await primary.dispose()
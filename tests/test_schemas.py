@@ -1,11 +1,19 @@
 # pyright:basic
 
+from datetime import UTC, datetime
 from uuid import uuid4
 
+import orjson
 import pytest
 from httpx import AsyncClient
 
-from api.schemas.product_schemas import ProductCreate
+from api.schemas.order_schemas import OrderOut
+from api.schemas.product_schemas import ProductCreate, ProductOut
+from api.schemas.user_schemas import UserOut
+from api.serialization import dump_many
+from domain.orders.entities import Order
+from domain.products.entities import Product
+from domain.users.entities import User
 from tests.helpers.boundaries import boundary_matrix
 
 VALID_PRODUCT = {
@@ -28,3 +36,23 @@ async def test_product_boundaries(async_client: AsyncClient, case):  # noqa: ANN
 
     expected = 201 if case.expected_status == "OK" else case.expected_status
     assert resp.status_code == expected
+
+
+@pytest.mark.parametrize(
+    ("model", "items"),
+    [
+        (ProductOut, [Product(id=1, name="Mouse", description="", price=9.5, stock=3, owner_id=7)]),
+        (UserOut, [User(id=1, username="jane", email="jane@example.com", password_hash="$argon2id$...")]),
+        (
+            OrderOut,
+            [
+                Order(id=1, user_id=2, total_price=10.0, created_at=datetime(2025, 4, 22, 12, 34, 56, 789012)),
+                Order(id=2, user_id=2, total_price=0.1, created_at=datetime(2025, 4, 22, 12, 34, tzinfo=UTC)),
+            ],
+        ),
+    ],
+)
+def test_dump_many_matches_the_out_schema(model, items):  # noqa: ANN001
+    expected = orjson.dumps([model.model_validate(i).model_dump() for i in items])
+
+    assert dump_many(model, items) == expected
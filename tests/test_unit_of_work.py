@@ -1,8 +1,13 @@
+import asyncio
+
+import falcon
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from domain.users.entities import User
 from infrastructure.databases.db import AsyncSessionLocal
 from infrastructure.databases.unit_of_work import UnitOfWork
+from infrastructure.databases.write_serializer import WriteSerializer
 from infrastructure.sqlalchemy.repositories import SQLAlchemyUserRepository
 
 
@@ -22,6 +27,20 @@ async def test_uow_commits_changes():
         assert fetched.username == "uow_user"
 
 
+@pytest.mark.asyncio
+async def test_session_bound_counts_read_their_own_session():
+    def no_read_sessions() -> AsyncSession:
+        raise AssertionError("a session-bound repository must not open a read session")
+
+    async with AsyncSessionLocal() as sess, sess.begin():
+        repo = SQLAlchemyUserRepository(session=sess, read_sessions=no_read_sessions)  # pyright:ignore[reportArgumentType]
+
+        before = await repo.count_all(username_contains="uow_counted")
+        _ = await repo.add(User(id=None, username="uow_counted", email="counted@example.com", password_hash="x"))  # noqa: S106
+        assert await repo.count_all(username_contains="uow_counted") == before + 1
+        await sess.rollback()
+
+
 @pytest.mark.asyncio
 async def test_uow_rolls_back_on_error():
     with pytest.raises(ValueError):  # noqa: PT011, PT012
@@ -35,3 +54,69 @@ async def test_uow_rolls_back_on_error():
         repo = SQLAlchemyUserRepository(session=verify_sess)
         none_user = await repo.get_by_username("will_fail")
         assert none_user is None
+
+
+@pytest.mark.asyncio
+async def test_uows_inside_shared_commit_or_roll_back_together():
+    with pytest.raises(ValueError):  # noqa: PT011, PT012
+        async with UnitOfWork.shared() as shared:
+            async with UnitOfWork() as inner:
+                assert inner.users is shared.users
+                assert inner.users is not None
+                joined = User(id=None, username="joined_user", email="joined@example.com", password_hash="x")  # noqa: S106
+                _ = await inner.users.add(joined)
+
+            assert UnitOfWork.in_shared()
+            raise ValueError("Force rollback")  # noqa: EM101, TRY003
+
+    assert not UnitOfWork.in_shared()
+    async with AsyncSessionLocal() as verify_sess:
+        repo = SQLAlchemyUserRepository(session=verify_sess)
+        assert await repo.get_by_username("joined_user") is None
+
+
+@pytest.mark.asyncio
+async def test_write_serializer_runs_uows_one_at_a_time():
+    writer = WriteSerializer(AsyncSessionLocal, max_depth=50)
+    active = 0
+    overlap = 0
+
+    async def register(i: int) -> None:
+        nonlocal active, overlap
+        async with UnitOfWork(writer) as uow:
+            assert uow.users is not None
+
+            active += 1
+            overlap = max(overlap, active)
+            _ = await uow.users.add(User(id=None, username=f"queued_{i}", email=f"q{i}@example.com", password_hash="x"))  # noqa: S106
+            active -= 1
+
+    _ = await asyncio.gather(*(register(i) for i in range(10)))
+    await writer.close()
+
+    assert overlap == 1
+    assert writer.stats.granted == 10
+    assert writer.stats.peak_depth > 1
+    assert writer.stats.depth == 0
+
+    async with AsyncSessionLocal() as verify_sess:
+        assert await SQLAlchemyUserRepository(session=verify_sess).get_by_username("queued_9") is not None
+
+
+@pytest.mark.asyncio
+async def test_write_serializer_rejects_beyond_max_depth():
+    writer = WriteSerializer(AsyncSessionLocal, max_depth=1)
+
+    await writer.acquire()  # holds the writer
+    waiting = asyncio.create_task(writer.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(falcon.HTTPServiceUnavailable):
+        await writer.acquire()
+
+    writer.release()
+    await waiting
+    writer.release()
+    await writer.close()
+
+    assert (writer.stats.granted, writer.stats.rejected) == (2, 1)
@@ -101,3 +101,11 @@ async def test_patch_user_updates_username_and_email(async_client: AsyncClient,
     body3 = get3.json()
     assert body3["username"] == final_username
     assert body3["email"] == final_email
+
+    resp4 = await async_client.patch(
+        f"/users/{user_id}",
+        json={"email": "returned@example.com"},
+        headers={"Authorization": f"Bearer {auth_token}", "Prefer": "return=representation"},
+    )
+    assert resp4.status_code == 200
+    assert (resp4.json()["username"], resp4.json()["email"]) == (final_username, "returned@example.com")
@@ -3,6 +3,8 @@ import uuid
 import pytest
 from httpx import AsyncClient
 
+from infrastructure.sqlalchemy.repositories import SQLAlchemyUserRepository
+
 
 @pytest.mark.asyncio
 async def test_user_list_pagination_and_filter(async_client: AsyncClient, create_user, auth_token):  # noqa: ANN001  # pyright:ignore[reportUnknownParameterType, reportMissingParameterType]
@@ -31,3 +33,83 @@ async def test_user_list_pagination_and_filter(async_client: AsyncClient, create
     resp_fp = await async_client.get(f"/users?username_contains={prefix}&page=1&per_page=2", headers=headers)
     assert resp_fp.status_code == 200
     assert [u["username"] for u in resp_fp.json()] == expect[:2]
+
+
+@pytest.mark.asyncio
+async def test_user_list_cursor(async_client: AsyncClient, create_user, auth_token):  # noqa: ANN001  # pyright:ignore[reportUnknownParameterType, reportMissingParameterType]
+    prefix = uuid.uuid4().hex[:6]
+    headers = {"Authorization": f"Bearer {auth_token}"}
+
+    for base in ("ann", "ben", "cid"):
+        uname = f"{prefix}_{base}"
+        _ = await create_user(uname, f"{uname}@example.com", "secret123")
+
+    first = await async_client.get(f"/users?username_contains={prefix}&per_page=2", headers=headers)
+    assert [u["username"] for u in first.json()] == [f"{prefix}_ann", f"{prefix}_ben"]
+
+    cursor = first.headers["X-Next-Cursor"]
+    second = await async_client.get(f"/users?username_contains={prefix}&per_page=2&cursor={cursor}", headers=headers)
+    assert [u["username"] for u in second.json()] == [f"{prefix}_cid"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+@pytest.mark.asyncio
+async def test_user_substring_filters_use_trigram_index(async_client: AsyncClient, create_user, auth_token):  # noqa: ANN001  # pyright:ignore[reportUnknownParameterType, reportMissingParameterType]
+    prefix = uuid.uuid4().hex[:6]
+    headers = {"Authorization": f"Bearer {auth_token}"}
+
+    _ = await create_user(f"{prefix}_Zed", f"zed.{prefix}@Trigram.example", "secret123")
+    _ = await create_user(f"{prefix}_amy", f"amy.{prefix}@other.example", "secret123")
+
+    resp = await async_client.get(f"/users?email_contains={prefix}@TRIGRAM", headers=headers)
+    assert [u["username"] for u in resp.json()] == [f"{prefix}_Zed"]
+    assert resp.headers["X-Total-Count"] == "1"
+
+    # both filters combine; short needles fall back to ILIKE and still agree
+    resp_both = await async_client.get(f"/users?username_contains={prefix}_z&email_contains=tr", headers=headers)
+    assert [u["username"] for u in resp_both.json()] == [f"{prefix}_Zed"]
+
+
+@pytest.mark.asyncio
+async def test_common_or_non_ascii_needles_skip_the_trigram_index(create_user):  # noqa: ANN001  # pyright:ignore[reportUnknownParameterType, reportMissingParameterType]
+    prefix = uuid.uuid4().hex[:6]
+    _ = await create_user(f"{prefix}_eve", f"eve.{prefix}@example.com", "secret123")
+    repo = SQLAlchemyUserRepository()
+
+    # most test accounts are @example.com; the random prefix narrows to one row
+    filters = await repo._filters(prefix, "@example")  # pyright:ignore[reportPrivateUsage]  # noqa: SLF001
+    assert filters.keys() == {"username_trgm", "email_like"}
+
+    assert (await repo._filters("zoë", None)).keys() == {"username_like"}  # pyright:ignore[reportPrivateUsage]  # noqa: SLF001
+    users = await repo.list_all(username_contains=prefix, email_contains="@EXAMPLE.com")
+    assert [u.username for u in users] == [f"{prefix}_eve"]
+
+
+@pytest.mark.asyncio
+async def test_user_list_count_modes(async_client: AsyncClient, create_user, auth_token):  # noqa: ANN001  # pyright:ignore[reportUnknownParameterType, reportMissingParameterType]
+    prefix = uuid.uuid4().hex[:6]
+    headers = {"Authorization": f"Bearer {auth_token}"}
+
+    for base in ("ann", "ben"):
+        uname = f"{prefix}_{base}"
+        _ = await create_user(uname, f"{uname}@example.com", "secret123")
+
+    url = f"/users?username_contains={prefix}&per_page=1"
+
+    exact = await async_client.get(url, headers=headers)
+    assert exact.headers["X-Total-Count"] == "2"
+    assert exact.headers["X-Total-Count-Mode"] == "exact"
+
+    skipped = await async_client.get(f"{url}&count=none", headers=headers)
+    assert len(skipped.json()) == 1
+    assert "X-Total-Count" not in skipped.headers
+    assert skipped.headers["X-Total-Count-Mode"] == "none"
+
+    # the exact count above already primed the cache, so the later third user is not seen yet
+    _ = await create_user(f"{prefix}_cid", f"{prefix}_cid@example.com", "secret123")
+    estimated = await async_client.get(f"{url}&count=estimate", headers=headers)
+    assert estimated.headers["X-Total-Count"] == "2"
+    assert estimated.headers["X-Total-Count-Mode"] == "estimate"
+
+    bogus = await async_client.get(f"{url}&count=roughly", headers=headers)
+    assert bogus.status_code == 400